@@ -0,0 +1,80 @@
+import argparse
+import gc
+import json
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+
+from src.connection import Connection
+
+"""
+Measures how much memory a project's connections take once loaded. Connections are built from
+freshly decoded JSON, like FileHandler.load produces, so every field starts out as its own string
+object. The previous Connection layout (a plain dataclass with a uuid4 string id) is reproduced
+here for comparison.
+
+    python -m benchmarks.connection_memory --count 100000
+"""
+
+
+@dataclass
+class LegacyConnection:
+    source_component: str
+    source_terminal_block: str
+    source_terminal: str
+    destination_component: str
+    destination_terminal_block: str
+    destination_terminal: str
+    connection_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+
+def make_project_json(count: int) -> str:
+    """
+    Builds a project file's worth of JSON with the kind of repetition real projects have: a few
+    dozen components, a handful of terminal blocks and a few hundred terminal numbers.
+    """
+    conn_dicts = [
+        {
+            "source_component": f"PLC{n % 40}",
+            "source_terminal_block": f"TB{n % 8}",
+            "source_terminal": str(n % 300),
+            "destination_component": f"M{n % 25}",
+            "destination_terminal_block": f"TSN{n % 5}",
+            "destination_terminal": str((n * 7) % 300),
+        }
+        for n in range(count)
+    ]
+    return json.dumps(conn_dicts)
+
+
+def measure(connection_class, project_json: str) -> int:
+    """
+    Returns the bytes still allocated after loading the project into connection_class objects
+    and dropping the decoded dictionaries.
+    """
+    gc.collect()
+    tracemalloc.start()
+    connections = [connection_class(**conn_dict) for conn_dict in json.loads(project_json)]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del connections
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Connection memory benchmark")
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    project_json = make_project_json(args.count)
+    legacy = measure(LegacyConnection, project_json)
+    compact = measure(Connection, project_json)
+    print(f"{args.count} connections")
+    print(f"  dataclass + uuid4:    {legacy / args.count:8.1f} bytes per connection")
+    print(f"  slotted + interned:   {compact / args.count:8.1f} bytes per connection")
+    print(f"  reduction:            {legacy / compact:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
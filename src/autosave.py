@@ -0,0 +1,103 @@
+import logging
+import threading
+from typing import Callable
+
+"""
+Write-behind saving. Instead of rewriting the project file after every mutation, callers mark the
+project as dirty and a background timer coalesces everything that happened during the interval
+into a single write.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class SaveState:
+    SAVED = "saved"
+    DIRTY = "dirty"
+    SAVING = "saving"
+    ERROR = "error"
+
+
+class DebouncedWriter:
+    """
+    Runs a write callback on a background thread at most once per interval, no matter how many
+    times mark_dirty() is called in between.
+    """
+
+    def __init__(self, write_callback: Callable[[], bool], interval: float) -> None:
+        """
+        Args:
+            write_callback: Performs the actual write. Returns True on success.
+            interval (float): Seconds to wait after the first change before writing.
+        """
+        self.write_callback = write_callback
+        self.interval = interval
+        self._lock = threading.Lock()  # guards the flags and the timer
+        self._write_lock = threading.Lock()  # serializes writes
+        self._timer: threading.Timer | None = None
+        self._dirty = False
+        self._saving = False
+        self._last_write_failed = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._saving:
+                return SaveState.SAVING
+            if self._last_write_failed:
+                return SaveState.ERROR
+            if self._dirty:
+                return SaveState.DIRTY
+            return SaveState.SAVED
+
+    @property
+    def is_dirty(self) -> bool:
+        with self._lock:
+            return self._dirty
+
+    def mark_dirty(self) -> None:
+        """
+        Records that there are unsaved changes and schedules a write if one isn't pending.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self._write)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> bool:
+        """
+        Writes any pending changes immediately on the calling thread.
+
+        Returns:
+            bool: True if nothing was pending or the write succeeded.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return self._write()
+
+    def _write(self) -> bool:
+        with self._write_lock:
+            with self._lock:
+                self._timer = None
+                if not self._dirty:
+                    return True
+                # Clear the flag before writing so changes made during the write are kept
+                self._dirty = False
+                self._saving = True
+
+            try:
+                success = self.write_callback()
+            except Exception as e:
+                logger.error(f"Write-behind save failed: {e}")
+                success = False
+
+            with self._lock:
+                self._saving = False
+                self._last_write_failed = not success
+                if not success:
+                    self._dirty = True
+            return success
@@ -0,0 +1,246 @@
+import logging
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Callable, Iterator
+
+from src.connection import Connection
+from src.connection_index import ConnectionIndex
+
+"""
+Columnar, dictionary-encoded copy of a project's connections. Each of the six fields is stored as
+an array of integer codes into a per-field StringTable, next to a column of connection ids. Bulk
+operations (filtering, grouping, export formatting) then run over compact arrays and only decode
+the strings they actually need, instead of walking Connection objects attribute by attribute.
+
+The store follows the order of ConnectionManager.connections: appends go at the end, edits
+overwrite their row, and deletes leave a tombstone that is squeezed out before the next bulk
+operation. Connection objects can be recreated from any row on demand.
+"""
+
+logger = logging.getLogger(__name__)
+
+FIELDS = (
+    "source_component",
+    "source_terminal_block",
+    "source_terminal",
+    "destination_component",
+    "destination_terminal_block",
+    "destination_terminal",
+)
+
+
+class StringTable:
+    """
+    Assigns each distinct string a small integer code. Codes are never reused or removed, so a
+    code stays valid for as long as the table exists.
+    """
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self.codes[value] = code
+        return code
+
+    def code_of(self, value: str) -> int | None:
+        """
+        Returns the code for value without adding it, or None if it was never encoded.
+        """
+        return self.codes.get(value)
+
+    def decode(self, code: int) -> str:
+        return self.strings[code]
+
+
+class ColumnarStore(ConnectionIndex):
+    ordered = True
+
+    def __init__(self, tables: dict[str, StringTable] | None = None) -> None:
+        """
+        Args:
+            tables (dict): String tables to share with another store, e.g. a snapshot's source.
+        """
+        self.tables = tables if tables is not None else {name: StringTable() for name in FIELDS}
+        self.columns = {name: array("I") for name in FIELDS}
+        self.ids = array("q")
+        self.alive = bytearray()
+        self._rows: dict[int, int] = {}  # connection_id -> row
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self.ids) - self._dead
+
+    # ConnectionIndex
+    def add(self, connection: Connection) -> None:
+        self._rows[connection.connection_id] = len(self.ids)
+        for name in FIELDS:
+            self.columns[name].append(self.tables[name].encode(getattr(connection, name)))
+        self.ids.append(connection.connection_id)
+        self.alive.append(1)
+
+    def remove(self, connection: Connection) -> None:
+        row = self._rows.pop(connection.connection_id, None)
+        if row is None:
+            return
+        self.alive[row] = 0
+        self._dead += 1
+
+    def replace(self, old_connection: Connection, new_connection: Connection) -> None:
+        row = self._rows.pop(old_connection.connection_id, None)
+        if row is None:
+            self.add(new_connection)
+            return
+        for name in FIELDS:
+            self.columns[name][row] = self.tables[name].encode(getattr(new_connection, name))
+        self.ids[row] = new_connection.connection_id
+        self._rows[new_connection.connection_id] = row
+
+    def rebuild(self, connections: list[Connection]) -> None:
+        self.columns = {name: array("I") for name in FIELDS}
+        self.ids = array("q")
+        self.alive = bytearray()
+        self._rows = {}
+        self._dead = 0
+        for connection in connections:
+            self.add(connection)
+
+    def compact(self) -> None:
+        """
+        Squeezes deleted rows out of every column, keeping the order of the rest.
+        """
+        if self._dead == 0:
+            return
+        alive = self.alive
+        for name in FIELDS:
+            self.columns[name] = array("I", compress(self.columns[name], alive))
+        self.ids = array("q", compress(self.ids, alive))
+        self.alive = bytearray(b"\x01") * len(self.ids)
+        self._rows = {connection_id: row for row, connection_id in enumerate(self.ids)}
+        self._dead = 0
+
+    # Views
+    def connection_at(self, row: int) -> Connection:
+        """
+        Creates a Connection for a row. It compares equal to, and shares its id with, the
+        connection the row was made from.
+        """
+        return Connection(
+            *(self.tables[name].decode(self.columns[name][row]) for name in FIELDS),
+            connection_id=self.ids[row],
+        )
+
+    def iter_connections(self, rows: list[int] | None = None) -> Iterator[Connection]:
+        self.compact()
+        for row in range(len(self.ids)) if rows is None else rows:
+            yield self.connection_at(row)
+
+    def copy(self) -> "ColumnarStore":
+        """
+        Returns an independent snapshot, e.g. for a background export. The string tables are
+        shared; they only ever grow, so the snapshot's codes stay valid.
+        """
+        self.compact()
+        snapshot = ColumnarStore(self.tables)
+        snapshot.columns = {name: array("I", column) for name, column in self.columns.items()}
+        snapshot.ids = array("q", self.ids)
+        snapshot.alive = bytearray(self.alive)
+        snapshot._rows = dict(self._rows)
+        return snapshot
+
+    # Bulk operations
+    def filter_rows(self, **field_values: str) -> list[int]:
+        """
+        Returns the rows whose fields equal all of the given values, in order.
+
+            store.filter_rows(source_component="PLC", source_terminal_block="TB1")
+        """
+        self.compact()
+        rows: list[int] | None = None
+        for name, value in field_values.items():
+            code = self.tables[name].code_of(value)
+            if code is None:
+                return []
+            column = self.columns[name]
+            if rows is None:
+                rows = self._find_code(column, code)
+            else:
+                rows = [row for row in rows if column[row] == code]
+        return list(range(len(self.ids))) if rows is None else rows
+
+    @staticmethod
+    def _find_code(column: array, code: int) -> list[int]:
+        """
+        Returns every row of column holding code. The search runs over the column's raw bytes
+        with bytes.find, which skips non-matching rows in C; only the matches cost Python work.
+        """
+        needle = array(column.typecode, [code]).tobytes()
+        width = column.itemsize
+        data = column.tobytes()
+        rows = []
+        position = data.find(needle)
+        while position != -1:
+            if position % width == 0:
+                rows.append(position // width)
+                position = data.find(needle, position + width)
+            else:
+                # The bytes straddle two values, not a real match
+                position = data.find(needle, position + 1)
+        return rows
+
+    def count_by(self, name: str) -> Counter[str]:
+        """
+        Counts the connections per distinct value of one field.
+        """
+        self.compact()
+        table = self.tables[name]
+        return Counter(
+            {table.decode(code): count for code, count in Counter(self.columns[name]).items()}
+        )
+
+    def iter_formatted_rows(
+        self, format_endpoint: Callable[[str, str, str], str]
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Yields (source, destination) labels for every row. Each distinct endpoint is decoded and
+        formatted once; repeats are served from a cache keyed on the integer codes.
+        """
+        self.compact()
+        endpoint_columns = [
+            (
+                self.columns[f"{side}_component"],
+                self.columns[f"{side}_terminal_block"],
+                self.columns[f"{side}_terminal"],
+                self.tables[f"{side}_component"],
+                self.tables[f"{side}_terminal_block"],
+                self.tables[f"{side}_terminal"],
+            )
+            for side in ("source", "destination")
+        ]
+        caches: list[dict[tuple[int, int, int], str]] = [{}, {}]
+
+        def labels(side: int) -> Iterator[str]:
+            components, blocks, terminals, component_table, block_table, terminal_table = (
+                endpoint_columns[side]
+            )
+            cache = caches[side]
+            for key in zip(components, blocks, terminals):
+                label = cache.get(key)
+                if label is None:
+                    label = format_endpoint(
+                        component_table.decode(key[0]),
+                        block_table.decode(key[1]),
+                        terminal_table.decode(key[2]),
+                    )
+                    cache[key] = label
+                yield label
+
+        return zip(labels(0), labels(1))
@@ -1,16 +1,28 @@
 import logging
 from src import connection_manager
 from src.connection import Connection
+from src.connection_batch import ConnectionBatch
 from src.connection_manager import DuplicateConnectionError
+from src.label_importer import ImportStats, LabelImporter
 
 logger = logging.getLogger(__name__)
 
+# Rough size of a command object and its attributes, for the undo history's memory budget
+COMMAND_BYTES = 512
+
 
 class ConnectionNotDeletedError(Exception):
     pass
 
 
+class ConnectionNotFoundError(Exception):
+    pass
+
+
 class Command:
+    # Identifies the command's records in the undo journal, see command_from_record
+    record_type = ""
+
     def execute(self):
         pass
 
@@ -20,8 +32,34 @@ class Command:
     def redo(self):
         pass
 
+    def nbytes(self) -> int:
+        """
+        Estimates the memory the command keeps for undo and redo.
+        """
+        return COMMAND_BYTES
+
+    def to_record(self) -> dict:
+        """
+        Returns what undo and redo need as JSON-friendly data, for the undo journal.
+        """
+        return {"type": self.record_type}
+
+    @classmethod
+    def from_record(cls, record: dict, parent) -> "Command":
+        """
+        Recreates an executed command from to_record() output.
+
+        Args:
+            record (dict): The command's record.
+            parent: The controller, for the connection manager and anything else the command
+                uses.
+        """
+        raise NotImplementedError
+
 
 class AddConnectionCommand(Command):
+    record_type = "add"
+
     def __init__(
         self,
         event_system,
@@ -35,6 +73,8 @@ class AddConnectionCommand(Command):
         self.item = None
         self.event_system = event_system
         self.connection = None
+        # Where the connection was appended, so redo can put it back there
+        self.position = 0
 
     def __repr__(self):
         return "AddConnectionCommand"
@@ -50,20 +90,53 @@ class AddConnectionCommand(Command):
                 self.destination["terminal_block"],
                 self.destination["terminal"],
             )
+            self.position = len(self.connection_manager.connections) - 1
 
             # Publish an event that a connection has been added
             self.event_system.publish("connection_added", self.connection)
         except DuplicateConnectionError:
+            # Nothing was added, so the command must not reach the undo history
             logger.error("Failed to add connection: Duplicate detected.")
+            raise
 
     def undo(self) -> None:
-        self.connection_manager.delete_connection(self.connection)
-
-        # Publish an event that a connection has been removed
-        self.event_system.publish("connection_removed", self.connection)
+        if self.connection_manager.delete_connection(self.connection):
+            # Publish an event that a connection has been removed
+            self.event_system.publish("connection_removed", self.connection)
 
     def redo(self):
-        self.execute()
+        # Back where it was. Skipped if it is stored already, e.g. when a recovery replays a redo
+        # the project file already held.
+        if self.connection_manager.insert_connections([(self.position, self.connection)]):
+            self.event_system.publish("connection_added", self.connection)
+
+    def to_record(self) -> dict:
+        return {
+            "type": self.record_type,
+            "connection": self.connection.to_dict(),
+            "position": self.position,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict, parent) -> "AddConnectionCommand":
+        connection = Connection(**record["connection"])
+        command = cls(
+            parent.event_system,
+            parent.connection_manager,
+            {
+                "component": connection.source_component,
+                "terminal_block": connection.source_terminal_block,
+                "terminal": connection.source_terminal,
+            },
+            {
+                "component": connection.destination_component,
+                "terminal_block": connection.destination_terminal_block,
+                "terminal": connection.destination_terminal,
+            },
+        )
+        command.connection = connection
+        command.position = record["position"]
+        return command
 
 
 class DeleteConnectionCommand(Command):
@@ -71,112 +144,177 @@ class DeleteConnectionCommand(Command):
     Deletes a connection from the connection manager
     """
 
+    record_type = "delete"
+
     def __init__(self, parent, connection_manager, view) -> None:
         self.parent = parent
         self.connection_manager = connection_manager
         self.view = view
-        self.deleted_items = []  # Store deleted items here
+        # Positions and fields of the deleted connections, so undo can put each one back where
+        # it was
+        self.deleted_connections = ConnectionBatch()
 
     def __repr__(self):
         return "DeleteConnectionCommand"
 
     def execute(self) -> None:
-        for item_to_delete in self.view.tree_widget.selection():
-            try:
-                _, connection = self.view.tree_widget.tree_item_to_connection[
-                    item_to_delete
-                ]
-
-                # Attempt to delete the connection from the connection manager
-                try:
-                    self.connection_manager.delete_connection(connection)
-                except Exception as e:
-                    logger.warning(
-                        f"Could not delete {connection} from connection manager: {e}"
-                    )
-                    continue  # Skip this connection
-
-                # Attempt to delete from connections_dict
-                try:
-                    del self.view.tree_widget.connections_dict[str(connection)]
-                except KeyError:
-                    logger.warning(
-                        f"Connection {connection} not found in connections_dict"
-                    )
-
-                # Attempt to delete from tree_item_to_connection
-                try:
-                    del self.view.tree_widget.tree_item_to_connection[item_to_delete]
-                except KeyError:
-                    logger.warning(
-                        f"Item {item_to_delete} not found in tree_item_to_connection"
-                    )
-
-                self.deleted_items.append(
-                    {
-                        "item": item_to_delete,
-                        "connection": connection,
-                        "source_component": connection.source_component,
-                        "source_terminal_block": connection.source_terminal_block,
-                        "source_terminal": connection.source_terminal,
-                        "destination_component": connection.destination_component,
-                        "destination_terminal_block": connection.destination_terminal_block,
-                        "destination_terminal": connection.destination_terminal,
-                    }
-                )
-                # Check that the item was actually deleted
-                if connection in self.connection_manager.connections:
-                    logger.error(
-                        f"Connection {connection} was not successfully removed."
-                    )
-                    raise ConnectionNotDeletedError
-            except KeyError:
-                logger.warning(f"Connection not found for item: {item_to_delete}")
-                continue
-
-    def undo(self) -> None:
-        for deleted_item in self.deleted_items:
-            connection = deleted_item["connection"]
-            item = deleted_item["item"]
-            source_component = deleted_item["source_component"]
-            source_terminal_block = deleted_item["source_terminal_block"]
-            source_terminal = deleted_item["source_terminal"]
-            destination_component = deleted_item["destination_component"]
-            destination_terminal_block = deleted_item["destination_terminal_block"]
-            destination_terminal = deleted_item["destination_terminal"]
-
-            # Add the connection back to the connection manager
-            self.connection_manager.add_connection(
-                source_component,
-                source_terminal_block,
-                source_terminal,
-                destination_component,
-                destination_terminal_block,
-                destination_terminal,
-            )
+        connections_to_delete = self.view.tree_widget.selected_connections_in_view()
 
-            # Add the connection back to the connections_dict
-            self.view.tree_widget.connections_dict[str(connection)] = connection
+        # One transaction for the whole selection: one save and one tree refresh. The tree
+        # forgets the deleted rows' items when it refreshes.
+        positioned = self.connection_manager.pop_connections(connections_to_delete)
 
-            # Add the connection back to tree_item_to_connection
-            self.view.tree_widget.tree_item_to_connection[item] = connection
+        # Check that the connections were actually deleted
+        for _, connection in positioned:
+            if self.connection_manager.has_connection(connection):
+                logger.error(f"Connection {connection} was not successfully removed.")
+                raise ConnectionNotDeletedError
+        self.deleted_connections = ConnectionBatch(positioned)
 
-            # Add the connection back to the tree widget
-            source, destination = self.parent.connection_manager.get_connection_tuple(
-                connection
-            )
-            self.view.tree_widget.insert("", "end", values=(source, destination))
+    def undo(self) -> None:
+        # Restores the whole batch in one transaction, each connection at its old position
+        connections = self.connection_manager.insert_connections(self.deleted_connections)
+        if len(connections) == 1:
+            source, destination = connections[0].to_tuple()
             self.parent.display_status(
                 self.parent.localizer.get("added_connection").format(
                     source=source, destination=destination
                 )
             )
-        self.deleted_items.clear()
-        self.parent.update_connection_list()
+        elif connections:
+            self.parent.display_status(
+                self.parent.localizer.get("restored_connections").format(
+                    count=len(connections)
+                )
+            )
+
+    def redo(self) -> None:
+        # The selection may have changed since, so delete the same connections again
+        positioned = self.connection_manager.pop_connections(
+            self.deleted_connections.connections()
+        )
+        for _, connection in positioned:
+            if self.connection_manager.has_connection(connection):
+                logger.error(f"Connection {connection} was not successfully removed.")
+                raise ConnectionNotDeletedError
+        # Connections that were already gone pop nothing, so only a complete pop has positions
+        # for the whole batch. Otherwise the original batch is still what undo has to restore.
+        if len(positioned) == len(self.deleted_connections):
+            self.deleted_connections = ConnectionBatch(positioned)
+
+    def nbytes(self) -> int:
+        return COMMAND_BYTES + self.deleted_connections.nbytes()
+
+    def to_record(self) -> dict:
+        return {"type": self.record_type, "connections": self.deleted_connections.to_rows()}
+
+    @classmethod
+    def from_record(cls, record: dict, parent) -> "DeleteConnectionCommand":
+        command = cls(parent, parent.connection_manager, parent.view)
+        command.deleted_connections = ConnectionBatch.from_rows(record["connections"])
+        return command
+
+
+class ImportLabelsCommand(Command):
+    """
+    Imports label files as one undo entry. Undo deletes everything the import added and redo
+    puts it back, each in one transaction.
+    """
+
+    record_type = "import"
+
+    def __init__(self, connection_manager, file_paths) -> None:
+        self.connection_manager = connection_manager
+        self.file_paths = file_paths
+        self.stats = ImportStats()
+        self.added_connections = ConnectionBatch()
+
+    def __repr__(self) -> str:
+        return "ImportLabelsCommand"
+
+    def execute(self) -> None:
+        connections = self.connection_manager.connections
+        start = len(connections)
+        self.stats = LabelImporter(self.connection_manager).import_paths(self.file_paths)
+        # The import only appends, so what it added is everything past the old end
+        self.added_connections = ConnectionBatch.appended(connections[start:], start)
+
+    def undo(self) -> None:
+        self.connection_manager.pop_connections(self.added_connections.connections())
+
+    def redo(self) -> None:
+        self.connection_manager.insert_connections(self.added_connections)
+
+    def nbytes(self) -> int:
+        return COMMAND_BYTES + self.added_connections.nbytes()
+
+    def to_record(self) -> dict:
+        return {"type": self.record_type, "connections": self.added_connections.to_rows()}
+
+    @classmethod
+    def from_record(cls, record: dict, parent) -> "ImportLabelsCommand":
+        command = cls(parent.connection_manager, [])
+        command.added_connections = ConnectionBatch.from_rows(record["connections"])
+        return command
+
+
+class MacroCommand(Command):
+    """
+    Several commands that are done, undone and redone together as one transaction, and so as one
+    undo entry with one save and one refresh. Built by CommandManager.macro().
+    """
+
+    record_type = "macro"
+
+    def __init__(self, connection_manager, commands: list[Command]) -> None:
+        self.connection_manager = connection_manager
+        self.commands = commands
+
+    def __repr__(self) -> str:
+        return f"MacroCommand({len(self.commands)} commands)"
+
+    def execute(self) -> None:
+        with self.connection_manager.transaction():
+            for command in self.commands:
+                command.execute()
+
+    def undo(self) -> None:
+        with self.connection_manager.transaction():
+            for command in reversed(self.commands):
+                command.undo()
+
+    def redo(self) -> None:
+        with self.connection_manager.transaction():
+            for command in self.commands:
+                command.redo()
+
+    def nbytes(self) -> int:
+        return COMMAND_BYTES + sum(command.nbytes() for command in self.commands)
+
+    def to_record(self) -> dict:
+        return {
+            "type": self.record_type,
+            "commands": [command.to_record() for command in self.commands],
+        }
+
+    @classmethod
+    def from_record(cls, record: dict, parent) -> "MacroCommand":
+        return cls(
+            parent.connection_manager,
+            [command_from_record(command, parent) for command in record["commands"]],
+        )
 
 
 class EditConnectionCommand(Command):
-    # Rewrite the other two commands so that I can make this a composition of those two.
+    """
+    Edits a connection in place, keeping its position and id. Undo and redo swap the two
+    versions of the connection back and forth, each swap being one save and one redrawn row.
+    Once executed, the command only remembers the connection's id, its new values and the old
+    values of the fields that changed.
+    """
+
+    record_type = "edit"
+
     def __init__(
         self,
         parent,
@@ -186,36 +324,76 @@ class EditConnectionCommand(Command):
     ) -> None:
         self.parent = parent
         self.connection_manager = connection_manager
-        self.old_connection = old_connection
+        self.old_connection: Connection | None = old_connection
         self.new_values = new_values
-        self.connections_to_edit = []
+        self.connection_id = old_connection.connection_id
+        self.old_values: dict[str, str] = {}
 
     def __repr__(self) -> str:
         return "EditConnectionCommand"
 
+    def versions(self) -> tuple[Connection, Connection]:
+        """
+        Returns the connection as it was before and after the edit.
+        """
+        old_connection = self.old_connection or Connection(
+            **{**self.new_values, **self.old_values}, connection_id=self.connection_id
+        )
+        new_connection = Connection(**self.new_values, connection_id=self.connection_id)
+        return old_connection, new_connection
+
     def execute(self) -> None:
         logger.info("EditConnectionCommand execute method called")
-        self.old_values = self.old_connection.to_dict()
-
-        # First, delete the old connection
-        self.connection_manager.delete_connection(self.old_connection)
-        self.parent.update_connection_list()
-
-        new_connection = Connection(**self.new_values)
-        self.connection_manager.add_connection(**new_connection.to_dict())
-        self.parent.update_connection_list()
+        old_connection, new_connection = self.versions()
+        if not self.connection_manager.has_connection(old_connection):
+            logger.error(f"Failed to edit connection: {old_connection} is no longer stored.")
+            raise ConnectionNotFoundError("The connection to edit is no longer stored")
+        if not self.connection_manager.edit_connection(old_connection, new_connection):
+            logger.error("Failed to edit connection: Duplicate detected.")
+            raise DuplicateConnectionError("Edit would duplicate another connection")
+        self.old_values = {
+            name: value
+            for name, value in old_connection.to_dict().items()
+            if value != self.new_values[name]
+        }
+        self.old_connection = None
 
     def undo(self) -> None:
-        new_connection = Connection(**self.new_values)
-
-        self.connection_manager.add_connection(**self.old_connection.to_dict())
-        self.connection_manager.delete_connection(new_connection)
+        old_connection, new_connection = self.versions()
+        self.connection_manager.edit_connection(new_connection, old_connection)
 
     def redo(self) -> None:
-        # First delete the old connection
-        self.connection_manager.delete_connection(self.old_connection)
-
-        # Then add the new connection
-        new_connection = Connection(**self.new_values)
-        self.connection_manager.add_connection(**new_connection.to_dict())
-        self.parent.update_connection_list()
+        old_connection, new_connection = self.versions()
+        self.connection_manager.edit_connection(old_connection, new_connection)
+
+    def to_record(self) -> dict:
+        return {"type": self.record_type, "new": self.new_values, "old": self.old_values}
+
+    @classmethod
+    def from_record(cls, record: dict, parent) -> "EditConnectionCommand":
+        # The connection's id is only known once it is stored, and edit_connection hands the
+        # stored id on to whichever version it stores
+        old_connection = Connection(**{**record["new"], **record["old"]})
+        command = cls(parent, parent.connection_manager, old_connection, record["new"])
+        command.old_values = record["old"]
+        command.old_connection = None
+        return command
+
+
+COMMAND_TYPES: dict[str, type[Command]] = {
+    command_type.record_type: command_type
+    for command_type in (
+        AddConnectionCommand,
+        DeleteConnectionCommand,
+        ImportLabelsCommand,
+        MacroCommand,
+        EditConnectionCommand,
+    )
+}
+
+
+def command_from_record(record: dict, parent) -> Command:
+    """
+    Recreates a command from its undo journal record.
+    """
+    return COMMAND_TYPES[record["type"]].from_record(record, parent)
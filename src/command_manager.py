@@ -1,21 +1,153 @@
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+from src.command import MacroCommand, command_from_record
+from src.undo_journal import UndoJournal, history_events, saved_through
+
+"""
+Undo and redo history. Each command reports roughly how much memory it keeps for undoing itself
+(see Command.nbytes), and once the history as a whole goes over its memory budget the oldest undo
+entries are forgotten. The most recent entry is always kept, however big it is, so the last
+action can always be undone.
+
+The history can also be journaled to disk as it changes and recovered after a crash, see
+UndoJournal and recover().
+
+Commands executed inside a macro() block become a single entry:
+
+    with command_manager.macro(connection_manager):
+        command_manager.execute(first_command)
+        command_manager.execute(second_command)
+"""
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET_BYTES = 16_000_000
+
+
 class CommandManager:
-    def __init__(self) -> None:
-        self.undo_stack = []
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET_BYTES) -> None:
+        self.undo_stack: deque = deque()
         self.redo_stack = []
+        self.memory_budget = memory_budget
+        # Estimated bytes held by both stacks
+        self.history_bytes = 0
+        self._macro_commands: list | None = None
+        # Records every history event for crash recovery, when set
+        self.journal: UndoJournal | None = None
 
     def execute(self, command):
-        self.undo_stack.append(command)
+        # A command that raises never made a change, so it isn't kept for undo
         command.execute()
-        self.redo_stack.clear()
+        if self._macro_commands is not None:
+            self._macro_commands.append(command)
+            return
+        self._clear_redo()
+        self._push_undo(command)
+        self._record("do", command)
 
     def undo(self):
         if self.undo_stack:
             command = self.undo_stack.pop()
+            self.history_bytes -= command.nbytes()
             command.undo()
             self.redo_stack.append(command)
+            self.history_bytes += command.nbytes()
+            self._record("undo")
 
     def redo(self):
         if self.redo_stack:
-            command = self.undo_stack.pop()
-            command.execute()
-            self.undo_stack.append(command)
+            command = self.redo_stack.pop()
+            self.history_bytes -= command.nbytes()
+            command.redo()
+            self._push_undo(command)
+            self._record("redo")
+
+    @contextmanager
+    def macro(self, connection_manager) -> Iterator[None]:
+        """
+        Collects the commands executed inside the block into one MacroCommand, run as one
+        connection manager transaction. If the block raises, the transaction rolls every command
+        back and nothing is added to the history. Nested blocks join the outermost one.
+        """
+        if self._macro_commands is not None:
+            yield
+            return
+        commands = self._macro_commands = []
+        try:
+            with connection_manager.transaction():
+                yield
+        finally:
+            self._macro_commands = None
+        if commands:
+            macro_command = MacroCommand(connection_manager, commands)
+            self._clear_redo()
+            self._push_undo(macro_command)
+            self._record("do", macro_command)
+
+    def recover(self, events: list[dict], parent) -> int:
+        """
+        Rebuilds the history of a crashed session from its undo journal events, and re-applies
+        the events after the project file's last recorded write, all in one transaction. The
+        commands' events are suppressed while they are re-applied, so the UI refreshes once,
+        when the transaction reports every change to the observers. Every recovered command
+        can be undone and redone as usual.
+
+        Args:
+            events: The journal's events, oldest first.
+            parent: The controller, passed on to the recreated commands.
+
+        Returns:
+            int: The number of events that were re-applied.
+        """
+        first_unsaved = saved_through(events)
+        events = history_events(events)
+        applied = 0
+        with parent.event_system.suppressed(), parent.connection_manager.transaction():
+            for number, event in enumerate(events):
+                apply = number >= first_unsaved
+                op = event.get("op")
+                if op == "do":
+                    command = command_from_record(event["command"], parent)
+                    if apply:
+                        command.redo()
+                    self._clear_redo()
+                    self._push_undo(command)
+                elif op == "undo" and self.undo_stack:
+                    command = self.undo_stack.pop()
+                    self.history_bytes -= command.nbytes()
+                    if apply:
+                        command.undo()
+                    self.redo_stack.append(command)
+                    self.history_bytes += command.nbytes()
+                elif op == "redo" and self.redo_stack:
+                    command = self.redo_stack.pop()
+                    self.history_bytes -= command.nbytes()
+                    if apply:
+                        command.redo()
+                    self._push_undo(command)
+                else:
+                    logger.warning(f"Skipping undo journal event {number + 1}: {event}")
+                    continue
+                applied += apply
+        logger.info(f"Recovered {len(events)} history events, re-applied {applied}")
+        return applied
+
+    def _record(self, op: str, command=None) -> None:
+        if self.journal is not None:
+            self.journal.record(op, command)
+
+    def _clear_redo(self) -> None:
+        for command in self.redo_stack:
+            self.history_bytes -= command.nbytes()
+        self.redo_stack.clear()
+
+    def _push_undo(self, command) -> None:
+        self.undo_stack.append(command)
+        self.history_bytes += command.nbytes()
+        while self.history_bytes > self.memory_budget and len(self.undo_stack) > 1:
+            evicted = self.undo_stack.popleft()
+            self.history_bytes -= evicted.nbytes()
+            logger.debug(f"Evicted {evicted!r} from the undo history")
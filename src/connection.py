@@ -1,7 +1,10 @@
 # Love is love. Be yourself.
-import uuid
+import itertools
+import sys
 
 from typing import Dict, Tuple
+
+Endpoint = Tuple[str, str, str]
 from dataclasses import dataclass, field
 
 """
@@ -9,10 +12,18 @@ Connection class describes each connection in terms of the source and destinatio
 terminal blocks, and terminals. This is used to create a unique identifier for each connection
 that can be used to compare connections and to create a dictionary representation of the
 connection.
+
+Projects hold tens of thousands of connections whose component and terminal block names repeat
+constantly, so the class is slotted (no per-instance __dict__) and its fields are interned, which
+makes every repeated value share one string object. connection_id is a process-unique integer
+rather than a uuid string; it only has to tell connections apart while the program runs.
 """
 
+# Thread safe in CPython, next() on a count is a single C call
+_connection_ids = itertools.count()
 
-@dataclass
+
+@dataclass(slots=True)
 class Connection:
     source_component: str
     source_terminal_block: str
@@ -20,7 +31,7 @@ class Connection:
     destination_component: str
     destination_terminal_block: str
     destination_terminal: str
-    connection_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    connection_id: int = field(default_factory=lambda: next(_connection_ids))
 
     def __post_init__(self):
         attributes = [
@@ -33,6 +44,12 @@ class Connection:
         ]
         if not all(isinstance(attribute, str) for attribute in attributes):
             raise ValueError("All inputs must be of type string")
+        self.source_component = sys.intern(self.source_component)
+        self.source_terminal_block = sys.intern(self.source_terminal_block)
+        self.source_terminal = sys.intern(self.source_terminal)
+        self.destination_component = sys.intern(self.destination_component)
+        self.destination_terminal_block = sys.intern(self.destination_terminal_block)
+        self.destination_terminal = sys.intern(self.destination_terminal)
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Connection):
@@ -55,6 +72,33 @@ class Connection:
         )
         return is_normal_equal or is_reverse_equal
 
+    def __hash__(self) -> int:
+        # Must agree with __eq__, so hash the orientation-independent key rather than the fields
+        return hash(self.canonical_key())
+
+    def endpoints(self) -> Tuple[Endpoint, Endpoint]:
+        """
+        Returns the (component, terminal block, terminal) at each end, source first.
+        """
+        return (
+            (self.source_component, self.source_terminal_block, self.source_terminal),
+            (
+                self.destination_component,
+                self.destination_terminal_block,
+                self.destination_terminal,
+            ),
+        )
+
+    def canonical_key(self) -> Tuple[Endpoint, Endpoint]:
+        """
+        Returns a key that is the same for a connection and its reverse. Two connections compare
+        equal exactly when their canonical keys are equal.
+        """
+        source, destination = self.endpoints()
+        if destination < source:
+            return (destination, source)
+        return (source, destination)
+
     def __str__(self) -> str:
         source = f"{self.source_component}-{self.source_terminal_block}-{self.source_terminal}".strip("-")
         destination = f"{self.destination_component}-{self.destination_terminal_block}-{self.destination_terminal}".strip("-")
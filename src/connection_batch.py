@@ -0,0 +1,86 @@
+from array import array
+from operator import attrgetter
+from typing import Iterable, Iterator
+
+from src.columnar_store import FIELDS, StringTable
+from src.connection import Connection
+
+"""
+Compact storage for the connections an undo entry has to remember. A batch keeps each connection's
+position and id plus its six fields as integer codes, in the same dictionary encoding as the
+columnar store, so a remembered connection costs about 40 bytes instead of a Connection object,
+its strings and the tuple around it. The connections are recreated, with their original ids,
+only when the entry is undone or redone.
+
+Every batch shares one set of string tables. Like the store's, they only ever grow, but they hold
+each distinct field value once and projects repeat the same few values.
+"""
+
+_tables = {name: StringTable() for name in FIELDS}
+
+
+class ConnectionBatch:
+    __slots__ = ("positions", "ids", "columns")
+
+    def __init__(self, positioned: Iterable[tuple[int, Connection]] = ()) -> None:
+        """
+        Args:
+            positioned: (position, connection) pairs, e.g. as returned by pop_connections.
+        """
+        positioned = list(positioned)
+        connections = [connection for _, connection in positioned]
+        self.positions = array("q", [position for position, _ in positioned])
+        self.ids = array("q", [connection.connection_id for connection in connections])
+        self.columns = tuple(
+            array("I", map(_tables[name].encode, map(attrgetter(name), connections)))
+            for name in FIELDS
+        )
+
+    @classmethod
+    def appended(cls, connections: list[Connection], start: int) -> "ConnectionBatch":
+        """
+        Packs connections that were appended to the list, the first of them at position start.
+        """
+        return cls(enumerate(connections, start))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[tuple[int, Connection]]:
+        """
+        Yields the (position, connection) pairs the batch was made from, as new Connection
+        objects with the original ids.
+        """
+        strings = [_tables[name].strings for name in FIELDS]
+        for row, values in enumerate(zip(*self.columns)):
+            yield self.positions[row], Connection(
+                *[table[code] for table, code in zip(strings, values)],
+                connection_id=self.ids[row],
+            )
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[list]) -> "ConnectionBatch":
+        """
+        Rebuilds a batch from to_rows() output. The connections get new ids.
+        """
+        return cls((row[0], Connection(*row[1:])) for row in rows)
+
+    def to_rows(self) -> list[list]:
+        """
+        Returns the batch as [position, six fields] lists, e.g. for JSON.
+        """
+        strings = [_tables[name].strings for name in FIELDS]
+        return [
+            [position, *[table[code] for table, code in zip(strings, values)]]
+            for position, values in zip(self.positions, zip(*self.columns))
+        ]
+
+    def connections(self) -> list[Connection]:
+        return [connection for _, connection in self]
+
+    def nbytes(self) -> int:
+        """
+        Returns the memory held by the batch's arrays.
+        """
+        arrays = (self.positions, self.ids, *self.columns)
+        return sum(values.itemsize * len(values) for values in arrays)
@@ -0,0 +1,137 @@
+from collections import deque
+from typing import Iterator
+
+from src.connection import Connection, Endpoint
+from src.connection_index import ConnectionIndex
+
+"""
+Graph view of a project: every terminal is a node and every connection is an edge between its two
+ends. Besides the adjacency map it keeps the edges by component and by pair of terminal blocks,
+so the common questions are dictionary lookups:
+
+    connections_of("PLC1")                       every connection landing on PLC1
+    connections_between(("PLC1", "TB1"), ("M1", "X"))
+    net(("PLC1", "TB1", "1"))                    every terminal wired to that one, and how
+
+A net is a connected component of the graph. It is found with a breadth-first search that only
+visits the net's own terminals and connections, so its cost is proportional to its size and not to
+the project's. All tables follow ConnectionManager through the ConnectionIndex hooks.
+"""
+
+# (component, terminal block)
+Block = tuple[str, str]
+
+
+class ConnectionGraph(ConnectionIndex):
+    def __init__(self) -> None:
+        # terminal -> {connection_id: connection} for the connections with an end on it
+        self.adjacency: dict[Endpoint, dict[int, Connection]] = {}
+        self.by_component: dict[str, dict[int, Connection]] = {}
+        self.by_block_pair: dict[tuple[Block, Block], dict[int, Connection]] = {}
+
+    @staticmethod
+    def block_pair(connection: Connection) -> tuple[Block, Block]:
+        return tuple(sorted(end[:2] for end in connection.endpoints()))
+
+    def __len__(self) -> int:
+        return len(self.adjacency)
+
+    def __contains__(self, terminal: Endpoint) -> bool:
+        return terminal in self.adjacency
+
+    # Queries
+
+    def connections_at(self, terminal: Endpoint) -> list[Connection]:
+        return list(self.adjacency.get(terminal, {}).values())
+
+    def connections_of(self, component: str) -> list[Connection]:
+        """
+        Returns every connection with either end on component.
+        """
+        return list(self.by_component.get(component, {}).values())
+
+    def neighbours_of(self, component: str) -> set[str]:
+        """
+        Returns the components directly wired to component.
+        """
+        neighbours = set()
+        for connection in self.by_component.get(component, {}).values():
+            neighbours.add(connection.source_component)
+            neighbours.add(connection.destination_component)
+        neighbours.discard(component)
+        return neighbours
+
+    def connections_between(self, block: Block, other_block: Block) -> list[Connection]:
+        """
+        Returns the connections running between two terminal blocks, given as (component,
+        terminal block), in either direction.
+        """
+        key = tuple(sorted((block, other_block)))
+        return list(self.by_block_pair.get(key, {}).values())
+
+    def net(self, terminal: Endpoint) -> tuple[list[Endpoint], list[Connection]]:
+        """
+        Returns the terminals and connections of the net that terminal belongs to, in
+        breadth-first order from terminal. Both are empty if terminal has no connections.
+        """
+        if terminal not in self.adjacency:
+            return [], []
+        terminals = [terminal]
+        seen_terminals = {terminal}
+        connections: list[Connection] = []
+        seen_connections: set[int] = set()
+        queue = deque([terminal])
+        while queue:
+            current = queue.popleft()
+            for connection_id, connection in self.adjacency[current].items():
+                if connection_id in seen_connections:
+                    continue
+                seen_connections.add(connection_id)
+                connections.append(connection)
+                for end in connection.endpoints():
+                    if end not in seen_terminals:
+                        seen_terminals.add(end)
+                        terminals.append(end)
+                        queue.append(end)
+        return terminals, connections
+
+    def nets(self) -> Iterator[tuple[list[Endpoint], list[Connection]]]:
+        """
+        Yields every net once. Visiting all of them costs one pass over the graph.
+        """
+        seen: set[Endpoint] = set()
+        for terminal in self.adjacency:
+            if terminal in seen:
+                continue
+            net = self.net(terminal)
+            seen.update(net[0])
+            yield net
+
+    # ConnectionIndex
+
+    def add(self, connection: Connection) -> None:
+        connection_id = connection.connection_id
+        for end in connection.endpoints():
+            self.adjacency.setdefault(end, {})[connection_id] = connection
+            self.by_component.setdefault(end[0], {})[connection_id] = connection
+        self.by_block_pair.setdefault(self.block_pair(connection), {})[connection_id] = connection
+
+    def remove(self, connection: Connection) -> None:
+        connection_id = connection.connection_id
+        keys = [(self.by_block_pair, self.block_pair(connection))]
+        for end in connection.endpoints():
+            keys += [(self.adjacency, end), (self.by_component, end[0])]
+        for table, key in keys:
+            edges = table.get(key)
+            if edges is None:
+                continue
+            edges.pop(connection_id, None)
+            if not edges:
+                del table[key]
+
+    def rebuild(self, connections: list[Connection]) -> None:
+        self.adjacency = {}
+        self.by_component = {}
+        self.by_block_pair = {}
+        for connection in connections:
+            self.add(connection)
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.connection import Connection
+
+"""
+Secondary indexes kept in step with ConnectionManager. The manager's list only ever changes by
+appending, removing, replacing a connection in place, restoring removed connections to their old
+positions, or being replaced wholesale, and it reports each of those to every registered index.
+An index can therefore answer its own kind of query without ever rescanning the list.
+"""
+
+
+class ConnectionIndex(ABC):
+    # Indexes that mirror the list's order are rebuilt, rather than added to, when connections
+    # are put back in the middle of the list
+    ordered = False
+
+    @abstractmethod
+    def add(self, connection: "Connection") -> None:
+        """
+        Called after a connection is appended to the manager's list.
+        """
+
+    @abstractmethod
+    def remove(self, connection: "Connection") -> None:
+        """
+        Called when a stored connection is removed from the manager's list.
+        """
+
+    @abstractmethod
+    def rebuild(self, connections: list["Connection"]) -> None:
+        """
+        Called when the manager's whole list is replaced.
+        """
+
+    def replace(self, old_connection: "Connection", new_connection: "Connection") -> None:
+        """
+        Called when a stored connection is replaced by another at the same position. Indexes
+        that care about order should override this.
+        """
+        self.remove(old_connection)
+        self.add(new_connection)
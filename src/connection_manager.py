@@ -1,11 +1,20 @@
 import csv
 import logging
-from typing import Any
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
 from io import StringIO
 
 from src.connection import Connection
+from src.connection_graph import ConnectionGraph
+from src.connection_index import ConnectionIndex
+from src.terminal_index import TerminalIndex
+from src.columnar_store import FIELDS, ColumnarStore
 from src.settings import Settings
 from src.file_handler import FileHandler
+from src.journal_file_handler import JournalFileHandler
+from src.autosave import DebouncedWriter, SaveState
 
 
 logger = logging.getLogger(__name__)
@@ -23,6 +32,19 @@ class DuplicateConnectionError(Exception):
     pass
 
 
+@dataclass
+class _Transaction:
+    """
+    Work deferred by ConnectionManager.transaction() until the outermost block exits.
+    """
+
+    snapshot: list[Connection]
+    journal_records: list[tuple[str, dict[str, dict[str, str]]]] = field(default_factory=list)
+    added: list[Connection] = field(default_factory=list)
+    removed: list[Connection] = field(default_factory=list)
+    save_pending: bool = False
+
+
 class ConnectionManager:
     """
     Manages the collection of Connection entities, ensuring data integrity, consistency,
@@ -38,9 +60,104 @@ class ConnectionManager:
             full_file_path (str): The full file path to the saved connections JSON file.
         """
         self.settings = Settings()
-        self.connections: list[Connection] = []
+        self._connections: list[Connection] = []
+        # canonical_key -> stored Connection, kept in sync with self._connections so that
+        # duplicate checks and lookups don't have to compare against every connection
+        self._index: dict[tuple, Connection] = {}
+        # connection_id -> position in self._connections, built on first use by an edit. Appends
+        # keep it current; anything that shifts positions drops it until it is next needed.
+        self._positions: dict[int, int] | None = None
+        # Secondary indexes, told about every change to the list (see ConnectionIndex)
+        self.indexes: list[ConnectionIndex] = []
         self.observers = []
+        # See add_save_listener
+        self.save_listeners: list[Callable[[], Callable[[], None]]] = []
         self.full_file_path = full_file_path
+        self.file_handler = self.create_file_handler(full_file_path)
+        self.autosaver: DebouncedWriter | None = None
+        self._transaction: _Transaction | None = None
+        # Which connections land on each terminal, for flagging conflicts as they are entered
+        self.terminal_index = TerminalIndex()
+        self.register_index(self.terminal_index)
+        # Terminals as nodes and connections as edges, for component, block pair and net queries
+        self.graph = ConnectionGraph()
+        self.register_index(self.graph)
+        self.columnar_store: ColumnarStore | None = None
+        if self.settings.get("columnar_store", False):
+            self.columnar_store = ColumnarStore()
+            self.register_index(self.columnar_store)
+
+    @property
+    def connections(self) -> list[Connection]:
+        return self._connections
+
+    @connections.setter
+    def connections(self, connections: list[Connection]) -> None:
+        self._connections = connections
+        self._rebuild_index()
+
+    # Index Methods
+    def _rebuild_index(self) -> None:
+        """
+        Rebuilds the duplicate-detection index from scratch. Used whenever the whole list of
+        connections is replaced.
+        """
+        self._index = {
+            connection.canonical_key(): connection for connection in self._connections
+        }
+        self._positions = None
+        for index in self.indexes:
+            index.rebuild(self._connections)
+
+    def _index_connection(self, connection: Connection) -> None:
+        # Only ever called right after the connection is appended
+        self._index[connection.canonical_key()] = connection
+        if self._positions is not None:
+            self._positions[connection.connection_id] = len(self._connections) - 1
+        for index in self.indexes:
+            index.add(connection)
+
+    def _unindex_connection(self, connection: Connection) -> None:
+        self._index.pop(connection.canonical_key(), None)
+        self._positions = None
+        for index in self.indexes:
+            index.remove(connection)
+
+    def _reindex_connection(self, old_connection: Connection, new_connection: Connection) -> None:
+        self._index.pop(old_connection.canonical_key(), None)
+        self._index[new_connection.canonical_key()] = new_connection
+        for index in self.indexes:
+            index.replace(old_connection, new_connection)
+
+    def _position_of(self, connection: Connection) -> int:
+        if self._positions is None:
+            self._positions = {
+                stored.connection_id: position
+                for position, stored in enumerate(self._connections)
+            }
+        return self._positions[connection.connection_id]
+
+    def register_index(self, index: ConnectionIndex) -> None:
+        """
+        Adds a secondary index and fills it with the current connections.
+
+        Args:
+            index (ConnectionIndex): The index to keep up to date.
+        """
+        self.indexes.append(index)
+        index.rebuild(self._connections)
+
+    def find_connection(self, connection: Connection) -> Connection | None:
+        """
+        Returns the stored connection equal to the given one (in either orientation), or None.
+
+        Args:
+            connection (Connection): The connection to look up.
+        """
+        return self._index.get(connection.canonical_key())
+
+    def has_connection(self, connection: Connection) -> bool:
+        return connection.canonical_key() in self._index
 
     # Observer Methods to update the connection list in the GUI
     def add_observer(self, observer: Any) -> None:
@@ -64,10 +181,30 @@ class ConnectionManager:
     def notify_observers(self, **kwargs) -> None:
         """
         Alerts all registered observers of changes to connections, ensuring synchronized updates.
+        Inside a transaction this does nothing; the transaction notifies once when it commits.
         """
+        if self._transaction is not None:
+            return
         for observer in self.observers:
             observer.update_connection_list(**kwargs)
 
+    def add_save_listener(self, listener: Callable[[], Callable[[], None]]) -> None:
+        """
+        Registers a listener for writes that leave the project file holding every change. The
+        listener is called just before such a write, on whichever thread makes it, and returns a
+        callback that is called once the write has succeeded.
+
+        Args:
+            listener: Called before each write, returns the callback for after it.
+        """
+        self.save_listeners.append(listener)
+
+    def remove_save_listener(self, listener: Callable[[], Callable[[], None]]) -> None:
+        self.save_listeners.remove(listener)
+
+    def _prepare_save(self) -> list[Callable[[], None]]:
+        return [listener() for listener in list(self.save_listeners)]
+
     # Other methods
     def set_save_file_name(self, file_name: str) -> None:
         """
@@ -76,20 +213,172 @@ class ConnectionManager:
         Args:
             file_name (str): The desired name for the save file
         """
+        # Anything still pending belongs to the previous file
+        self.flush()
+        self.file_handler.close()
         self.full_file_path = file_name
-        self.file_handler = FileHandler(self.full_file_path)
+        self.file_handler = self.create_file_handler(self.full_file_path)
+        # Journaled files already record each change cheaply, and compacting them from a
+        # background thread would race with the appends
+        if self.settings.get("write_behind_save", False) and not self.file_handler.journaled:
+            interval = float(self.settings.get("autosave_interval_seconds", 2))
+            self.autosaver = DebouncedWriter(self.write_json_file, interval)
+        else:
+            self.autosaver = None
+
+    def create_file_handler(self, file_path: str | None) -> FileHandler:
+        """
+        Picks the file handler for a project file based on its extension.
+
+        Args:
+            file_path (str): The full path to the project file.
+        """
+        if file_path and str(file_path).endswith(JournalFileHandler.EXTENSION):
+            threshold = int(self.settings.get("journal_compaction_bytes", 1_000_000))
+            return JournalFileHandler(file_path, compaction_threshold=threshold)
+        return FileHandler(file_path)
+
+    def journal_change(self, op: str, position: int | None = None, **payload: Connection) -> None:
+        """
+        Records a single change in the project journal, if the project file is journaled.
+
+        Args:
+            op (str): "add", "delete", "edit" or "insert"
+            position (int): Where an "insert" puts its connection.
+            payload: The connections involved in the change.
+        """
+        if not self.file_handler.journaled:
+            return
+        record = {name: connection.to_dict() for name, connection in payload.items()}
+        if position is not None:
+            record["position"] = position
+        if self._transaction is not None:
+            self._transaction.journal_records.append((op, record))
+        else:
+            self.file_handler.append(op, **record)
 
     def save_json_to_file(self) -> bool:
         """
-        Converts connections to JSON and saves to file.
+        Persists the connections according to the save mode. Journaled projects have already
+        recorded the change and only rewrite the file when the log needs compacting. In
+        write-behind mode this only marks the project as dirty, and the autosaver writes it out
+        on a background thread.
 
         Returns:
             bool: True if successful, False otherwise
         """
-        data = [connection.to_dict() for connection in self.connections]
+        if self._transaction is not None:
+            self._transaction.save_pending = True
+            return True
+        if self.file_handler.journaled and not self.file_handler.needs_compaction():
+            # Every change has already been appended to the file
+            for saved in self._prepare_save():
+                saved()
+            return True
+        if self.autosaver is not None:
+            self.autosaver.mark_dirty()
+            return True
+        return self.write_json_file()
+
+    def write_json_file(self) -> bool:
+        """
+        Converts connections to JSON and writes them to file immediately.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        # Before the copy, so the listeners only count changes the copy includes
+        saved_callbacks = self._prepare_save()
+        # Copy the list first, the autosaver calls this from a background thread
+        data = [connection.to_dict() for connection in self.connections[:]]
         success = self.file_handler.save(data)
+        if success:
+            for saved in saved_callbacks:
+                saved()
         return success
 
+    def flush(self) -> bool:
+        """
+        Writes any changes the autosaver is still holding on to.
+
+        Returns:
+            bool: True if nothing was pending or the write succeeded.
+        """
+        if self.autosaver is None:
+            return True
+        return self.autosaver.flush()
+
+    def save_now(self) -> bool:
+        """
+        Writes the project file right away, as a manual save does. With an autosaver the write
+        goes through it, so it never overlaps one of its background writes.
+
+        Returns:
+            bool: True if the write succeeded.
+        """
+        if self.autosaver is None:
+            return self.write_json_file()
+        self.autosaver.mark_dirty()
+        return self.autosaver.flush()
+
+    def save_state(self) -> str:
+        """
+        Returns one of the SaveState values, for display in the UI.
+        """
+        if self.autosaver is None:
+            return SaveState.SAVED
+        return self.autosaver.state
+
+    # Transactions
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Groups several mutations so that they are journaled, saved and reported to the observers
+        once, when the block exits. If the block raises, every change made inside it is rolled
+        back and the observers are told to refresh in full, since a command inside the block may
+        already have published its change. Nested transactions join the outermost one.
+
+            with connection_manager.transaction():
+                connection_manager.delete_connection(a)
+                connection_manager.add_connection(...)
+        """
+        if self._transaction is not None:
+            yield
+            return
+        self._transaction = _Transaction(snapshot=self._connections[:])
+        try:
+            yield
+        except BaseException:
+            # Nothing has reached the file yet, restoring the list is enough for it. Events
+            # published inside the block may have reached the observers though.
+            self._connections[:] = self._transaction.snapshot
+            self._rebuild_index()
+            self._transaction = None
+            self.notify_observers()
+            raise
+        transaction, self._transaction = self._transaction, None
+        self._commit_transaction(transaction)
+
+    def _commit_transaction(self, transaction: _Transaction) -> None:
+        if transaction.journal_records:
+            self.file_handler.append_many(transaction.journal_records)
+        if transaction.save_pending:
+            self.save_json_to_file()
+        # A connection added and removed again within the transaction was never visible
+        added_ids = {id(connection) for connection in transaction.added}
+        removed_ids = {id(connection) for connection in transaction.removed}
+        added = [c for c in transaction.added if id(c) not in removed_ids]
+        removed = [c for c in transaction.removed if id(c) not in added_ids]
+        if added or removed:
+            self.notify_observers(added=added, removed=removed)
+
+    def _track_change(
+        self, added: Iterable[Connection] = (), removed: Iterable[Connection] = ()
+    ) -> None:
+        if self._transaction is not None:
+            self._transaction.added.extend(added)
+            self._transaction.removed.extend(removed)
+
     def populate_connections(self, conn_dicts) -> None:
         """
         Fills manager with connections from provided dictionaries.
@@ -98,39 +387,210 @@ class ConnectionManager:
             conn_dicts (list): List of dictionaries representing connections.
         """
         if conn_dicts is not None:
-            self.connections = [
-                Connection(**conn_dict)
-                for conn_dict in conn_dicts
-                if not Connection(**conn_dict).is_empty()
-            ]  # **conn_dict is because we're unpacking the dictionary into the Wire object
+            connections = []
+            for conn_dict in conn_dicts:
+                # **conn_dict is because we're unpacking the dictionary into the Wire object
+                connection = Connection(**conn_dict)
+                if not connection.is_empty():
+                    connections.append(connection)
+            self.connections = connections
 
     def delete_connection(self, connection_to_delete: Connection) -> bool:
-        if connection_to_delete in self.connections:
-            self.connections.remove(connection_to_delete)
+        stored_connection = self.find_connection(connection_to_delete)
+        if stored_connection is not None:
+            self.connections.remove(stored_connection)
+            self._unindex_connection(stored_connection)
+            self.journal_change("delete", connection=stored_connection)
+            self._track_change(removed=[stored_connection])
             self.save_json_to_file()
+            self.notify_observers(removed=[stored_connection])
             return True
         else:
             return False
 
-    def edit_connection(
-        self, old_connection: Connection, new_connection: Connection
-    ) -> bool:  # TODO: design tests for this method
-        if old_connection in self.connections:
-            # If new connection already exists or is the reverse of an existing connection,
-            # don't do the edit
-            if new_connection in self.connections:
-                return False
-            # Find the index of the old connection and replace it with the new one
-            index = self.connections.index(old_connection)
-            self.connections[index] = new_connection
-            # Save updated connections to file
-            self.save_json_to_file()
-            return True
-        else:
+    def delete_connections(self, connections_to_delete: Iterable[Connection]) -> list[Connection]:
+        """
+        Deletes many connections in one pass over the list, with a single save and observer
+        notification. Connections that aren't stored are skipped.
+
+        Args:
+            connections_to_delete: The connections to delete, in either orientation.
+
+        Returns:
+            list: The stored connections that were deleted, in list order.
+        """
+        return [connection for _, connection in self.pop_connections(connections_to_delete)]
+
+    def pop_connections(
+        self, connections_to_delete: Iterable[Connection]
+    ) -> list[tuple[int, Connection]]:
+        """
+        Same as delete_connections, but also returns where each deleted connection was, so that
+        insert_connections can put them back exactly.
+
+        Returns:
+            list: (position, connection) pairs for the deleted connections, in list order.
+        """
+        with self.transaction():
+            removed_ids: set[int] = set()
+            for connection in connections_to_delete:
+                stored_connection = self.find_connection(connection)
+                if stored_connection is None:
+                    continue
+                # Unindexing right away also skips repeats of the same connection
+                self._unindex_connection(stored_connection)
+                removed_ids.add(id(stored_connection))
+            positioned: list[tuple[int, Connection]] = []
+            if removed_ids:
+                kept = []
+                for position, connection in enumerate(self._connections):
+                    if id(connection) in removed_ids:
+                        positioned.append((position, connection))
+                    else:
+                        kept.append(connection)
+                # Replace the contents so the list object (and anyone holding it) stays the same
+                self._connections[:] = kept
+                removed = [connection for _, connection in positioned]
+                for connection in removed:
+                    self.journal_change("delete", connection=connection)
+                self._track_change(removed=removed)
+                self.save_json_to_file()
+            logger.info(f"Deleted {len(positioned)} connections.")
+        return positioned
+
+    def insert_connections(self, positioned: Iterable[tuple[int, Connection]]) -> list[Connection]:
+        """
+        Puts connections back at the positions pop_connections returned, as one transaction:
+        a single merge pass over the list, one save and one observer notification. Positions
+        past the end of the list append, without the merge pass, and connections that are
+        stored again by now are skipped.
+
+        Args:
+            positioned: (position, connection) pairs, as returned by pop_connections.
+
+        Returns:
+            list: The connections that were inserted.
+        """
+        with self.transaction():
+            inserted: list[tuple[int, Connection]] = []
+            for position, connection in sorted(positioned, key=lambda pair: pair[0]):
+                if self.has_connection(connection):
+                    continue
+                self._index[connection.canonical_key()] = connection
+                inserted.append((position, connection))
+            if inserted and inserted[0][0] >= len(self._connections):
+                # All past the end, e.g. a redone add: plain appends keep the position map and
+                # every index current
+                for _, connection in inserted:
+                    self._connections.append(connection)
+                    self._index_connection(connection)
+            elif inserted:
+                # Each position counts the connections inserted before it, exactly as if they
+                # were list.insert()ed one by one in ascending order
+                merged: list[Connection] = []
+                remaining = iter(self._connections)
+                for position, connection in inserted:
+                    while len(merged) < position:
+                        following = next(remaining, None)
+                        if following is None:
+                            break
+                        merged.append(following)
+                    merged.append(connection)
+                merged.extend(remaining)
+                self._connections[:] = merged
+                self._positions = None
+                for index in self.indexes:
+                    if index.ordered:
+                        index.rebuild(self._connections)
+                    else:
+                        for _, connection in inserted:
+                            index.add(connection)
+            if inserted:
+                connections = [connection for _, connection in inserted]
+                for position, connection in inserted:
+                    self.journal_change("insert", position=position, connection=connection)
+                self._track_change(added=connections)
+                self.save_json_to_file()
+            logger.info(f"Restored {len(inserted)} connections.")
+        return [connection for _, connection in inserted]
+
+    def edit_connection(self, old_connection: Connection, new_connection: Connection) -> bool:
+        """
+        Replaces a stored connection in place: the replacement keeps its position in the list and
+        its connection_id, so the connection list only redraws one row. The edit is one
+        transaction with a single save and observer notification.
+
+        Args:
+            old_connection (Connection): The connection to edit, in either orientation.
+            new_connection (Connection): The new values.
+
+        Returns:
+            bool: True if the edit was made, False if old_connection isn't stored or the new
+            values would duplicate another connection.
+        """
+        stored_connection = self.find_connection(old_connection)
+        if stored_connection is None:
             return False
+        # The same connection turned around (or unchanged) is not a duplicate of itself
+        existing = self.find_connection(new_connection)
+        if existing is not None and existing is not stored_connection:
+            return False
+        # new_connection is stored as is and takes over the id, which is what ties the row and
+        # every secondary index entry to this connection
+        new_connection.connection_id = stored_connection.connection_id
+        with self.transaction():
+            self._connections[self._position_of(stored_connection)] = new_connection
+            self._reindex_connection(stored_connection, new_connection)
+            self.journal_change("edit", old=stored_connection, new=new_connection)
+            self._track_change(added=[new_connection], removed=[stored_connection])
+            self.save_json_to_file()
+        return True
+
+    # Bulk queries
+    def filter_connections(self, **field_values: str) -> list[Connection]:
+        """
+        Returns the connections whose fields equal all of the given values, in order. Uses the
+        columnar store when it is enabled.
+
+            connection_manager.filter_connections(source_component="PLC")
+        """
+        for name in field_values:
+            if name not in FIELDS:
+                raise ValueError(f"Unknown connection field: {name}")
+        if self.columnar_store is not None:
+            rows = self.columnar_store.filter_rows(**field_values)
+            # Hand back the stored objects rather than the store's views
+            return [
+                self._index[view.canonical_key()]
+                for view in self.columnar_store.iter_connections(rows)
+            ]
+        return [
+            connection
+            for connection in self.connections
+            if all(getattr(connection, name) == value for name, value in field_values.items())
+        ]
+
+    def count_by(self, name: str) -> Counter[str]:
+        """
+        Counts the connections per distinct value of one field.
+        """
+        if name not in FIELDS:
+            raise ValueError(f"Unknown connection field: {name}")
+        if self.columnar_store is not None:
+            return self.columnar_store.count_by(name)
+        return Counter(getattr(connection, name) for connection in self.connections)
+
+    def export_snapshot(self) -> list[Connection] | ColumnarStore:
+        """
+        Returns a copy of the connections that is safe to export from another thread: a
+        snapshot of the columnar store when it is enabled, otherwise a copy of the list.
+        """
+        if self.columnar_store is not None:
+            return self.columnar_store.copy()
+        return self.get_connections()
 
     def get_connection_tuple(self, connection: Connection) -> tuple[str, str]:
-        if connection not in self.connections:
+        if not self.has_connection(connection):
             return ("", "")
         return connection.to_tuple()
 
@@ -158,9 +618,13 @@ class ConnectionManager:
         )
 
         logger.info(f"Adding connection: {connection}")
-        # Use "not in" to access the Wire's __eq__ function to check for duplicates
-        if connection not in self.connections:
+        # The index is keyed on the orientation-independent key, so this also catches reversed
+        # duplicates without comparing against every stored connection
+        if not self.has_connection(connection):
             self.connections.append(connection)
+            self._index_connection(connection)
+            self.journal_change("add", connection=connection)
+            self._track_change(added=[connection])
             self.save_json_to_file()
             logger.info("Connection successfully added.")
             self.notify_observers()
@@ -169,6 +633,41 @@ class ConnectionManager:
             logger.info("Attempted to add duplicate or reverse duplicate connection.")
             raise DuplicateConnectionError("Duplicate connection attempted")
 
+    def add_connections(
+        self, conn_dicts: Iterable[dict[str, str]]
+    ) -> tuple[list[Connection], int]:
+        """
+        Adds many connections as one transaction: a single pass over the rows against the index,
+        then one journal write, one save and one observer notification for the whole batch.
+        Empty rows are ignored, and duplicates (including duplicates within the batch) are
+        counted rather than raised.
+
+        Args:
+            conn_dicts: Dictionaries of connection fields, e.g. from the label importer.
+
+        Returns:
+            tuple: The connections that were added, and the number of duplicates skipped.
+        """
+        added: list[Connection] = []
+        duplicates = 0
+        with self.transaction():
+            for conn_dict in conn_dicts:
+                connection = Connection(**conn_dict)
+                if connection.is_empty():
+                    continue
+                if self.has_connection(connection):
+                    duplicates += 1
+                    continue
+                self.connections.append(connection)
+                self._index_connection(connection)
+                self.journal_change("add", connection=connection)
+                added.append(connection)
+            if added:
+                self._track_change(added=added)
+                self.save_json_to_file()
+        logger.info(f"Added {len(added)} connections, skipped {duplicates} duplicates.")
+        return added, duplicates
+
     def generate_csv_string(self) -> str:
         # Create a CSV string using StringIO
         csv_output = StringIO()
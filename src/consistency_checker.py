@@ -0,0 +1,80 @@
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from src.autosave import SaveState
+from src.connection import Connection
+
+if TYPE_CHECKING:
+    from src.connection_manager import ConnectionManager
+
+"""
+Debugging aid that periodically compares the project file on disk with the connections held in
+memory. The add/remove paths never re-read the file, so this is the only place a divergence
+between the two would show up. It runs on a background thread and only logs what it finds.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class ConsistencyChecker:
+    def __init__(self, connection_manager: "ConnectionManager", interval: float) -> None:
+        """
+        Args:
+            connection_manager (ConnectionManager): The manager whose file is checked.
+            interval (float): Seconds between checks.
+        """
+        self.connection_manager = connection_manager
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            # Check twice before reporting, a save or append may have been in flight
+            if not self.check() and not self.check():
+                logger.warning(
+                    f"Project file {self.connection_manager.full_file_path} does not match "
+                    "the connections in memory"
+                )
+
+    def check(self) -> bool:
+        """
+        Compares the file on disk with memory.
+
+        Returns:
+            bool: True if they match, or if the file is expected to be behind memory.
+        """
+        if self.connection_manager.save_state() != SaveState.SAVED:
+            # Write-behind hasn't caught up yet, the file is supposed to be stale
+            return True
+        # Use a separate handler so the manager's own handler state is left alone
+        file_handler = self.connection_manager.create_file_handler(
+            self.connection_manager.full_file_path
+        )
+        on_disk = [
+            Connection(**conn_dict).canonical_key()
+            for conn_dict in (file_handler.load() or [])
+        ]
+        in_memory = [
+            connection.canonical_key()
+            for connection in self.connection_manager.connections[:]
+            if not connection.is_empty()
+        ]
+        if on_disk != in_memory:
+            logger.debug(
+                f"Consistency check: {len(on_disk)} connections on disk, "
+                f"{len(in_memory)} in memory"
+            )
+            return False
+        return True
@@ -1,32 +1,59 @@
 # Love is love. Be yourself
 import logging
+import threading
 
+from pathlib import Path
 from tkinter import filedialog
 
 from src.ui.main_view import MainView
 from src.ui.new_project_dialog import NewProjectDialog
+from src.ui.export_progress_dialog import ExportProgressDialog
 
+from src.connection import Connection
 from src.file_handler import FileHandler
 from src.settings import Settings
 from src.localizer import Localizer
-from src.command_manager import CommandManager
+from src.command_manager import DEFAULT_MEMORY_BUDGET_BYTES, CommandManager
 from src.event_system import EventSystem
+from src.consistency_checker import ConsistencyChecker
+from src.pair_predictor import PairPredictor
+from src.prefix_index import PrefixIndex
+from src.search_index import SearchIndex
+from src.terminal_index import format_terminal, write_conflict_report
+from src.undo_journal import UndoJournal, history_events, read_events, remove_journal
+from src.increment_predictor import (
+    LEARNED_BIGRAMS_FILE,
+    IncrementLearner,
+    IncrementPredictor,
+)
 from src.connection_manager import (
     ConnectionManager,
+    DuplicateConnectionError,
     NoFilePathGivenException,
 )
 from src.utility_functions import ExportFormat
 from src.command import (
     AddConnectionCommand,
+    ConnectionNotFoundError,
     DeleteConnectionCommand,
+    EditConnectionCommand,
+    ImportLabelsCommand,
 )
 from src.csv_exporting_strategy import (
+    ExportProgress,
+    ExportToCSVStrategy,
     ExportWireToCSVStrategy,
     ExportCableToCSVStrategy,
 )
 
 logger = logging.getLogger(__name__)
 
+# Exports with more rows than this show a progress dialog
+EXPORT_PROGRESS_DIALOG_THRESHOLD = 5000
+
+# The shipped frequency tables, and what the program learns on top of them
+DATA_DIRECTORY = Path(__file__).resolve().parents[2] / "data"
+
 
 class Controller:
     """
@@ -38,13 +65,19 @@ class Controller:
     def __init__(self) -> None:
         self.settings = Settings()
         self.localizer = Localizer(self.settings.get("language"))
-        self.command_manager = CommandManager()
+        self.command_manager = CommandManager(
+            int(self.settings.get("undo_memory_budget_bytes", DEFAULT_MEMORY_BUDGET_BYTES))
+        )
         self.event_system = EventSystem()  # Publish-Subscribe system for actions
         self.connection_manager = ConnectionManager()
+        self.create_increment_predictor()
+        self.create_indexes()
         self.view = MainView(controller=self, settings=self.settings)
         self.undo_stack = []
         self.full_file_path = None
         self.file_handler = FileHandler()
+        self.consistency_checker: ConsistencyChecker | None = None
+        self.undo_journal: UndoJournal | None = None
 
     def initialize(self) -> None:
         """
@@ -55,6 +88,90 @@ class Controller:
         """
         self.wait_for_new_project_dialog()
         self.load_connections()
+        self.start_undo_journal()
+        self.start_consistency_checker()
+
+    def create_increment_predictor(self) -> None:
+        """
+        Loads the increment and next-connection prediction tables once and, if enabled in the
+        settings, learns from every connection that is added.
+        """
+        self.increment_predictor = IncrementPredictor.from_data_directory(DATA_DIRECTORY)
+        self.pair_predictor = PairPredictor.from_data_directory(
+            DATA_DIRECTORY, self.increment_predictor
+        )
+        self.increment_learner: IncrementLearner | None = None
+        if self.settings.get("increment_learning", True):
+            interval = float(self.settings.get("autosave_interval_seconds", 2))
+            self.increment_learner = IncrementLearner(
+                self.increment_predictor, DATA_DIRECTORY / LEARNED_BIGRAMS_FILE, interval
+            )
+            self.event_system.subscribe(
+                "connection_added", self.increment_learner.on_connection_added
+            )
+
+    def create_indexes(self) -> None:
+        """
+        Builds the indexes behind the entry fields' autocomplete and the connection list's filter
+        box. The connection manager keeps them up to date as connections are added, removed or
+        loaded.
+        """
+        self.prefix_index = PrefixIndex.from_data_directory(DATA_DIRECTORY)
+        self.connection_manager.register_index(self.prefix_index)
+        self.search_index = SearchIndex()
+        self.connection_manager.register_index(self.search_index)
+
+    def start_consistency_checker(self) -> None:
+        """
+        Starts the background disk-vs-memory check if it is enabled in the settings. It is off
+        by default and meant for debugging.
+        """
+        interval = float(self.settings.get("debug_consistency_check_seconds", 0))
+        if interval > 0 and self.full_file_path:
+            self.consistency_checker = ConsistencyChecker(self.connection_manager, interval)
+            self.consistency_checker.start()
+
+    def start_undo_journal(self) -> None:
+        """
+        Recovers the previous session's undo history if the New Project dialog asked for it,
+        then journals this session's history next to the project.
+        """
+        if not self.full_file_path:
+            return
+        result = self.new_project_dialog.result or {}
+        recovering = result.get("recover_session", False)
+        if recovering:
+            events = read_events(self.full_file_path)
+        else:
+            # Left over from a session that wasn't recovered, and no longer matches the project
+            remove_journal(self.full_file_path)
+            events = []
+        # Carries on with the recovered file, and listens for saves before the recovery makes
+        # one, so the journal records which of its events the project file now holds
+        self.undo_journal = UndoJournal(
+            self.full_file_path, recorded=len(history_events(events))
+        )
+        self.connection_manager.add_save_listener(self.undo_journal.before_save)
+        if recovering:
+            applied = self.command_manager.recover(events, parent=self)
+            self.view.display_status(
+                self.localizer.get("recovered_session").format(
+                    count=len(history_events(events)), applied=applied
+                )
+            )
+        self.command_manager.journal = self.undo_journal
+
+    def close_undo_journal(self, saved: bool) -> None:
+        """
+        Stops journaling the undo history. The journal is only deleted once the project is
+        saved, otherwise the next launch offers to recover it.
+        """
+        if self.undo_journal is None:
+            return
+        self.command_manager.journal = None
+        self.connection_manager.remove_save_listener(self.undo_journal.before_save)
+        self.undo_journal.close(remove=saved)
+        self.undo_journal = None
 
     def wait_for_new_project_dialog(self) -> None:
         """
@@ -77,7 +194,8 @@ class Controller:
 
         # Show the main window if all the proper fields are set.
         if self.full_file_path is not None and self.full_file_path != "":
-            self.file_handler = FileHandler(self.full_file_path)
+            # Share the manager's handler, it knows whether the project is journaled
+            self.file_handler = self.connection_manager.file_handler
             self.view.deiconify()
         else:
             return  # Figure out how I want to handle this case.
@@ -124,32 +242,37 @@ class Controller:
     def update_connection_list(self):
         self.view.tree_widget.update_connection_list()
 
-    def save_edited_connection_command(self) -> None:
-        """
-        saves a connection being edited based on user input or other triggers.
-        """
-        # Fetch the new values after user edits
-        p1_values = {
-            "source_component": self.view.entry_frame.source_component.get(),
-            "source_terminal_block": self.view.entry_frame.source_terminal_block.get(),
-            "source_terminal": self.view.entry_frame.source_terminal.get(),
-        }
-        p2_values = {
-            "destination_component": self.view.entry_frame.destination_component.get(),
-            "destination_terminal_block": self.view.entry_frame.destination_terminal_block.get(),
-            "destination_terminal": self.view.entry_frame.destination_terminal.get(),
-        }
-        new_values = {
-            "source_component": self.view.entry_frame.source_component.get(),
-            "source_terminal_block": self.view.entry_frame.source_terminal_block.get(),
-            "source_terminal": self.view.entry_frame.source_terminal.get(),
-            "destination_component": self.view.entry_frame.destination_component.get(),
-            "destination_terminal_block": self.view.entry_frame.destination_terminal_block.get(),
-            "destination_terminal": self.view.entry_frame.destination_terminal.get(),
-        }
-
-        # Add the edited connection
-        self.add_connection_command(p1_values, p2_values)
+    def save_edited_connection_command(
+        self,
+        old_connection: Connection,
+        source: dict[str, str],
+        destination: dict[str, str],
+    ) -> bool:
+        """
+        Replaces a stored connection with the values in the entries, in place.
+
+        Returns:
+            bool: True if the connection was edited, False if the new values would duplicate
+            another connection or the connection is no longer stored.
+        """
+        new_values = {f"source_{name}": value for name, value in source.items()}
+        new_values.update({f"destination_{name}": value for name, value in destination.items()})
+        command = EditConnectionCommand(self, self.connection_manager, old_connection, new_values)
+        try:
+            self.command_manager.execute(command)
+        except DuplicateConnectionError:
+            self.view.display_status(self.localizer.get("duplicate_edit"))
+            return False
+        except ConnectionNotFoundError:
+            self.view.display_status(self.localizer.get("edit_target_missing"))
+            return False
+        source_label, destination_label = Connection(**new_values).to_tuple()
+        self.view.display_status(
+            self.localizer.get("edited_connection").format(
+                source=source_label, destination=destination_label
+            )
+        )
+        return True
 
     def add_connection_command(
         self, source: dict[str, str], destination: dict[str, str]
@@ -160,7 +283,52 @@ class Controller:
         command = AddConnectionCommand(
             self.event_system, self.connection_manager, source, destination
         )
-        self.command_manager.execute(command)
+        try:
+            self.command_manager.execute(command)
+        except DuplicateConnectionError:
+            self.view.display_status(self.localizer.get("duplicate_connection"))
+
+    def warn_about_terminal_conflicts(self, connection: Connection) -> bool:
+        """
+        Shows a warning if either end of connection lands on a terminal another connection
+        already uses.
+
+        Returns:
+            bool: True if there was a conflict.
+        """
+        conflicts = self.connection_manager.terminal_index.conflicts_with(connection)
+        if not conflicts:
+            return False
+        other_ids = {other.connection_id for others in conflicts.values() for other in others}
+        self.view.display_status(
+            self.localizer.get("terminal_conflict").format(
+                terminals=", ".join(format_terminal(terminal) for terminal in conflicts),
+                count=len(other_ids),
+            )
+        )
+        return True
+
+    def report_terminal_conflicts(self) -> None:
+        """
+        Lists every terminal landed by more than one connection, and saves the list as CSV.
+        """
+        report = self.connection_manager.terminal_index.report()
+        if not report:
+            self.view.display_status(self.localizer.get("no_terminal_conflicts"))
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="Save conflict report as...",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+        )
+        if not file_path:
+            return
+        if write_conflict_report(report, file_path):
+            self.view.display_status(
+                self.localizer.get("terminal_conflict_report").format(
+                    count=len(report), file_path=file_path
+                )
+            )
 
     def delete_connection_command(self) -> None:
         """
@@ -170,23 +338,18 @@ class Controller:
             parent=self, connection_manager=self.connection_manager, view=self.view
         )
         self.command_manager.execute(command)
-        self.view.tree_widget.update_connection_list()
 
     def undo_connection_command(self) -> None:
         """
         Uses CommandManager to revert the latest change.
         """
-        if self.command_manager.undo_stack:
-            command = self.command_manager.undo_stack.pop()
-            command.undo()
+        self.command_manager.undo()
 
     def redo_connection_command(self) -> None:
         """
         Re-applies an action that was undone.
         """
-        if self.command_manager.redo_stack:
-            command = self.command_manager.redo_stack.pop()
-            command.redo()
+        self.command_manager.redo()
 
     def export_to_csv(self, format: ExportFormat) -> None:
         """
@@ -203,31 +366,108 @@ class Controller:
         else:
             raise ValueError(f"Invalid format: {format}")
 
-        # Generate the CSV-formatted string using the chosen strategy
-        csv_data = strategy.generate_csv_string(self.connection_manager.connections)
+        # The preview is modal, so it can read the rows lazily from the live list; it only
+        # formats the pages the user actually scrolls to
+        connections = self.connection_manager.connections
+        rows = strategy.iter_rows(connections)
 
         # Display the CSV preview using the MainView
         # The show_csv_preview method will handle the saving functionality
-        user_wants_to_export = self.view.show_csv_preview(csv_data, self.localizer)
+        user_wants_to_export = self.view.show_csv_preview(
+            rows, len(connections), self.localizer
+        )
 
         if user_wants_to_export:
             file_path = filedialog.asksaveasfilename(title="Save CSV as...")
             if file_path == "":
                 return
             if self.file_handler is not None:
-                self.file_handler.export(
+                self.run_export(file_path, strategy)
+            else:
+                print("file handler not initialized")
+
+    def run_export(self, file_path: str, strategy: ExportToCSVStrategy) -> None:
+        """
+        Streams the export to disk on a worker thread. Large exports show a progress dialog that
+        can cancel the export.
+
+        Args:
+            file_path (str): Where to write the CSV file.
+            strategy (ExportToCSVStrategy): How to format each row.
+        """
+        # Take a snapshot so edits made during the export don't change what is written
+        connections = self.connection_manager.export_snapshot()
+        progress = ExportProgress(total=len(connections))
+        cancel_event = threading.Event()
+
+        def update_progress(rows_written: int) -> None:
+            progress.rows_written = rows_written
+
+        def export() -> None:
+            try:
+                progress.succeeded = self.file_handler.export(
                     file_path=file_path,
                     strategy=strategy,
-                    data=self.connection_manager.connections,
+                    data=connections,
+                    progress_callback=update_progress,
+                    cancel_event=cancel_event,
                 )
-                self.view.display_status(f"Export to {file_path} Successful")
-            else:
-                print("file handler not initialized")
+            except FileExistsError as e:
+                logger.error(str(e))
+            finally:
+                progress.finished = True
+
+        worker = threading.Thread(target=export, daemon=True)
+        worker.start()
+        if progress.total > EXPORT_PROGRESS_DIALOG_THRESHOLD:
+            dialog = ExportProgressDialog(self.view, self.localizer, progress, cancel_event)
+            self.view.wait_window(dialog)
+        worker.join()
+
+        if progress.succeeded:
+            self.view.display_status(f"Export to {file_path} Successful")
+        elif cancel_event.is_set():
+            self.view.display_status(self.localizer.get("export_cancelled"))
+        else:
+            self.view.display_status(self.localizer.get("export_failed"))
+
+    def import_labels(self) -> None:
+        """
+        Imports connections from legacy label files (.wir, .cab, .csv or a .zip of them) chosen
+        by the user, and reports how many were added.
+        """
+        file_paths = filedialog.askopenfilenames(
+            title="Import label files...",
+            filetypes=[
+                ("Label files", "*.wir *.cab *.csv *.json *.zip"),
+                ("All files", "*.*"),
+            ],
+        )
+        if not file_paths:
+            return
+        # One undo entry for the whole import
+        command = ImportLabelsCommand(self.connection_manager, file_paths)
+        self.command_manager.execute(command)
+        stats = command.stats
+        self.view.display_status(
+            self.localizer.get("import_summary").format(
+                added=stats.added,
+                rows=stats.rows,
+                files=stats.files,
+                duplicates=stats.duplicates,
+                rate=f"{stats.rows_per_second:.0f}",
+            )
+        )
 
     def quit_program(self) -> None:
         """
         Destroys the UI
         """
+        self.close_undo_journal(self.connection_manager.flush())
+        if self.increment_learner is not None:
+            self.increment_learner.flush()
+        if self.consistency_checker is not None:
+            self.consistency_checker.stop()
         self.view.destroy()
 
     def handle_quit(self, quit_from_dialog: bool) -> None:
@@ -237,6 +477,13 @@ class Controller:
         Args:
             quit_from_dialog (bool): Indicates if the quit action was triggered from a dialog.
         """
+        # Write out anything the autosaver hasn't saved yet
+        self.connection_manager.flush()
+        if self.increment_learner is not None:
+            self.increment_learner.flush()
+        if self.consistency_checker is not None:
+            self.consistency_checker.stop()
+
         if quit_from_dialog:
             # Return early because we're not saving a file
             self.quit_program()
@@ -244,13 +491,14 @@ class Controller:
 
         # Save the file before quitting
         if self.full_file_path:
-            self.save_to_json_file()
+            self.close_undo_journal(self.save_to_json_file())
         else:
             save = self.view.prompt_save()
             if save:
                 file_path = self.view.open_save_dialog()
                 if file_path:
                     self.full_file_path = file_path
+                    self.set_file_path(file_path)
                     self.save_to_json_file()
 
     def run(self) -> None:
@@ -266,11 +514,7 @@ class Controller:
         Returns:
             bool: Success status of the save operation.
         """
-        data = [
-            connection.to_dict() for connection in self.connection_manager.connections
-        ]
-        success = self.file_handler.save(data)
-        return success
+        return self.connection_manager.save_now()
 
     def load_from_json_file(self) -> None:
         """
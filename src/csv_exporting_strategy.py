@@ -1,99 +1,130 @@
 import csv
 import logging
+import os
+import threading
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from src.columnar_store import ColumnarStore
 from src.connection import Connection
 
 logger = logging.getLogger(__name__)
 
+# Rows are formatted lazily and written to disk this many at a time
+EXPORT_CHUNK_SIZE = 2000
+
+
+@dataclass
+class ExportProgress:
+    """
+    Shared between an export running on a worker thread and the UI that reports on it.
+    """
+
+    total: int
+    rows_written: int = 0
+    finished: bool = False
+    succeeded: bool = False
+
 
 class ExportToCSVStrategy(ABC):
-    @abstractmethod
-    def export_to_csv(self, file_path: Path, connection_list: list[Connection]) -> None:
-        pass
+    export_name = "connections"
 
     @abstractmethod
-    def generate_csv_string(self, connection_list: list[Connection]) -> str:
+    def format_endpoint(self, component: str, terminal_block: str, terminal: str) -> str:
         pass
 
+    def format_row(self, conn: Connection) -> tuple[str, str]:
+        return (
+            self.format_endpoint(
+                conn.source_component, conn.source_terminal_block, conn.source_terminal
+            ),
+            self.format_endpoint(
+                conn.destination_component,
+                conn.destination_terminal_block,
+                conn.destination_terminal,
+            ),
+        )
 
-class ExportWireToCSVStrategy(ExportToCSVStrategy):
-    def export_to_csv(self, file_path: Path, connection_list: list[Connection]) -> None:
+    def iter_rows(
+        self, connection_list: Iterable[Connection] | ColumnarStore
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Yields one formatted (source, destination) row per connection, formatting each row only
+        when it is asked for. A ColumnarStore formats each distinct endpoint only once.
+        """
+        if isinstance(connection_list, ColumnarStore):
+            yield from connection_list.iter_formatted_rows(self.format_endpoint)
+            return
+        for conn in connection_list:
+            yield self.format_row(conn)
+
+    def export_to_csv(
+        self,
+        file_path: Path,
+        connection_list: Iterable[Connection] | ColumnarStore,
+        progress_callback: Callable[[int], None] | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> bool:
+        """
+        Streams the formatted rows to disk in chunks, so memory use stays flat no matter how many
+        connections are exported.
+
+        Args:
+            file_path (Path): Where to write the CSV file. ".csv" is added if missing.
+            connection_list: The connections to export.
+            progress_callback: Called with the number of rows written after every chunk.
+            cancel_event (threading.Event): When set, the export stops and the partial file is
+                removed.
+
+        Returns:
+            bool: True if the whole file was written.
+        """
         try:
             if not file_path.suffix == ".csv":
                 file_path = file_path.with_suffix(".csv")
+            rows = self.iter_rows(connection_list)
+            rows_written = 0
             with open(file_path, "w", newline="") as file:
                 writer = csv.writer(file, delimiter="|")
-                for conn in connection_list:
-                    source = f"{conn.source_component}-{conn.source_terminal_block}-{conn.source_terminal}".strip(
-                        "-"
-                    )
-                    destination = f"{conn.destination_component}-{conn.destination_terminal_block}-{conn.destination_terminal}".strip(
-                        "-"
-                    )
-                    writer.writerow([source, destination])
-            print("Successfully exported wires")
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    writer.writerows(chunk)
+                    rows_written += len(chunk)
+                    if progress_callback is not None:
+                        progress_callback(rows_written)
+            if cancel_event is not None and cancel_event.is_set():
+                os.remove(file_path)
+                logger.info(f"Export to {file_path} cancelled after {rows_written} rows")
+                return False
+            print(f"Successfully exported {self.export_name}")
+            return True
         except FileNotFoundError:
             logger.info(f"Error: Directory '{file_path}' not found")
         except PermissionError:
             logger.info(f"Error: Permission denied to read from'{file_path}'")
         except Exception as e:
             logger.info(f"Error: {e}")
+        return False
 
-    def generate_csv_string(self, connection_list: list[Connection]) -> str:
-        csv_output = []
-        for conn in connection_list:
-            source = f"{conn.source_component}-{conn.source_terminal_block}-{conn.source_terminal}".strip(
-                "-"
-            )
-            destination = f"{conn.destination_component}-{conn.destination_terminal_block}-{conn.destination_terminal}".strip(
-                "-"
-            )
-            csv_output.append("|".join([source, destination]))
-        return "\n".join(csv_output)
+    def generate_csv_string(self, connection_list: Iterable[Connection] | ColumnarStore) -> str:
+        return "\n".join("|".join(row) for row in self.iter_rows(connection_list))
+
+
+class ExportWireToCSVStrategy(ExportToCSVStrategy):
+    export_name = "wires"
+
+    def format_endpoint(self, component: str, terminal_block: str, terminal: str) -> str:
+        return f"{component}-{terminal_block}-{terminal}".strip("-")
 
 
 class ExportCableToCSVStrategy(ExportToCSVStrategy):
-    def export_to_csv(self, file_path: Path, connection_list: list[Connection]) -> None:
-        try:
-            if not file_path.suffix == ".csv":
-                file_path = file_path.with_suffix(".csv")
-            with open(file_path, "w", newline="") as file:
-                writer = csv.writer(file, delimiter="|")
-                for conn in connection_list:
-                    source = (
-                        f"{conn.source_component}-{conn.source_terminal_block}".strip(
-                            "-"
-                        )
-                        + f" [{conn.source_terminal}]"
-                    )
-                    destination = (
-                        f"{conn.destination_component}-{conn.destination_terminal_block}".strip(
-                            "-"
-                        )
-                        + f" [{conn.destination_terminal}]"
-                    )
-                    writer.writerow([source, destination])
-            print("Successfully exported cables")
-        except FileNotFoundError:
-            logger.info(f"Error: Directory '{file_path}' not found")
-        except PermissionError:
-            logger.info(f"Error: Permission denied to read from'{file_path}'")
-        except Exception as e:
-            logger.info(f"Error: {e}")
+    export_name = "cables"
 
-    def generate_csv_string(self, connection_list: list[Connection]) -> str:
-        csv_output = []
-        for conn in connection_list:
-            source = (
-                f"{conn.source_component}-{conn.source_terminal_block}".strip("-")
-                + f" [{conn.source_terminal}]"
-            )
-            destination = (
-                f"{conn.destination_component}-{conn.destination_terminal_block}".strip(
-                    "-"
-                )
-                + f" [{conn.destination_terminal}]"
-            )
-            csv_output.append("|".join([source, destination]))
-        return "\n".join(csv_output)
+    def format_endpoint(self, component: str, terminal_block: str, terminal: str) -> str:
+        return f"{component}-{terminal_block}".strip("-") + f" [{terminal}]"
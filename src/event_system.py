@@ -1,14 +1,31 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+
 class EventSystem:
     def __init__(self) -> None:
         self._events = {}
+        self._suppressed = 0
 
     def subscribe(self, event_name: str, callback) -> None:
         if event_name not in self._events:
             self._events[event_name] = []
         self._events[event_name].append(callback)
 
+    @contextmanager
+    def suppressed(self) -> Iterator[None]:
+        """
+        Drops every event published inside the block, for bulk changes whose subscribers are
+        brought up to date some other way, e.g. by the connection manager's observers.
+        """
+        self._suppressed += 1
+        try:
+            yield
+        finally:
+            self._suppressed -= 1
+
     def publish(self, event_name: str, *args, **kwargs):
-        if event_name not in self._events:
+        if self._suppressed or event_name not in self._events:
             return
         for callback in self._events[event_name]:
             callback(*args, **kwargs)
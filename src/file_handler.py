@@ -1,6 +1,10 @@
 import logging
 import json
+import os
+import threading
 from pathlib import Path
+from typing import Callable
+from src.columnar_store import ColumnarStore
 from src.connection import Connection
 from src.csv_exporting_strategy import ExportToCSVStrategy
 
@@ -9,6 +13,9 @@ logger = logging.getLogger(__name__)
 
 
 class FileHandler:
+    # Journaled handlers record each change as it happens instead of rewriting the whole file
+    journaled = False
+
     def __init__(self, file_path: str | None = None):
         self.file_path = file_path
 
@@ -38,9 +45,13 @@ class FileHandler:
     def save(self, data: list[dict[str, str]]):
         if not self.file_path:
             return False
+        # Write to a temporary file and swap it in, so a crash mid-write never leaves a truncated
+        # project file behind
+        temp_path = f"{self.file_path}.tmp"
         try:
-            with open(self.file_path, "w") as file:
+            with open(temp_path, "w") as file:
                 json.dump(data, file, indent=4)
+            os.replace(temp_path, self.file_path)
             return True
         except FileNotFoundError:
             logger.info(f"Error: File {self.file_path} not found.")
@@ -55,13 +66,29 @@ class FileHandler:
             logger.info(f"Error: {e}")
             return False
 
-    def export(self, file_path: str, strategy: ExportToCSVStrategy, data: list[Connection]):
+    def close(self) -> None:
+        # Nothing is held open between saves
+        pass
+
+    def export(
+        self,
+        file_path: str,
+        strategy: ExportToCSVStrategy,
+        data: list[Connection] | ColumnarStore,
+        progress_callback: Callable[[int], None] | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> bool:
         full_file_path = Path(file_path)
         if full_file_path.exists():
             raise FileExistsError(
                 f"The file '{full_file_path}' already exists. Cannot overwrite."
             )
-        strategy.export_to_csv(full_file_path, data)
+        return strategy.export_to_csv(
+            full_file_path,
+            data,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+        )
 
     def validate_json_wire_fields(self, input_data: list[dict[str, str]]):
         required_fields = [
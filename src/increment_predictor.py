@@ -0,0 +1,242 @@
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.autosave import DebouncedWriter
+
+if TYPE_CHECKING:
+    from src.connection import Connection
+
+"""
+Predicts the next terminal label for the increment feature. Everything is loaded once into lookup
+tables: the user's custom bigrams, the program bigrams with their frequency counts, and how often
+each terminal label appears in wire_patterns.json. A prediction is then a dictionary lookup, with
+the range and number rules only run (and cached) for labels no bigram covers.
+
+    custom_bigrams.json     ["25-32->33-40", "3A4A->5B6B", ...]          in order of preference
+    program_bigrams.json    {"9-16->17-24": 187, ...}                    successor counts
+    wire_patterns.json      {"source": {"TB-1-8": 43, ...}, "destination": {...}}
+    learned_bigrams.json    {"9-16": {"17-24": 3}, ...}                  learned from use
+
+The predictor also learns: every accepted connection updates the successor counts in memory, and
+IncrementLearner writes the learned counts out on a background thread.
+"""
+
+logger = logging.getLogger(__name__)
+
+LEARNED_BIGRAMS_FILE = "learned_bigrams.json"
+
+RANGE_PATTERN = re.compile(r"(\d+)-(\d+)")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+class IncrementPredictor:
+    def __init__(
+        self,
+        program_bigrams: dict[str, int] | None = None,
+        custom_bigrams: list[str] | None = None,
+        wire_patterns: dict[str, dict[str, int]] | None = None,
+        learned_bigrams: dict[str, dict[str, int]] | None = None,
+    ) -> None:
+        """
+        Args:
+            program_bigrams (dict): "previous->next" strings mapped to how often they were seen.
+            custom_bigrams (list): "previous->next" strings defined by the user. They win over
+                the program bigrams, earlier entries first.
+            wire_patterns (dict): Label counts per side, used to break ties between successors
+                that were seen equally often.
+            learned_bigrams (dict): Successor counts learned from earlier sessions, added on
+                top of the program bigrams.
+        """
+        self.terminal_counts = self.count_terminals(wire_patterns or {})
+        self.bigram_counts: dict[str, dict[str, int]] = {}
+        for bigram, count in (program_bigrams or {}).items():
+            previous, _, following = bigram.partition("->")
+            successors = self.bigram_counts.setdefault(previous, {})
+            # Keep every successor with its count instead of only the last one seen
+            successors[following] = successors.get(following, 0) + int(count)
+        # Kept apart from bigram_counts so that only what was learned gets written back
+        self.learned_counts: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()  # guards learned_counts against the background writer
+        for previous, successors in (learned_bigrams or {}).items():
+            for following, count in successors.items():
+                self._count(previous, following, int(count))
+        self.custom_successors: dict[str, list[str]] = {}
+        for bigram in custom_bigrams or []:
+            previous, _, following = bigram.partition("->")
+            successors = self.custom_successors.setdefault(previous, [])
+            if following not in successors:
+                successors.append(following)
+        self._ranked: dict[str, tuple[str, ...]] = {}
+        self._rule_cache: dict[str, str] = {}
+        self._rank_all()
+
+    @classmethod
+    def from_data_directory(cls, data_directory: str | Path) -> "IncrementPredictor":
+        """
+        Loads program_bigrams.json, custom_bigrams.json, wire_patterns.json and the learned
+        bigrams from a directory. Missing or unreadable files leave their table empty.
+        """
+        data_directory = Path(data_directory)
+        return cls(
+            program_bigrams=cls.load_json(data_directory / "program_bigrams.json", {}),
+            custom_bigrams=cls.load_json(data_directory / "custom_bigrams.json", []),
+            wire_patterns=cls.load_json(data_directory / "wire_patterns.json", {}),
+            learned_bigrams=cls.load_json(data_directory / LEARNED_BIGRAMS_FILE, {}),
+        )
+
+    @staticmethod
+    def load_json(file_path: Path, default):
+        try:
+            with open(file_path, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            logger.info(f"{file_path} not found, continuing without it")
+        except (PermissionError, ValueError) as e:
+            logger.warning(f"Could not read {file_path}: {e}")
+        return default
+
+    @staticmethod
+    def count_terminals(wire_patterns: dict[str, dict[str, int]]) -> dict[str, int]:
+        """
+        Totals how often each terminal appears in wire_patterns, over both sides. The labels
+        there are "{terminal block}-{terminal}", and the terminal may itself contain hyphens.
+        """
+        counts: dict[str, int] = {}
+        for side in wire_patterns.values():
+            for label, count in side.items():
+                _, _, terminal = label.partition("-")
+                if terminal:
+                    counts[terminal] = counts.get(terminal, 0) + int(count)
+        return counts
+
+    def _count(self, previous: str, following: str, count: int) -> None:
+        successors = self.bigram_counts.setdefault(previous, {})
+        successors[following] = successors.get(following, 0) + count
+        with self._lock:
+            learned = self.learned_counts.setdefault(previous, {})
+            learned[following] = learned.get(following, 0) + count
+
+    def learn(self, previous: str, following: str) -> None:
+        """
+        Records that following was entered right after previous, and re-ranks previous's
+        successors. Only that one entry is touched, so this is cheap enough for the entry path.
+        """
+        if not previous or not following or previous == following:
+            return
+        self._count(previous, following, 1)
+        self._ranked[previous] = self._rank(previous)
+
+    def save_learned(self, file_path: str | Path) -> bool:
+        """
+        Writes the learned successor counts as compact JSON, replacing the file atomically.
+        Safe to call from a background thread.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self._lock:
+            snapshot = {
+                previous: dict(successors)
+                for previous, successors in self.learned_counts.items()
+            }
+        temp_path = f"{file_path}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump(snapshot, file, separators=(",", ":"))
+            os.replace(temp_path, file_path)
+        except (PermissionError, FileNotFoundError) as e:
+            logger.warning(f"Could not save learned increments to {file_path}: {e}")
+            return False
+        return True
+
+    def _rank_all(self) -> None:
+        self._ranked = {}
+        for previous in self.custom_successors.keys() | self.bigram_counts.keys():
+            self._ranked[previous] = self._rank(previous)
+
+    def _rank(self, previous: str) -> tuple[str, ...]:
+        custom = self.custom_successors.get(previous, [])
+        counted = self.bigram_counts.get(previous, {})
+        by_frequency = sorted(
+            (following for following in counted if following not in custom),
+            key=lambda following: (
+                -counted[following],
+                -self.terminal_counts.get(following, 0),
+                following,
+            ),
+        )
+        return tuple(custom) + tuple(by_frequency)
+
+    def candidates(self, value: str) -> tuple[str, ...]:
+        """
+        Returns the known successors of value, best first. Empty if no bigram covers value.
+        """
+        return self._ranked.get(value, ())
+
+    def predict(self, value: str) -> str:
+        """
+        Returns the most likely label to follow value. Falls back to the range rule
+        ("1-8" -> "9-16"), then to incrementing the first number, then to value itself.
+        """
+        ranked = self._ranked.get(value)
+        if ranked:
+            return ranked[0]
+        predicted = self._rule_cache.get(value)
+        if predicted is None:
+            predicted = self.apply_rules(value)
+            self._rule_cache[value] = predicted
+        return predicted
+
+    @staticmethod
+    def apply_rules(value: str) -> str:
+        range_match = RANGE_PATTERN.match(value)
+        if range_match:
+            start, end = map(int, range_match.groups())
+            difference = end - start
+            return f"{end + 1}-{end + 1 + difference}"
+        number_match = NUMBER_PATTERN.search(value)
+        if number_match:
+            number = number_match.group()
+            return value.replace(number, str(int(number) + 1), 1)
+        return value
+
+
+class IncrementLearner:
+    """
+    Feeds accepted connections to an IncrementPredictor. Each side's terminal is learned as the
+    successor of the terminal accepted on that side just before it. Learning only touches memory;
+    a DebouncedWriter saves the learned counts in the background.
+    """
+
+    def __init__(
+        self, predictor: IncrementPredictor, file_path: str | Path, interval: float
+    ) -> None:
+        """
+        Args:
+            predictor (IncrementPredictor): The predictor to teach.
+            file_path (str): Where to keep the learned counts.
+            interval (float): Seconds to wait after a change before saving.
+        """
+        self.predictor = predictor
+        self.file_path = file_path
+        self.writer = DebouncedWriter(self.save, interval)
+        self.last_source_terminal = ""
+        self.last_destination_terminal = ""
+
+    def save(self) -> bool:
+        return self.predictor.save_learned(self.file_path)
+
+    def on_connection_added(self, connection: "Connection") -> None:
+        self.predictor.learn(self.last_source_terminal, connection.source_terminal)
+        self.predictor.learn(self.last_destination_terminal, connection.destination_terminal)
+        self.last_source_terminal = connection.source_terminal
+        self.last_destination_terminal = connection.destination_terminal
+        self.writer.mark_dirty()
+
+    def flush(self) -> bool:
+        return self.writer.flush()
@@ -0,0 +1,262 @@
+import json
+import logging
+import os
+from typing import Iterable
+
+from src.connection import Connection
+from src.file_handler import FileHandler
+
+"""
+Journaled project files. The file starts with a snapshot of every connection and is followed by
+one line per add, delete or edit, so recording a change costs the same no matter how big the
+project is. Loading replays the log on top of the snapshot, and once the log grows past a
+threshold the whole thing is compacted back into a single snapshot.
+
+    {"op": "snapshot", "connections": [{...}, {...}]}
+    {"op": "add", "connection": {...}}
+    {"op": "delete", "connection": {...}}
+    {"op": "edit", "old": {...}, "new": {...}}
+    {"op": "insert", "position": 12, "connection": {...}}
+
+An insert puts a connection back at a position in the list as it stands at that point, which is
+how undoing a delete restores the original order. A run of inserts with ascending positions is
+replayed in one pass.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def repair_torn_tail(file_path: str | os.PathLike) -> bool:
+    """
+    Cuts off a partial last line, as a crash while appending leaves behind, so that the next
+    append starts on a line of its own instead of being glued onto the fragment.
+
+    Returns:
+        bool: True if a partial line was removed.
+    """
+    try:
+        with open(file_path, "rb+") as file:
+            size = file.seek(0, os.SEEK_END)
+            if size == 0:
+                return False
+            file.seek(size - 1)
+            if file.read(1) == b"\n":
+                return False
+            file.seek(0)
+            file.truncate(file.read().rfind(b"\n") + 1)
+    except (PermissionError, FileNotFoundError):
+        return False
+    logger.warning(f"Removed a partial last line from {file_path}")
+    return True
+
+
+class JournalFileHandler(FileHandler):
+    EXTENSION = ".wirj"
+    journaled = True
+
+    def __init__(
+        self, file_path: str | None = None, compaction_threshold: int = 1_000_000
+    ) -> None:
+        """
+        Args:
+            file_path (str): Path to the journal file.
+            compaction_threshold (int): Size in bytes the log may reach before it is compacted.
+        """
+        super().__init__(file_path)
+        self.compaction_threshold = compaction_threshold
+        self._log_bytes = 0
+        self._append_file = None
+
+    def load(self):
+        if not self.file_path:
+            return
+        try:
+            with open(self.file_path, "r") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            logger.info(f"Error, {self.file_path} not found. Creating a new file")
+            with open(self.file_path, "w"):
+                return None
+        except PermissionError:
+            logger.info(f"Error: Permission denied to read from'{self.file_path}'")
+            return None
+
+        connections: list[dict[str, str] | None] = []
+        positions: dict[tuple, int] = {}
+        inserts: list[dict] = []
+        self._log_bytes = 0
+        for line_number, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash while appending can leave a partial last line; everything before it
+                # is still good. It is left on disk: loading also runs on the consistency
+                # checker's thread, while an append may be halfway through writing it.
+                logger.warning(
+                    f"Ignoring unreadable journal line {line_number + 1} in {self.file_path}"
+                )
+                continue
+            if record.get("op") == "insert":
+                self._log_bytes += len(line)
+                # One merge pass only works while positions ascend, as they do within a batch
+                if inserts and record["position"] < inserts[-1]["position"]:
+                    connections, positions = self._replay_inserts(inserts, connections)
+                    inserts = []
+                inserts.append(record)
+                continue
+            if inserts:
+                connections, positions = self._replay_inserts(inserts, connections)
+                inserts = []
+            if record.get("op") == "snapshot":
+                connections = list(record["connections"])
+                positions = {
+                    Connection(**conn_dict).canonical_key(): position
+                    for position, conn_dict in enumerate(connections)
+                }
+                self._log_bytes = 0
+                continue
+            self._log_bytes += len(line)
+            self._replay(record, connections, positions)
+        if inserts:
+            connections, positions = self._replay_inserts(inserts, connections)
+        return [conn_dict for conn_dict in connections if conn_dict is not None]
+
+    @staticmethod
+    def _replay_inserts(
+        inserts: list[dict], connections: list[dict[str, str] | None]
+    ) -> tuple[list[dict[str, str] | None], dict[tuple, int]]:
+        """
+        Applies a run of insert records in one merge pass. Positions refer to the list without
+        the holes deletes leave, so the holes are squeezed out first.
+        """
+        merged: list[dict[str, str] | None] = []
+        remaining = (conn_dict for conn_dict in connections if conn_dict is not None)
+        for record in inserts:
+            position = record["position"]
+            while len(merged) < position:
+                following = next(remaining, None)
+                if following is None:
+                    break
+                merged.append(following)
+            merged.append(record["connection"])
+        merged.extend(remaining)
+        connections, positions = [], {}
+        for conn_dict in merged:
+            key = Connection(**conn_dict).canonical_key()
+            if key not in positions:
+                positions[key] = len(connections)
+                connections.append(conn_dict)
+        return connections, positions
+
+    def _replay(
+        self,
+        record: dict,
+        connections: list[dict[str, str] | None],
+        positions: dict[tuple, int],
+    ) -> None:
+        op = record.get("op")
+        if op == "add":
+            key = Connection(**record["connection"]).canonical_key()
+            if key not in positions:
+                positions[key] = len(connections)
+                connections.append(record["connection"])
+        elif op == "delete":
+            key = Connection(**record["connection"]).canonical_key()
+            position = positions.pop(key, None)
+            if position is not None:
+                # Leave a hole instead of shifting every later position
+                connections[position] = None
+        elif op == "edit":
+            old_key = Connection(**record["old"]).canonical_key()
+            position = positions.pop(old_key, None)
+            if position is not None:
+                positions[Connection(**record["new"]).canonical_key()] = position
+                connections[position] = record["new"]
+        else:
+            logger.warning(f"Unknown journal operation: {op}")
+
+    def append(self, op: str, **payload: dict[str, str]) -> bool:
+        """
+        Appends one change record to the journal.
+
+        Args:
+            op (str): "add", "delete" or "edit"
+            payload: The connection dictionaries for the record ("connection", or "old"/"new")
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.file_path:
+            return False
+        line = json.dumps({"op": op, **payload}, separators=(",", ":")) + "\n"
+        try:
+            if self._append_file is None:
+                self._append_file = self._open_for_append()
+            self._append_file.write(line)
+            # Flush every record so that a crash loses at most the one being written
+            self._append_file.flush()
+        except (PermissionError, FileNotFoundError) as e:
+            logger.info(f"Error: could not append to {self.file_path}: {e}")
+            return False
+        self._log_bytes += len(line)
+        return True
+
+    def append_many(self, records: Iterable[tuple[str, dict[str, dict[str, str]]]]) -> bool:
+        """
+        Appends a batch of change records with a single write and flush.
+
+        Args:
+            records: (op, payload) pairs, as they would be passed to append.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.file_path:
+            return False
+        text = "".join(
+            json.dumps({"op": op, **payload}, separators=(",", ":")) + "\n"
+            for op, payload in records
+        )
+        try:
+            if self._append_file is None:
+                self._append_file = self._open_for_append()
+            self._append_file.write(text)
+            self._append_file.flush()
+        except (PermissionError, FileNotFoundError) as e:
+            logger.info(f"Error: could not append to {self.file_path}: {e}")
+            return False
+        self._log_bytes += len(text)
+        return True
+
+    def _open_for_append(self):
+        # Only the handler that appends repairs the file, so nothing is writing to it. A
+        # crash's partial last line is cut off, or the first record would be glued onto it.
+        repair_torn_tail(self.file_path)
+        return open(self.file_path, "a")
+
+    def needs_compaction(self) -> bool:
+        return self._log_bytes > self.compaction_threshold
+
+    def save(self, data: list[dict[str, str]]) -> bool:
+        """
+        Compacts the journal by replacing it with a single snapshot of the given data.
+        """
+        if not self.file_path:
+            return False
+        self.close()
+        temp_path = f"{self.file_path}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump({"op": "snapshot", "connections": data}, file)
+                file.write("\n")
+            os.replace(temp_path, self.file_path)
+        except (PermissionError, FileNotFoundError, ValueError) as e:
+            logger.info(f"Error: could not write snapshot to {self.file_path}: {e}")
+            return False
+        self._log_bytes = 0
+        return True
+
+    def close(self) -> None:
+        if self._append_file is not None:
+            self._append_file.close()
+            self._append_file = None
@@ -0,0 +1,181 @@
+import csv
+import json
+import logging
+import re
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from src.connection_manager import ConnectionManager
+
+"""
+Bulk import of legacy label files. Handles the JSON project files (.wir, .cab and older .csv and
+extension-less files that are really JSON) and the pipe-delimited CSV exports produced by the wire
+and cable export strategies, which are parsed back into their six fields. Files can be given
+individually, as directories, or inside .zip archives.
+"""
+
+logger = logging.getLogger(__name__)
+
+LABEL_FILE_EXTENSIONS = {".wir", ".cab", ".csv", ".json", ""}
+
+# "{component}-{terminal block} [{terminal}]", as written by ExportCableToCSVStrategy
+CABLE_LABEL_PATTERN = re.compile(r"^(?P<head>.*?)\s*\[(?P<terminal>[^\]]*)\]\s*$")
+
+FIELD_NAMES = [
+    "source_component",
+    "source_terminal_block",
+    "source_terminal",
+    "destination_component",
+    "destination_terminal_block",
+    "destination_terminal",
+]
+
+
+@dataclass
+class ImportStats:
+    files: int = 0
+    rows: int = 0
+    added: int = 0
+    duplicates: int = 0
+    unreadable_files: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.seconds == 0:
+            return 0.0
+        return self.rows / self.seconds
+
+
+def parse_label(label: str) -> tuple[str, str, str]:
+    """
+    Splits an exported label back into (component, terminal block, terminal). Cable labels put
+    the terminal in brackets; wire labels join all three fields with hyphens, so anything after
+    the second hyphen belongs to the terminal.
+
+    Args:
+        label (str): One side of an exported row, e.g. "TB-1-8" or "TB-1 [8]"
+    """
+    label = label.strip()
+    cable_match = CABLE_LABEL_PATTERN.match(label)
+    if cable_match:
+        component, _, terminal_block = cable_match.group("head").partition("-")
+        return component, terminal_block, cable_match.group("terminal")
+    fields = label.split("-", 2)
+    fields += [""] * (3 - len(fields))
+    return fields[0], fields[1], fields[2]
+
+
+def is_label_file(name: str) -> bool:
+    return Path(name).suffix.lower() in LABEL_FILE_EXTENSIONS
+
+
+def iter_label_sources(path: str | Path) -> Iterator[tuple[str, str | None]]:
+    """
+    Yields (path, archive member) pairs for every label file under path, without reading any of
+    them. member is None for plain files. Unlike iter_label_files, the pairs can be sent to
+    other processes.
+    """
+    path = Path(path)
+    if path.is_dir():
+        for file_path in sorted(path.rglob("*")):
+            if file_path.is_file():
+                yield from iter_label_sources(file_path)
+    elif path.suffix.lower() == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if not member.endswith("/") and is_label_file(member):
+                    yield str(path), member
+    elif is_label_file(path.name):
+        yield str(path), None
+
+
+def iter_label_files(path: str | Path) -> Iterator[tuple[str, Callable[[], bytes]]]:
+    """
+    Yields (name, read) pairs for every label file under path. path may be a single file, a
+    directory (searched recursively) or a .zip archive. Files are only read when read() is called.
+    """
+    path = Path(path)
+    if path.is_dir():
+        for file_path in sorted(path.rglob("*")):
+            if file_path.is_file():
+                yield from iter_label_files(file_path)
+    elif path.suffix.lower() == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if not member.endswith("/") and is_label_file(member):
+                    yield f"{path}/{member}", lambda member=member: archive.read(member)
+    elif is_label_file(path.name):
+        yield str(path), path.read_bytes
+
+
+def iter_connection_dicts(text: str) -> Iterator[dict[str, str]]:
+    """
+    Yields one connection dictionary per row of a label file's contents, whatever its format.
+    """
+    stripped = text.lstrip()
+    if not stripped:
+        return
+    if stripped.startswith("["):
+        for item in json.loads(stripped):
+            if isinstance(item, dict):
+                yield {field: str(item.get(field, "")) for field in FIELD_NAMES}
+        return
+
+    lines = stripped.splitlines()
+    if lines[0].startswith("source_component"):
+        # Comma-separated dump with a header row
+        for row in csv.DictReader(lines):
+            yield {field: row.get(field) or "" for field in FIELD_NAMES}
+        return
+
+    for row in csv.reader(lines, delimiter="|"):
+        if len(row) < 2:
+            continue
+        yield dict(zip(FIELD_NAMES, parse_label(row[0]) + parse_label(row[1])))
+
+
+class LabelImporter:
+    def __init__(self, connection_manager: "ConnectionManager") -> None:
+        self.connection_manager = connection_manager
+
+    def import_paths(self, paths: Iterable[str | Path]) -> ImportStats:
+        """
+        Streams every row from the given files, directories and archives into the connection
+        manager as a single batch.
+
+        Args:
+            paths: Files, directories or .zip archives to import.
+
+        Returns:
+            ImportStats: What was read and added, and how fast.
+        """
+        stats = ImportStats()
+        start = time.perf_counter()
+
+        def rows() -> Iterator[dict[str, str]]:
+            for path in paths:
+                for name, read in iter_label_files(path):
+                    stats.files += 1
+                    try:
+                        text = read().decode("utf-8", errors="replace")
+                        for conn_dict in iter_connection_dicts(text):
+                            stats.rows += 1
+                            yield conn_dict
+                    except (ValueError, OSError) as e:
+                        stats.unreadable_files += 1
+                        logger.warning(f"Could not import {name}: {e}")
+
+        added, duplicates = self.connection_manager.add_connections(rows())
+        stats.added = len(added)
+        stats.duplicates = duplicates
+        stats.seconds = time.perf_counter() - start
+        logger.info(
+            f"Imported {stats.added} of {stats.rows} rows from {stats.files} files "
+            f"in {stats.seconds:.2f}s ({stats.rows_per_second:.0f} rows/s)"
+        )
+        return stats
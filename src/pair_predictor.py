@@ -0,0 +1,140 @@
+import ast
+import json
+import logging
+from pathlib import Path
+
+from src.connection import Connection
+from src.increment_predictor import IncrementPredictor
+
+"""
+Predicts the whole next connection from the one just added, using the connection-pair bigrams in
+bigram_frequency.json. Each side of a pair is a "{terminal block}-{terminal}" pattern, so a
+prediction keeps the components of the last connection and fills in the terminal blocks and
+terminals of the most likely next pair. When no pair bigram matches, both terminals are advanced
+with the increment predictor instead.
+
+    {"('TB-1-8', 'TB-1-8') -> ('TB-9-16', 'TB-9-16')": 35, ...}
+"""
+
+logger = logging.getLogger(__name__)
+
+Pair = tuple[str, str]
+
+
+class PairPredictor:
+    MAX_ALTERNATIVES = 10
+
+    def __init__(
+        self,
+        pair_bigrams: dict[str, int] | None = None,
+        increment_predictor: IncrementPredictor | None = None,
+    ) -> None:
+        """
+        Args:
+            pair_bigrams (dict): "(source, destination) -> (source, destination)" strings, as
+                written by the pattern miner, mapped to how often they were seen.
+            increment_predictor (IncrementPredictor): Used when no pair bigram matches.
+        """
+        self.increment_predictor = increment_predictor
+        counts: dict[Pair, dict[Pair, int]] = {}
+        for bigram, count in (pair_bigrams or {}).items():
+            transition = self.parse_bigram(bigram)
+            if transition is None:
+                continue
+            previous, following = transition
+            successors = counts.setdefault(previous, {})
+            successors[following] = successors.get(following, 0) + int(count)
+        # Ranked once here, so a lookup is a single dictionary access
+        self.transitions: dict[Pair, tuple[Pair, ...]] = {
+            previous: tuple(
+                sorted(successors, key=lambda pair: (-successors[pair], pair))[
+                    : self.MAX_ALTERNATIVES
+                ]
+            )
+            for previous, successors in counts.items()
+        }
+
+    @classmethod
+    def from_data_directory(
+        cls,
+        data_directory: str | Path,
+        increment_predictor: IncrementPredictor | None = None,
+    ) -> "PairPredictor":
+        file_path = Path(data_directory) / "bigram_frequency.json"
+        try:
+            with open(file_path, "r") as file:
+                return cls(json.load(file), increment_predictor)
+        except FileNotFoundError:
+            logger.info(f"{file_path} not found, continuing without it")
+        except (PermissionError, ValueError) as e:
+            logger.warning(f"Could not read {file_path}: {e}")
+        return cls(increment_predictor=increment_predictor)
+
+    @staticmethod
+    def parse_bigram(bigram: str) -> tuple[Pair, Pair] | None:
+        previous, separator, following = bigram.partition(" -> ")
+        if not separator:
+            return None
+        try:
+            previous_pair = ast.literal_eval(previous)
+            following_pair = ast.literal_eval(following)
+        except (ValueError, SyntaxError):
+            logger.debug(f"Skipping unreadable pair bigram: {bigram}")
+            return None
+        if len(previous_pair) != 2 or len(following_pair) != 2:
+            return None
+        return tuple(previous_pair), tuple(following_pair)
+
+    @staticmethod
+    def pattern(terminal_block: str, terminal: str) -> str:
+        return f"{terminal_block}-{terminal}"
+
+    @staticmethod
+    def split_pattern(pattern: str) -> tuple[str, str]:
+        terminal_block, _, terminal = pattern.partition("-")
+        return terminal_block, terminal
+
+    def predict(self, connection: Connection) -> list[dict[str, str]]:
+        """
+        Returns the likely next connections after the given one, best first, as dictionaries
+        of the six connection fields. Connections entered destination-first are matched too.
+        """
+        source = self.pattern(connection.source_terminal_block, connection.source_terminal)
+        destination = self.pattern(
+            connection.destination_terminal_block, connection.destination_terminal
+        )
+        reversed_order = False
+        following_pairs = self.transitions.get((source, destination))
+        if following_pairs is None:
+            following_pairs = self.transitions.get((destination, source), ())
+            reversed_order = True
+
+        predictions = []
+        for next_source, next_destination in following_pairs:
+            if reversed_order:
+                next_source, next_destination = next_destination, next_source
+            source_terminal_block, source_terminal = self.split_pattern(next_source)
+            destination_terminal_block, destination_terminal = self.split_pattern(
+                next_destination
+            )
+            predictions.append(
+                {
+                    "source_component": connection.source_component,
+                    "source_terminal_block": source_terminal_block,
+                    "source_terminal": source_terminal,
+                    "destination_component": connection.destination_component,
+                    "destination_terminal_block": destination_terminal_block,
+                    "destination_terminal": destination_terminal,
+                }
+            )
+        if not predictions and self.increment_predictor is not None:
+            incremented = connection.to_dict()
+            incremented["source_terminal"] = self.increment_predictor.predict(
+                connection.source_terminal
+            )
+            incremented["destination_terminal"] = self.increment_predictor.predict(
+                connection.destination_terminal
+            )
+            if incremented != connection.to_dict():
+                predictions.append(incremented)
+        return predictions
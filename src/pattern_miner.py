@@ -0,0 +1,204 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from src.label_importer import iter_connection_dicts, iter_label_sources
+
+"""
+Rebuilds the increment feature's frequency tables from archived projects. Every label file under
+the given directories or .zip archives is parsed in a process pool; each worker counts one file
+and the counts are merged in the parent. Files with identical contents (the same project saved as
+.wir and .csv, say) are only counted once.
+
+    python -m src.pattern_miner data/wirelab.zip.zip --output-dir mined
+
+Writes the three tables in the formats the program reads:
+
+    wire_patterns.json      {"source": {"TB-1-8": 43, ...}, "destination": {...}}
+    program_bigrams.json    {"9-16->17-24": 187, ...}
+    bigram_frequency.json   {"('TB-1-8', 'TB-1-8') -> ('TB-9-16', 'TB-9-16')": 35, ...}
+
+Patterns are "{terminal block}-{terminal}". Bigrams pair each row with the row after it in the
+same file: terminal bigrams for each side, and connection-pair bigrams for the whole row.
+"""
+
+logger = logging.getLogger(__name__)
+
+# Archives opened by this worker process, so each is only parsed once per worker
+_open_archives: dict[str, zipfile.ZipFile] = {}
+
+
+@dataclass
+class PatternCounts:
+    files: int = 0
+    duplicate_files: int = 0
+    unreadable_files: int = 0
+    rows: int = 0
+    source_patterns: Counter = field(default_factory=Counter)
+    destination_patterns: Counter = field(default_factory=Counter)
+    terminal_bigrams: Counter = field(default_factory=Counter)
+    pair_bigrams: Counter = field(default_factory=Counter)
+
+    def count_rows(self, rows: Iterable[dict[str, str]]) -> None:
+        rows = list(rows)
+        self.rows += len(rows)
+        sources = [f"{row['source_terminal_block']}-{row['source_terminal']}" for row in rows]
+        destinations = [
+            f"{row['destination_terminal_block']}-{row['destination_terminal']}" for row in rows
+        ]
+        # Counter.update counts a list in C, much faster than incrementing key by key
+        self.source_patterns.update(sources)
+        self.destination_patterns.update(destinations)
+        for terminal in ("source_terminal", "destination_terminal"):
+            terminals = [row[terminal] for row in rows]
+            self.terminal_bigrams.update(
+                f"{previous}->{following}"
+                for previous, following in zip(terminals, terminals[1:])
+                if previous and following
+            )
+        pairs = [repr(pair) for pair in zip(sources, destinations)]
+        self.pair_bigrams.update(
+            f"{previous} -> {following}" for previous, following in zip(pairs, pairs[1:])
+        )
+
+    def merge(self, other: "PatternCounts") -> None:
+        self.files += other.files
+        self.duplicate_files += other.duplicate_files
+        self.unreadable_files += other.unreadable_files
+        self.rows += other.rows
+        self.source_patterns.update(other.source_patterns)
+        self.destination_patterns.update(other.destination_patterns)
+        self.terminal_bigrams.update(other.terminal_bigrams)
+        self.pair_bigrams.update(other.pair_bigrams)
+
+    def write(self, output_directory: str | Path) -> None:
+        """
+        Writes the three tables, most frequent entries first. Ties are sorted by key so that
+        mining the same files always gives the same output.
+        """
+        output_directory = Path(output_directory)
+        output_directory.mkdir(parents=True, exist_ok=True)
+        tables = {
+            "wire_patterns.json": {
+                "source": ranked(self.source_patterns),
+                "destination": ranked(self.destination_patterns),
+            },
+            "program_bigrams.json": ranked(self.terminal_bigrams),
+            "bigram_frequency.json": ranked(self.pair_bigrams),
+        }
+        for file_name, table in tables.items():
+            with open(output_directory / file_name, "w") as file:
+                json.dump(table, file, indent=4)
+
+
+def ranked(counts: Counter) -> dict[str, int]:
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def read_source(path: str, member: str | None) -> bytes:
+    if member is None:
+        with open(path, "rb") as file:
+            return file.read()
+    archive = _open_archives.get(path)
+    if archive is None:
+        archive = _open_archives[path] = zipfile.ZipFile(path)
+    return archive.read(member)
+
+
+def mine_file(source: tuple[str, str | None]) -> tuple[str, PatternCounts]:
+    """
+    Counts one label file. Runs in a worker process.
+
+    Returns:
+        tuple: A digest of the file's contents, and its counts.
+    """
+    path, member = source
+    counts = PatternCounts(files=1)
+    try:
+        data = read_source(path, member)
+        digest = hashlib.sha1(data).hexdigest()
+        counts.count_rows(iter_connection_dicts(data.decode("utf-8", errors="replace")))
+    except (ValueError, OSError, KeyError, zipfile.BadZipFile) as e:
+        logger.warning(f"Could not mine {path} {member or ''}: {e}")
+        return "", PatternCounts(files=1, unreadable_files=1)
+    return digest, counts
+
+
+def mine(
+    paths: Iterable[str | Path], workers: int | None = None, keep_duplicates: bool = False
+) -> PatternCounts:
+    """
+    Mines every label file under the given paths in a process pool.
+
+    Args:
+        paths: Files, directories or .zip archives.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+        keep_duplicates (bool): Count files with identical contents more than once.
+    """
+    sources = [source for path in paths for source in iter_label_sources(path)]
+    total = PatternCounts()
+    seen_digests: set[str] = set()
+    workers = workers or os.cpu_count() or 1
+
+    def merge(results: Iterable[tuple[str, PatternCounts]]) -> None:
+        for digest, counts in results:
+            if digest and not keep_duplicates:
+                if digest in seen_digests:
+                    total.files += 1
+                    total.duplicate_files += 1
+                    continue
+                seen_digests.add(digest)
+            total.merge(counts)
+
+    if workers == 1:
+        # A pool would only add pickling overhead
+        merge(map(mine_file, sources))
+        return total
+    # Hand out work in batches so the pool isn't dominated by per-file overhead
+    chunksize = max(1, len(sources) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        merge(executor.map(mine_file, sources, chunksize=chunksize))
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild the increment frequency tables from archived label files."
+    )
+    parser.add_argument("paths", nargs="+", help="label files, directories or .zip archives")
+    parser.add_argument("--output-dir", default=".", help="where to write the tables")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument(
+        "--keep-duplicates",
+        action="store_true",
+        help="count files with identical contents more than once",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = mine(args.paths, workers=args.workers, keep_duplicates=args.keep_duplicates)
+    counts.write(args.output_dir)
+    seconds = time.perf_counter() - start
+
+    print(
+        f"Mined {counts.rows} rows from {counts.files} files "
+        f"({counts.duplicate_files} duplicates, {counts.unreadable_files} unreadable) "
+        f"in {seconds:.2f}s, {counts.files / seconds:.0f} files/s"
+    )
+    print(
+        "Wrote wire_patterns.json, program_bigrams.json and bigram_frequency.json "
+        f"to {args.output_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import heapq
+from bisect import bisect_left, insort
+from pathlib import Path
+
+from src.columnar_store import FIELDS
+from src.connection import Connection
+from src.connection_index import ConnectionIndex
+from src.increment_predictor import IncrementPredictor
+
+"""
+Prefix index behind the autocomplete of the six entry fields. Each field keeps a sorted list of
+the values seen in it, so the values starting with a prefix are one contiguous slice found with
+two bisects. Values are ranked by how often they appear in the current project, then by how often
+they appear in wire_patterns.json, then alphabetically.
+
+The top completions of each prefix are cached: ahead of time for the short prefixes that match
+many values, and on first use for the rest. Adding or removing a connection re-ranks the few
+cached lists its values belong to in place, so a keystroke is a dictionary lookup or, the first
+time a rare prefix is typed, a partial sort of a short slice.
+"""
+
+DEFAULT_LIMIT = 8
+# Sorts after any character a label will contain, so prefix + END closes a prefix's slice
+END = "\U0010ffff"
+# Prefixes matching more values than this are ranked ahead of time
+HEAVY_SLICE = 256
+
+
+class FieldCompletions:
+    def __init__(self, seed_counts: dict[str, int] | None = None, limit: int = DEFAULT_LIMIT):
+        """
+        Args:
+            seed_counts (dict): Counts from earlier projects, ranked below the project's own.
+            limit (int): The most completions returned for a prefix.
+        """
+        self.limit = limit
+        # Cached lists keep some spare entries, so that a removal rarely forces a recompute
+        self.capacity = limit * 2
+        self.seed_counts = {
+            value: int(count) for value, count in (seed_counts or {}).items() if value
+        }
+        self.counts: dict[str, int] = {}
+        self.values: list[str] = sorted(self.seed_counts)
+        # prefix -> the best values starting with it, in rank order. Each list is exactly the
+        # top len(list) of its prefix's slice; prefixes in _complete have their whole slice cached
+        self._cache: dict[str, list[str]] = {}
+        self._complete: set[str] = set()
+        self.warm()
+
+    def rank_key(self, value: str) -> tuple[int, int, str]:
+        return (-self.counts.get(value, 0), -self.seed_counts.get(value, 0), value)
+
+    def rebuild(self, values: list[str]) -> None:
+        self.counts = {}
+        for value in values:
+            if value:
+                self.counts[value] = self.counts.get(value, 0) + 1
+        self.values = sorted(self.counts.keys() | self.seed_counts.keys())
+        self._cache.clear()
+        self._complete.clear()
+        self.warm()
+
+    def warm(self, prefix: str = "", start: int = 0, stop: int | None = None) -> None:
+        """
+        Caches the completions of every prefix whose slice is too long to rank within a
+        keystroke. Shorter slices are ranked when first typed.
+        """
+        if stop is None:
+            stop = len(self.values)
+        if stop - start <= HEAVY_SLICE:
+            return
+        self._rank_slice(prefix, start, stop)
+        depth = len(prefix)
+        if self.values[start] == prefix:
+            start += 1
+        while start < stop:
+            child = prefix + self.values[start][depth]
+            child_stop = bisect_left(self.values, child + END, start, stop)
+            self.warm(child, start, child_stop)
+            start = child_stop
+
+    def _rank_slice(self, prefix: str, start: int, stop: int) -> list[str]:
+        ranked = heapq.nsmallest(self.capacity, self.values[start:stop], key=self.rank_key)
+        self._cache[prefix] = ranked
+        if stop - start <= self.capacity:
+            self._complete.add(prefix)
+        else:
+            self._complete.discard(prefix)
+        return ranked
+
+    def add(self, value: str) -> None:
+        if not value:
+            return
+        count = self.counts.get(value, 0)
+        self.counts[value] = count + 1
+        if count == 0 and value not in self.seed_counts:
+            insort(self.values, value)
+        # A higher count can only move value up, so the cached lists it belongs to are re-ranked
+        # in place instead of being thrown away
+        key = self.rank_key(value)
+        for end in range(len(value) + 1):
+            prefix = value[:end]
+            cached = self._cache.get(prefix)
+            if cached is None:
+                continue
+            if value not in cached:
+                if prefix not in self._complete and key > self.rank_key(cached[-1]):
+                    continue
+                cached.append(value)
+            cached.sort(key=self.rank_key)
+            if len(cached) > self.capacity:
+                del cached[self.capacity :]
+                self._complete.discard(prefix)
+
+    def discard(self, value: str) -> None:
+        count = self.counts.get(value, 0)
+        if count == 0:
+            return
+        gone = count == 1 and value not in self.seed_counts
+        if count == 1:
+            del self.counts[value]
+            if gone:
+                del self.values[bisect_left(self.values, value)]
+        else:
+            self.counts[value] = count - 1
+        key = self.rank_key(value)
+        for end in range(len(value) + 1):
+            prefix = value[:end]
+            cached = self._cache.get(prefix)
+            if cached is None or value not in cached:
+                continue
+            complete = prefix in self._complete
+            if gone or (
+                not complete and (cached[-1] == value or key > self.rank_key(cached[-1]))
+            ):
+                # An uncached value may now rank above it, so it leaves the list
+                cached.remove(value)
+            cached.sort(key=self.rank_key)
+            if len(cached) < self.limit and not complete:
+                del self._cache[prefix]
+
+    def complete(self, prefix: str) -> list[str]:
+        """
+        Returns the best completions of prefix, best first. The prefix itself is included if it
+        is a known value.
+        """
+        cached = self._cache.get(prefix)
+        if cached is None:
+            start = bisect_left(self.values, prefix)
+            stop = bisect_left(self.values, prefix + END, start)
+            cached = self._rank_slice(prefix, start, stop)
+        return cached[: self.limit]
+
+
+class PrefixIndex(ConnectionIndex):
+    """
+    A FieldCompletions for each of the six connection fields, kept in step with the connection
+    manager. Register it with ConnectionManager.register_index.
+    """
+
+    def __init__(
+        self,
+        wire_patterns: dict[str, dict[str, int]] | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> None:
+        """
+        Args:
+            wire_patterns (dict): {"source": {"TB-1-8": 43, ...}, "destination": {...}}. Seeds
+                the terminal block and terminal fields of each side.
+            limit (int): The most completions returned for a prefix.
+        """
+        seeds: dict[str, dict[str, int]] = {name: {} for name in FIELDS}
+        for side, patterns in (wire_patterns or {}).items():
+            for pattern, count in patterns.items():
+                terminal_block, _, terminal = pattern.partition("-")
+                for name, value in (("terminal_block", terminal_block), ("terminal", terminal)):
+                    field_seeds = seeds.get(f"{side}_{name}")
+                    if field_seeds is not None and value:
+                        field_seeds[value] = field_seeds.get(value, 0) + int(count)
+        self.fields = {name: FieldCompletions(seeds[name], limit) for name in FIELDS}
+
+    @classmethod
+    def from_data_directory(
+        cls, data_directory: str | Path, limit: int = DEFAULT_LIMIT
+    ) -> "PrefixIndex":
+        wire_patterns = IncrementPredictor.load_json(
+            Path(data_directory) / "wire_patterns.json", {}
+        )
+        return cls(wire_patterns, limit)
+
+    def complete(self, field_name: str, prefix: str) -> list[str]:
+        """
+        Returns the best completions of prefix in one of the six connection fields.
+        """
+        return self.fields[field_name].complete(prefix)
+
+    # ConnectionIndex
+
+    def add(self, connection: Connection) -> None:
+        for name, completions in self.fields.items():
+            completions.add(getattr(connection, name))
+
+    def remove(self, connection: Connection) -> None:
+        for name, completions in self.fields.items():
+            completions.discard(getattr(connection, name))
+
+    def rebuild(self, connections: list[Connection]) -> None:
+        for name, completions in self.fields.items():
+            completions.rebuild([getattr(connection, name) for connection in connections])
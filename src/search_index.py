@@ -0,0 +1,161 @@
+import re
+from typing import Iterable
+
+from src.columnar_store import FIELDS
+from src.connection import Connection
+from src.connection_index import ConnectionIndex
+
+"""
+Inverted index behind the connection list's filter box. A query is split into terms, and a
+connection matches when every term appears, ignoring case, somewhere in its six fields.
+
+Projects repeat the same few component, terminal block and terminal names over and over, so the
+index works on distinct field values rather than on connections:
+
+    postings    value -> ids of the connections with that value in any field
+    prefixes    one or two characters from the start of a word -> values with such a word, e.g.
+                "1", "10", "m" and "m1" for "m10"
+    grams       trigram -> values containing it, for terms found in the middle of a value
+
+A term of three or more characters matches anywhere in a value and is looked up through its
+trigrams. Shorter terms would match nearly everything that way, so they only match the start of
+a word: "1" finds "1-8", "TB1" and "10" but not "21", and "P" then "PL" narrow the list down to
+what "PLC" finds. All values are stored casefolded.
+"""
+
+GRAM_SIZE = 3
+# Runs of letters or of digits, so "PLC12" is "plc" and "12"
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+|\d+")
+
+
+def grams(value: str) -> set[str]:
+    return {value[i : i + GRAM_SIZE] for i in range(len(value) - GRAM_SIZE + 1)}
+
+
+def prefixes(value: str) -> set[str]:
+    """
+    Returns the one and two characters of value from where each of its words starts. They may
+    run past the end of the word, so "m2" is a prefix of "m2" as "m" is.
+    """
+    return {
+        value[start : start + size]
+        for start in (match.start() for match in TOKEN_PATTERN.finditer(value))
+        for size in range(1, GRAM_SIZE)
+    }
+
+
+class SearchIndex(ConnectionIndex):
+    def __init__(self) -> None:
+        self.postings: dict[str, set[int]] = {}
+        self.prefixes: dict[str, set[str]] = {}
+        self.grams: dict[str, set[str]] = {}
+
+    @staticmethod
+    def values_of(connection: Connection) -> set[str]:
+        return {getattr(connection, name).casefold() for name in FIELDS} - {""}
+
+    def _add_value(self, value: str) -> None:
+        for prefix in prefixes(value):
+            self.prefixes.setdefault(prefix, set()).add(value)
+        for gram in grams(value):
+            self.grams.setdefault(gram, set()).add(value)
+
+    def _remove_value(self, value: str) -> None:
+        for table, keys in (
+            (self.prefixes, prefixes(value)),
+            (self.grams, grams(value)),
+        ):
+            for key in keys:
+                values = table.get(key)
+                if values is not None:
+                    values.discard(value)
+                    if not values:
+                        del table[key]
+
+    # ConnectionIndex
+
+    def add(self, connection: Connection) -> None:
+        for value in self.values_of(connection):
+            ids = self.postings.get(value)
+            if ids is None:
+                ids = self.postings[value] = set()
+                self._add_value(value)
+            ids.add(connection.connection_id)
+
+    def remove(self, connection: Connection) -> None:
+        for value in self.values_of(connection):
+            ids = self.postings.get(value)
+            if ids is None:
+                continue
+            ids.discard(connection.connection_id)
+            if not ids:
+                del self.postings[value]
+                self._remove_value(value)
+
+    def rebuild(self, connections: list[Connection]) -> None:
+        self.postings = {}
+        self.prefixes = {}
+        self.grams = {}
+        # Field values are interned and heavily repeated, so each is only casefolded once
+        folded: dict[str, str] = {}
+        postings = self.postings
+        for connection in connections:
+            connection_id = connection.connection_id
+            for name in FIELDS:
+                value = getattr(connection, name)
+                key = folded.get(value)
+                if key is None:
+                    key = folded[value] = value.casefold()
+                if key:
+                    ids = postings.get(key)
+                    if ids is None:
+                        ids = postings[key] = set()
+                    ids.add(connection_id)
+        for value in postings:
+            self._add_value(value)
+
+    # Queries
+
+    def matching_values(self, term: str) -> Iterable[str]:
+        """
+        Returns the distinct field values that term matches. term must already be casefolded.
+        """
+        if len(term) < GRAM_SIZE:
+            return self.prefixes.get(term, ())
+        term_grams = grams(term)
+        if len(term_grams) == 1:
+            return self.grams.get(term, ())
+        # Intersect starting from the rarest trigram, then confirm the trigrams are in order
+        gram_values = sorted((self.grams.get(gram, set()) for gram in term_grams), key=len)
+        candidates = gram_values[0].intersection(*gram_values[1:])
+        return [value for value in candidates if term in value]
+
+    def matching_ids(self, query: str) -> set[int] | None:
+        """
+        Returns the ids of the connections matching every term of query, or None if the query
+        has no terms and so matches everything.
+        """
+        terms = sorted(set(query.casefold().split()), key=len, reverse=True)
+        if not terms:
+            return None
+        result: set[int] | None = None
+        # Longer terms are more selective, so they narrow the result first
+        for term in terms:
+            ids: set[int] = set()
+            for value in self.matching_values(term):
+                ids.update(self.postings[value])
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    def filter_connections(
+        self, query: str, connections: list[Connection]
+    ) -> list[Connection]:
+        """
+        Returns the connections matching query, in the order of connections.
+        """
+        ids = self.matching_ids(query)
+        if ids is None:
+            return connections
+        return [connection for connection in connections if connection.connection_id in ids]
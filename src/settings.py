@@ -10,8 +10,31 @@ The settings.json file should look like this:
     "default_csv_directory": "",
     "default_save_location": "/home/rsp/documents",
     "csv_save_location": "/home/rsp/documents",
-    "default_csv_delimiter": "|"
+    "default_csv_delimiter": "|",
+    "write_behind_save": true,
+    "autosave_interval_seconds": 2,
+    "journaled_projects": false,
+    "journal_compaction_bytes": 1000000,
+    "virtual_list_threshold": 10000,
+    "debug_consistency_check_seconds": 0,
+    "columnar_store": false,
+    "increment_learning": true,
+    "undo_memory_budget_bytes": 16000000
 }
+When "write_behind_save" is true, changes are written to the project file in the background at
+most once every "autosave_interval_seconds" instead of after every edit.
+When "journaled_projects" is true, new projects are created as .wirj journals, which append each
+change to the file and are compacted once the log grows past "journal_compaction_bytes".
+Projects with more connections than "virtual_list_threshold" only materialize the visible rows of
+the connection list.
+Setting "debug_consistency_check_seconds" above 0 compares the project file with memory on a
+background thread at that interval and logs any mismatch. It is meant for debugging.
+When "columnar_store" is true, the connection manager also keeps a dictionary-encoded columnar
+copy of the connections, which speeds up exports, filtering and grouping on large projects.
+When "increment_learning" is true, the increment feature learns which terminal follows which from
+the connections you add, and keeps what it learned in data/learned_bigrams.json.
+The undo history forgets its oldest entries once what it keeps for undoing them goes over
+"undo_memory_budget_bytes".
 Settings can be retrieved by using the get method, passing the setting key as an argument.
 """
 
@@ -0,0 +1,128 @@
+import csv
+import logging
+from pathlib import Path
+from typing import Iterable
+
+from src.connection import Connection, Endpoint
+from src.connection_index import ConnectionIndex
+
+"""
+Terminal occupancy, kept by ConnectionManager: which connections land on each physical terminal,
+identified by (component, terminal block, terminal). A terminal landed by more than one connection
+is a conflict. The set of conflicting terminals is updated with every add, delete and edit, so
+checking a new connection or listing every conflict never needs a pass over the project.
+
+Endpoints without a terminal aren't physical terminals and are left out.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class TerminalIndex(ConnectionIndex):
+    def __init__(self) -> None:
+        # terminal -> {connection_id: connection}, in the order the connections were added
+        self.occupants: dict[Endpoint, dict[int, Connection]] = {}
+        self.conflicts: set[Endpoint] = set()
+
+    @staticmethod
+    def terminals_of(connection: Connection) -> set[Endpoint]:
+        return {endpoint for endpoint in connection.endpoints() if endpoint[2]}
+
+    def occupants_of(self, terminal: Endpoint) -> list[Connection]:
+        return list(self.occupants.get(terminal, {}).values())
+
+    def conflicts_with(self, connection: Connection) -> dict[Endpoint, list[Connection]]:
+        """
+        Returns the other connections landing on either end of connection, by terminal. The
+        connection itself doesn't need to be stored.
+        """
+        conflicts = {}
+        for terminal in self.terminals_of(connection):
+            others = [
+                other
+                for connection_id, other in self.occupants.get(terminal, {}).items()
+                if connection_id != connection.connection_id
+            ]
+            if others:
+                conflicts[terminal] = others
+        return conflicts
+
+    def report(self) -> dict[Endpoint, list[Connection]]:
+        """
+        Returns every terminal landed by more than one connection, sorted by terminal.
+        """
+        return {terminal: self.occupants_of(terminal) for terminal in sorted(self.conflicts)}
+
+    # ConnectionIndex
+
+    def add(self, connection: Connection) -> None:
+        for terminal in self.terminals_of(connection):
+            occupants = self.occupants.setdefault(terminal, {})
+            occupants[connection.connection_id] = connection
+            if len(occupants) > 1:
+                self.conflicts.add(terminal)
+
+    def remove(self, connection: Connection) -> None:
+        for terminal in self.terminals_of(connection):
+            occupants = self.occupants.get(terminal)
+            if occupants is None:
+                continue
+            occupants.pop(connection.connection_id, None)
+            if len(occupants) < 2:
+                self.conflicts.discard(terminal)
+            if not occupants:
+                del self.occupants[terminal]
+
+    def rebuild(self, connections: list[Connection]) -> None:
+        self.occupants, self.conflicts = find_conflicts(connections)
+
+
+def find_conflicts(
+    connections: Iterable[Connection],
+) -> tuple[dict[Endpoint, dict[int, Connection]], set[Endpoint]]:
+    """
+    Builds terminal occupancy for any list of connections in one pass, e.g. for a snapshot.
+
+    Returns:
+        tuple: The occupants of every terminal, and the terminals with more than one.
+    """
+    occupants: dict[Endpoint, dict[int, Connection]] = {}
+    conflicts: set[Endpoint] = set()
+    for connection in connections:
+        for terminal in TerminalIndex.terminals_of(connection):
+            landed = occupants.get(terminal)
+            if landed is None:
+                occupants[terminal] = {connection.connection_id: connection}
+            else:
+                landed[connection.connection_id] = connection
+                conflicts.add(terminal)
+    return occupants, conflicts
+
+
+def format_terminal(terminal: Endpoint) -> str:
+    # Same "component-block-terminal" form as the connection list
+    return "-".join(part for part in terminal if part)
+
+
+def write_conflict_report(
+    report: dict[Endpoint, list[Connection]], file_path: str | Path
+) -> bool:
+    """
+    Writes a conflict report as CSV, one row per connection landing on a conflicting terminal.
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        with open(file_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["terminal", "connections", "source", "destination"])
+            for terminal, connections in report.items():
+                for connection in connections:
+                    writer.writerow(
+                        [format_terminal(terminal), len(connections), *connection.to_tuple()]
+                    )
+    except (PermissionError, FileNotFoundError) as e:
+        logger.error(f"Could not write conflict report to {file_path}: {e}")
+        return False
+    return True
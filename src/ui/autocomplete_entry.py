@@ -0,0 +1,112 @@
+import tkinter as tk
+from typing import Callable
+
+"""
+An Entry that shows ranked completions in a dropdown as the user types. The completions come from
+a callback, normally PrefixIndex.complete for the entry's field, so the widget itself keeps no
+data. Up and Down move through the list, Tab or a click accepts the highlighted completion, and
+Escape closes the list. Return is left alone so the entry keeps its own Return binding.
+"""
+
+# Keys that move the cursor or focus without changing the text
+NAVIGATION_KEYS = {
+    "Up",
+    "Down",
+    "Left",
+    "Right",
+    "Home",
+    "End",
+    "Tab",
+    "ISO_Left_Tab",
+    "Return",
+    "Escape",
+    "Shift_L",
+    "Shift_R",
+    "Control_L",
+    "Control_R",
+    "Alt_L",
+    "Alt_R",
+}
+
+
+class AutocompleteEntry(tk.Entry):
+    def __init__(self, parent, complete: Callable[[str], list[str]], **kwargs) -> None:
+        """
+        Args:
+            complete (Callable): Returns the completions of a prefix, best first.
+        """
+        super().__init__(parent, **kwargs)
+        self.complete = complete
+        self.popup: tk.Toplevel | None = None
+        self.listbox: tk.Listbox | None = None
+
+        self.bind("<KeyRelease>", self.on_key_release, add="+")
+        self.bind("<Down>", lambda event: self.move_selection(1), add="+")
+        self.bind("<Up>", lambda event: self.move_selection(-1), add="+")
+        self.bind("<Tab>", self.on_tab, add="+")
+        self.bind("<Escape>", lambda event: self.hide_suggestions(), add="+")
+        # Give a click on the list time to land before the list goes away
+        self.bind("<FocusOut>", lambda event: self.after(150, self.hide_suggestions), add="+")
+
+    def on_key_release(self, event: tk.Event) -> None:
+        if event.keysym in NAVIGATION_KEYS or event.state & 0x4:  # ignore Control shortcuts
+            return
+        text = self.get()
+        suggestions = self.complete(text) if text else []
+        if not suggestions or suggestions == [text]:
+            self.hide_suggestions()
+        else:
+            self.show_suggestions(suggestions)
+
+    def show_suggestions(self, suggestions: list[str]) -> None:
+        if self.popup is None:
+            self.popup = tk.Toplevel(self)
+            self.popup.wm_overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, takefocus=0, exportselection=False)
+            self.listbox.pack(fill="both", expand=True)
+            self.listbox.bind("<ButtonRelease-1>", lambda event: self.accept())
+        self.listbox.delete(0, tk.END)
+        for suggestion in suggestions:
+            self.listbox.insert(tk.END, suggestion)
+        self.listbox.configure(height=len(suggestions), width=max(self.cget("width"), 1))
+        self.popup.wm_geometry(
+            f"+{self.winfo_rootx()}+{self.winfo_rooty() + self.winfo_height()}"
+        )
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def hide_suggestions(self) -> None:
+        if self.popup is not None:
+            self.popup.withdraw()
+
+    def suggestions_visible(self) -> bool:
+        return self.popup is not None and self.popup.winfo_viewable()
+
+    def move_selection(self, step: int) -> str | None:
+        if not self.suggestions_visible():
+            return None
+        selection = self.listbox.curselection()
+        index = selection[0] + step if selection else (0 if step > 0 else self.listbox.size() - 1)
+        index = max(0, min(index, self.listbox.size() - 1))
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return "break"
+
+    def on_tab(self, event: tk.Event) -> None:
+        # Tab still moves on to the next field after accepting
+        if self.suggestions_visible() and self.listbox.curselection():
+            self.accept()
+
+    def accept(self) -> None:
+        selection = self.listbox.curselection()
+        if selection:
+            self.delete(0, tk.END)
+            self.insert(0, self.listbox.get(selection[0]))
+            self.icursor(tk.END)
+        self.hide_suggestions()
+
+    def destroy(self) -> None:
+        if self.popup is not None:
+            self.popup.destroy()
+        super().destroy()
@@ -1,49 +1,38 @@
-from importlib import resources
-import json
 import tkinter as tk
-import re
+from functools import partial
 from typing import TYPE_CHECKING
-from pathlib import Path
 
 from src.ui.localized_widgets import (
     LocalizedLabel,
     LocalizedButton,
     LocalizedCheckButton,
 )
+from src.ui.autocomplete_entry import AutocompleteEntry
 from src.connection import Connection
 
 if TYPE_CHECKING:
     from src.controllers.controller import Controller
     from src.ui.main_view import MainView
 
+# Background of a terminal entry whose terminal is already used by another connection
+CONFLICT_BACKGROUND = "#ffd6d6"
+
 
 class ConnectionEntryFrame(tk.Frame):
     def __init__(self, parent: "MainView", controller: "Controller", **kwargs):
         super().__init__(parent)
         self.parent = parent
         self.controller = controller
-        current_script_path = Path(__file__)
-        base_path = current_script_path.parents[2]
-
-        bigram_frequency_path = base_path / "data" / "program_bigrams.json"
-        custom_bigram_frequency_path = base_path / "data" / "custom_bigrams.json"
-
-        # Before opening files
-        print(f"Attempting to open bigram_frequency.json at: {bigram_frequency_path}")
-        print(f"Attempting to open custom_bigram_frequency.json at: {custom_bigram_frequency_path}")
-
-        # Check if paths exist
-        if not bigram_frequency_path.exists():
-            print(f"bigram_frequency.json not found at {bigram_frequency_path}")
-        if not custom_bigram_frequency_path.exists():
-            print(f"custom_bigram_frequency.json not found at {custom_bigram_frequency_path}")
-
-        with open(bigram_frequency_path, "r") as f:
-            bigram_data = json.load(f)
-        with open(custom_bigram_frequency_path, "r") as f:
-            self.custom_bigram_data = json.load(f)
-        
-        self.bigram_patterns = self.parse_bigram_data(bigram_data)
+        # Shared with the controller, which teaches it from accepted connections
+        self.increment_predictor = self.controller.increment_predictor
+        self.pair_predictor = self.controller.pair_predictor
+        # Ranked guesses for the next connection, cycled with Ctrl-N / Ctrl-P
+        self.predictions: list[dict[str, str]] = []
+        self.prediction_index = 0
+        self.last_added_connection: Connection | None = None
+        # The stored connection the entries are editing, set by the connection list's Edit button
+        self.editing_connection: Connection | None = None
+        self.controller.event_system.subscribe("connection_added", self.on_connection_added)
 
         # Define textvariables
         # Sources
@@ -62,6 +51,9 @@ class ConnectionEntryFrame(tk.Frame):
         # In the future, update the text as the user types
         self.lock_destination_toggle = tk.BooleanVar()
 
+        # Fill in all six fields with the most likely next connection after each add
+        self.predict_next_toggle = tk.BooleanVar()
+
         # Create and place widgets
         self.create_and_place_labels()
         self.create_and_place_entry_boxes()
@@ -94,31 +86,44 @@ class ConnectionEntryFrame(tk.Frame):
         self.destination_label.grid(row=2, column=0, padx=5, pady=5)
 
     def create_and_place_entry_boxes(self) -> None:
-        self.source_component_entry = tk.Entry(self, textvariable=self.source_component)
+        self.source_component_entry = self.create_entry_box(
+            "source_component", self.source_component
+        )
         self.source_component_entry.grid(row=1, column=1, padx=5, pady=5)
 
-        self.source_terminal_block_entry = tk.Entry(
-            self, textvariable=self.source_terminal_block
+        self.source_terminal_block_entry = self.create_entry_box(
+            "source_terminal_block", self.source_terminal_block
         )
         self.source_terminal_block_entry.grid(row=1, column=2, padx=5, pady=5)
 
-        self.source_terminal_entry = tk.Entry(self, textvariable=self.source_terminal)
+        self.source_terminal_entry = self.create_entry_box(
+            "source_terminal", self.source_terminal
+        )
         self.source_terminal_entry.grid(row=1, column=3, padx=5, pady=5)
 
-        self.destination_component_entry = tk.Entry(
-            self, textvariable=self.destination_component
+        self.destination_component_entry = self.create_entry_box(
+            "destination_component", self.destination_component
         )
         self.destination_component_entry.grid(row=2, column=1, padx=5, pady=5)
 
-        self.destination_terminal_block_entry = tk.Entry(
-            self, textvariable=self.destination_terminal_block
+        self.destination_terminal_block_entry = self.create_entry_box(
+            "destination_terminal_block", self.destination_terminal_block
         )
         self.destination_terminal_block_entry.grid(row=2, column=2, padx=5, pady=5)
 
-        self.destination_terminal_entry = tk.Entry(
-            self, textvariable=self.destination_terminal
+        self.destination_terminal_entry = self.create_entry_box(
+            "destination_terminal", self.destination_terminal
         )
         self.destination_terminal_entry.grid(row=2, column=3)
+        self.entry_background = self.source_terminal_entry.cget("background")
+
+    def create_entry_box(self, field_name: str, variable: tk.StringVar) -> AutocompleteEntry:
+        # Suggestions for each field come from what was entered in that field before
+        return AutocompleteEntry(
+            self,
+            partial(self.controller.prefix_index.complete, field_name),
+            textvariable=variable,
+        )
 
     def create_and_place_checkbuttons(self) -> None:
         self.increment_source_checkbutton = LocalizedCheckButton(
@@ -145,6 +150,14 @@ class ConnectionEntryFrame(tk.Frame):
         )
         self.lock_destination_checkbutton.grid(row=3, column=4, padx=5, pady=5)
 
+        self.predict_next_checkbutton = LocalizedCheckButton(
+            self,
+            self.controller.localizer,
+            "predict_next",
+            variable=self.predict_next_toggle,
+        )
+        self.predict_next_checkbutton.grid(row=4, column=4, padx=5, pady=5)
+
     def create_and_place_buttons(self) -> None:
         self.undo_button = LocalizedButton(
             self, self.controller.localizer, "undo", command=self.on_undo_button_click
@@ -216,6 +229,28 @@ class ConnectionEntryFrame(tk.Frame):
             "<Control-l>", lambda event: self.toggle_destination()
         )
 
+        for variable in (
+            self.source_component,
+            self.source_terminal_block,
+            self.source_terminal,
+            self.destination_component,
+            self.destination_terminal_block,
+            self.destination_terminal,
+        ):
+            variable.trace_add("write", lambda *args: self.check_terminals())
+
+        for entry in (
+            self.source_component_entry,
+            self.source_terminal_block_entry,
+            self.source_terminal_entry,
+            self.destination_component_entry,
+            self.destination_terminal_block_entry,
+            self.destination_terminal_entry,
+        ):
+            entry.bind("<Control-n>", lambda event: self.cycle_prediction(1))
+            entry.bind("<Control-p>", lambda event: self.cycle_prediction(-1))
+            entry.bind("<Escape>", lambda event: self.finish_edit(), add="+")
+
     def populate_entries(self, connection: Connection) -> None:
         self.source_component.set(connection.source_component)
         self.source_terminal_block.set(connection.source_terminal_block)
@@ -225,6 +260,25 @@ class ConnectionEntryFrame(tk.Frame):
         self.destination_terminal_block.set(connection.destination_terminal_block)
         self.destination_terminal.set(connection.destination_terminal)
 
+    def start_edit(self, connection: Connection) -> None:
+        """
+        Fills the entries with a stored connection. Until the edit is saved or cancelled with
+        Escape, the add button saves the entries over that connection instead of adding one.
+        """
+        # Set first, so the terminal check filling the entries triggers already leaves it out
+        self.editing_connection = connection
+        self.populate_entries(connection)
+        self.add_connection_button.l10n_key = "save_edit"
+        self.add_connection_button.update()
+
+    def finish_edit(self) -> None:
+        if self.editing_connection is None:
+            return
+        self.editing_connection = None
+        self.add_connection_button.l10n_key = "add_connection"
+        self.add_connection_button.update()
+        self.check_terminals()
+
     def on_add_connection_button_click(self) -> None:
         # Get user input from the UI
         source = {
@@ -256,14 +310,86 @@ class ConnectionEntryFrame(tk.Frame):
         ):
             return
 
-        self.controller.add_connection_command(source, destination)
+        if self.editing_connection is not None:
+            if self.controller.save_edited_connection_command(
+                self.editing_connection, source, destination
+            ):
+                self.finish_edit()
+            return
 
-        if self.source_increment_toggle.get():
-            self.increment(self.source_terminal_entry)
-        if self.destination_increment_toggle.get():
-            self.increment(self.destination_terminal_entry)
+        previous_connection = self.last_added_connection
+        self.controller.add_connection_command(source, destination)
+        was_added = self.last_added_connection is not previous_connection
+
+        # A whole-connection prediction already moves the terminals on, so it replaces the
+        # per-field increments
+        if not (was_added and self.predict_next_toggle.get() and self.show_predictions()):
+            if self.source_increment_toggle.get():
+                self.increment(self.source_terminal_entry)
+            if self.destination_increment_toggle.get():
+                self.increment(self.destination_terminal_entry)
+        if was_added:
+            # Shown last so that no other status message hides it
+            self.controller.warn_about_terminal_conflicts(self.last_added_connection)
         self.parent.scroll_to_bottom_of_treewidget()
 
+    def on_connection_added(self, connection: Connection) -> None:
+        self.last_added_connection = connection
+        self.check_terminals()
+
+    def check_terminals(self) -> None:
+        """
+        Highlights a terminal entry while the terminal typed in its row is already in use. The
+        connection being edited doesn't count, its terminals are the ones being changed.
+        """
+        terminal_index = self.controller.connection_manager.terminal_index
+        editing_id = (
+            self.editing_connection.connection_id if self.editing_connection is not None else None
+        )
+        for side in ("source", "destination"):
+            terminal = (
+                getattr(self, f"{side}_component").get(),
+                getattr(self, f"{side}_terminal_block").get(),
+                getattr(self, f"{side}_terminal").get(),
+            )
+            in_use = bool(terminal[2]) and any(
+                connection_id != editing_id
+                for connection_id in terminal_index.occupants.get(terminal, {})
+            )
+            entry = getattr(self, f"{side}_terminal_entry")
+            entry.configure(background=CONFLICT_BACKGROUND if in_use else self.entry_background)
+
+    def show_predictions(self) -> bool:
+        """
+        Fills the entries with the best guess for the connection after the last one added.
+
+        Returns:
+            bool: True if there was a prediction to show.
+        """
+        if self.last_added_connection is None:
+            return False
+        self.predictions = self.pair_predictor.predict(self.last_added_connection)
+        self.prediction_index = 0
+        if not self.predictions:
+            return False
+        self.show_prediction()
+        return True
+
+    def cycle_prediction(self, step: int) -> str:
+        if self.predictions:
+            self.prediction_index = (self.prediction_index + step) % len(self.predictions)
+            self.show_prediction()
+        # Stop Tk's default Ctrl-N / Ctrl-P handling in the entry
+        return "break"
+
+    def show_prediction(self) -> None:
+        self.populate_entries(Connection(**self.predictions[self.prediction_index]))
+        self.controller.display_status(
+            self.controller.localizer.get("prediction_rank").format(
+                rank=self.prediction_index + 1, total=len(self.predictions)
+            )
+        )
+
     def is_empty_label(
         self,
         source_component: str,
@@ -292,40 +418,7 @@ class ConnectionEntryFrame(tk.Frame):
 
     def increment(self, entry_widget: tk.Entry) -> None:
         current_value = entry_widget.get()
-
-        # Check in custom bigrams first
-        if current_value in self.custom_bigram_patterns:
-            incremented_value = self.custom_bigram_patterns[current_value]
-        # Fallback to program bigrams
-        elif current_value in self.bigram_patterns:
-            incremented_value = self.bigram_patterns[current_value]
-        else:
-            # Check for range pattern
-            range_match = re.match(r"(\d+)-(\d+)", current_value)
-            if range_match:
-                start, end = map(int, range_match.groups())
-                difference = end - start
-                incremented_value = f"{end + 1}-{end + 1 + difference}"
-            else:
-                # Increment integer in the string, if present
-                match = re.search(r'\d+', current_value)
-                if match:
-                    number = match.group()
-                    incremented_number = str(int(number) + 1)
-                    incremented_value = current_value.replace(number, incremented_number, 1)
-                else:
-                    # If no integer or range is found, do nothing
-                    incremented_value = current_value
+        incremented_value = self.increment_predictor.predict(current_value)
 
         entry_widget.delete(0, tk.END)
         entry_widget.insert(0, incremented_value)
-
-    def parse_bigram_data(self, bigram_data: dict) -> dict:
-        """
-        Convert the bigram data from string format to a usable format.
-        """
-        parsed_data = {}
-        for bigram, count in bigram_data.items():
-            source, destination = bigram.split("->")
-            parsed_data[source] = destination
-        return parsed_data
\ No newline at end of file
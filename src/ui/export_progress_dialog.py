@@ -0,0 +1,62 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import TYPE_CHECKING
+
+from src.ui.localized_widgets import LocalizedButton, LocalizedLabel
+
+if TYPE_CHECKING:
+    from src.csv_exporting_strategy import ExportProgress
+    from src.localizer import Localizer
+
+"""
+Modal dialog shown while a large CSV export is written on a worker thread. The worker only
+updates an ExportProgress object; this dialog polls it from the Tk thread.
+"""
+
+
+class ExportProgressDialog(tk.Toplevel):
+    POLL_INTERVAL = 100  # milliseconds
+
+    def __init__(
+        self,
+        parent,
+        localizer: "Localizer",
+        progress: "ExportProgress",
+        cancel_event: threading.Event,
+    ) -> None:
+        super().__init__(parent)
+        self.localizer = localizer
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.title(self.localizer.get("exporting"))
+
+        self.exporting_label = LocalizedLabel(self, self.localizer, "exporting")
+        self.exporting_label.pack(padx=10, pady=5)
+
+        self.progress_bar = ttk.Progressbar(
+            self, length=300, mode="determinate", maximum=max(progress.total, 1)
+        )
+        self.progress_bar.pack(padx=10, pady=5)
+
+        self.cancel_button = LocalizedButton(
+            self, self.localizer, "cancel", command=self.on_cancel
+        )
+        self.cancel_button.pack(padx=10, pady=5)
+
+        self.protocol("WM_DELETE_WINDOW", self.on_cancel)
+        self.transient(parent)
+        self.grab_set()
+        self.poll()
+
+    def poll(self) -> None:
+        self.progress_bar["value"] = self.progress.rows_written
+        if self.progress.finished:
+            self.destroy()
+            return
+        self.after(self.POLL_INTERVAL, self.poll)
+
+    def on_cancel(self) -> None:
+        # The worker notices the event between chunks and finishes on its own
+        self.cancel_event.set()
+        self.cancel_button["state"] = "disabled"
@@ -6,6 +6,9 @@ if TYPE_CHECKING:
 
 
 class Footer(tk.Frame):
+    # How often to check whether the autosaver has caught up, in milliseconds
+    SAVE_STATE_POLL_INTERVAL = 500
+
     def __init__(self, parent, controller: "Controller"):
         super().__init__(parent)
         self.controller = controller
@@ -13,8 +16,12 @@ class Footer(tk.Frame):
         self.status_label = tk.Label(self, text="")
         self.status_label.grid(row=1, column=0, padx=10)
 
+        self.save_state_label = tk.Label(self, text="")
+        self.save_state_label.grid(row=1, column=1, padx=10)
+
         # Replace with localization
         self.display_status("Welcome to WireLab")
+        self.refresh_save_state()
 
     def display_status(self, message: str) -> None:
         # Update the status label with the message
@@ -22,3 +29,12 @@ class Footer(tk.Frame):
 
         # Clear the status label after 5 seconds
         self.after(5000, lambda: self.status_label.config(text=""))
+
+    def refresh_save_state(self) -> None:
+        # The autosaver runs on a background thread, so poll it from the Tk thread rather than
+        # having it call into Tk directly
+        save_state = self.controller.connection_manager.save_state()
+        self.save_state_label["text"] = self.controller.localizer.get(
+            f"save_state_{save_state}"
+        )
+        self.after(self.SAVE_STATE_POLL_INTERVAL, self.refresh_save_state)
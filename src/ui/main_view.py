@@ -2,7 +2,8 @@ import tkinter as tk
 import logging
 from tkinter import ttk, messagebox, filedialog
 from tkinter import scrolledtext
-from typing import TYPE_CHECKING
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator
 from src.ui.localized_widgets import LocalizedButton
 
 from src.ui.settings_window import SettingsWindow
@@ -18,6 +19,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Number of rows the CSV preview renders at a time
+CSV_PREVIEW_PAGE_SIZE = 200
+
 """
 Main View in the MVC (Model-View-Controller) pattern. This module instantiates and
 manages the various frames that make up its contents.
@@ -84,7 +88,7 @@ class MainView(tk.Tk):
 
     def scroll_to_bottom_of_treewidget(self) -> None:
         self.tree_widget.tree_widget.update_idletasks()
-        self.tree_widget.tree_widget.yview_moveto(1)
+        self.tree_widget.yview_moveto(1)
 
     def save_file(self):
         file_name = self.controller.file_name
@@ -105,7 +109,12 @@ class MainView(tk.Tk):
     def open_settings_window(self) -> None:
         self.settings_window = SettingsWindow(self, self.settings)
 
-    def show_csv_preview(self, csv_data: str, localizer: "Localizer") -> bool:
+    def show_csv_preview(
+        self,
+        rows: Iterator[tuple[str, str]],
+        total_rows: int,
+        localizer: "Localizer",
+    ) -> bool:
         # Variable to store the user's decision (Export or Cancel)
         user_decision = tk.BooleanVar(value=False)
 
@@ -114,13 +123,42 @@ class MainView(tk.Tk):
         preview_window.title("CSV Preview")
         preview_window.geometry("600x400")
 
-        # Display the CSV data using a scrolled text widget
+        row_count_label = tk.Label(preview_window, text="")
+        row_count_label.pack(pady=(10, 0))
+
+        # Display the CSV data using a scrolled text widget. Only the first page of rows is
+        # formatted up front; more pages are pulled from the row generator as the user scrolls
+        # towards the end, so opening the preview doesn't depend on the project size.
         text_widget = scrolledtext.ScrolledText(
-            preview_window, wrap=tk.WORD, width=70, height=20
+            preview_window, wrap=tk.NONE, width=70, height=20
         )
-        text_widget.pack(pady=20, padx=20)
-        text_widget.insert(tk.END, csv_data)
-        text_widget.configure(state=tk.DISABLED)  # Make the widget read-only
+        text_widget.pack(pady=10, padx=20)
+        rows_shown = 0
+        rows_exhausted = False
+
+        def load_next_page() -> None:
+            nonlocal rows_shown, rows_exhausted
+            page = list(islice(rows, CSV_PREVIEW_PAGE_SIZE))
+            if len(page) < CSV_PREVIEW_PAGE_SIZE:
+                rows_exhausted = True
+            if page:
+                text_widget.configure(state=tk.NORMAL)
+                if rows_shown:
+                    text_widget.insert(tk.END, "\n")
+                text_widget.insert(tk.END, "\n".join("|".join(row) for row in page))
+                text_widget.configure(state=tk.DISABLED)  # Make the widget read-only
+                rows_shown += len(page)
+            row_count_label["text"] = localizer.get("preview_row_count").format(
+                shown=rows_shown, total=total_rows
+            )
+
+        def on_text_scroll(first: str, last: str) -> None:
+            text_widget.vbar.set(first, last)
+            if not rows_exhausted and float(last) > 0.9:
+                load_next_page()
+
+        text_widget.configure(yscrollcommand=on_text_scroll)
+        load_next_page()
 
         # Function to handle the Export button click
         def on_export():
@@ -165,6 +203,7 @@ class MainView(tk.Tk):
             filetypes=[
                 ("JSON files", "*.json"),
                 ("Wire files", "*.wir"),
+                ("Journaled wire files", "*.wirj"),
                 ("All files", "*.*"),
             ],
             defaultextension=".wir",
@@ -7,6 +7,7 @@ from src.localizer import Localizer
 from src.settings import Settings
 from src.ui.settings_window import SettingsWindow
 from src.ui.localized_widgets import LocalizedLabel, LocalizedButton
+from src.undo_journal import has_journal
 
 """
 This is the dialog that pops up when the user opens the application.
@@ -28,7 +29,7 @@ class NewProjectDialog(tk.Toplevel):
         self.file_base_name = tk.StringVar()
         self.directory = tk.StringVar()
         self.open_existing_file_directory = tk.StringVar()
-        self.file_ext = {"wire": ".wir"}
+        self.file_ext = {"wire": ".wir", "journal": ".wirj"}
 
         # Initialize result attribute
         self.result = None
@@ -146,6 +147,7 @@ class NewProjectDialog(tk.Toplevel):
     def open_file_browse(self) -> None:
         filetypes = (
             ("wire files", "*.wir"),
+            ("journaled wire files", "*.wirj"),
             ("all files", "*.*"),
         )
         filepath = filedialog.askopenfilename(
@@ -195,9 +197,15 @@ class NewProjectDialog(tk.Toplevel):
             )
         else:
             file_name = file_path.name
+            # An undo journal left next to the project means the last session crashed
+            recover_session = has_journal(file_path) and messagebox.askyesno(
+                self.localizer.get("recover_session"),
+                self.localizer.get("recover_session_message"),
+            )
             self.result = {
                 "file_path": str(file_path),
                 "file_name": file_name,
+                "recover_session": recover_session,
             }
             self.destroy()
 
@@ -239,7 +247,10 @@ class NewProjectDialog(tk.Toplevel):
         directory = Path(self.directory.get())
         file_name = self.file_base_name.get()
 
-        file_path = directory / (file_name + ".wir")
+        if self.settings.get("journaled_projects", False):
+            file_path = directory / (file_name + self.file_ext["journal"])
+        else:
+            file_path = directory / (file_name + self.file_ext["wire"])
 
         if file_path.exists():
             messagebox.showerror(
@@ -0,0 +1,61 @@
+from typing import TYPE_CHECKING, Iterable, KeysView
+
+if TYPE_CHECKING:
+    from src.connection import Connection
+
+"""
+The connection list's record of which Treeview item shows which connection. Both directions are
+dictionaries, so finding the row of a removed connection, the connections behind a selection, or
+the row to reuse for a restored connection never walks the rows.
+"""
+
+
+class TreeItemIndex:
+    def __init__(self) -> None:
+        self._connections: dict[str, "Connection"] = {}  # Tk item id -> connection
+        self._items: dict[int, str] = {}  # connection_id -> Tk item id
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def map(self, item: str, connection: "Connection") -> None:
+        """
+        Records that item shows connection, replacing whatever either was mapped to before.
+        """
+        previous = self._connections.get(item)
+        if previous is not None and previous.connection_id != connection.connection_id:
+            self._items.pop(previous.connection_id, None)
+        previous_item = self._items.get(connection.connection_id)
+        if previous_item is not None and previous_item != item:
+            self._connections.pop(previous_item, None)
+        self._connections[item] = connection
+        self._items[connection.connection_id] = item
+
+    def unmap(self, connection_id: int) -> str | None:
+        """
+        Forgets the item showing a connection and returns it, if there was one.
+        """
+        item = self._items.pop(connection_id, None)
+        if item is not None:
+            self._connections.pop(item, None)
+        return item
+
+    def clear(self) -> None:
+        self._connections.clear()
+        self._items.clear()
+
+    def item_for(self, connection_id: int) -> str | None:
+        return self._items.get(connection_id)
+
+    def connection_for(self, item: str) -> "Connection | None":
+        return self._connections.get(item)
+
+    def connections_for(self, items: Iterable[str]) -> list["Connection"]:
+        """
+        Returns the connections shown by items, skipping items that show none.
+        """
+        connections = self._connections
+        return [connections[item] for item in items if item in connections]
+
+    def connection_ids(self) -> KeysView[int]:
+        return self._items.keys()
@@ -5,8 +5,9 @@ import tkinter as tk
 import logging
 from src import connection_manager
 
-from src.ui.localized_widgets import LocalizedButton, LocalizedTreeview
-from src.command import DeleteConnectionCommand
+from src.ui.localized_widgets import LocalizedButton, LocalizedLabel, LocalizedTreeview
+from src.ui.tree_item_index import TreeItemIndex
+from src.ui.virtual_window import VirtualWindow
 
 if TYPE_CHECKING:
     from src.controllers.controller import Controller
@@ -38,27 +39,40 @@ class TreeWidgetFrame(tk.Frame):
 
         # Subscribe to event system events
         self._event_system.subscribe("connection_added", self.on_connection_added)
-        self._event_system.subscribe("connection_removed", self.on_connection_removed)
 
         self.controller.connection_manager.add_observer(self)
 
-        self.connections_dict = {}  # holds list of connections in the treewidget
-        self.tree_item_to_connection = {}  # list of items & IDs in the treewidget
+        self.item_index = TreeItemIndex()  # which tree item shows which connection
+        self.displayed_ids = []  # connection ids in the order they appear in the treewidget
         self.selected_connections = []  # user-selected connections
+        self.selected_ids = set()  # ids of selected connections, including ones scrolled away
+        # The connections the list shows: all of them, or the ones matching the filter box
+        self.visible_connections: list["Connection"] = []
         self.tree_widget = self.create_tree_widget()
 
+        # Projects bigger than the threshold only materialize the rows in view
+        self.virtual_list_threshold = int(
+            self.controller.settings.get("virtual_list_threshold", 10000)
+        )
+        self.virtual_mode = False
+        self.virtual_window = VirtualWindow(int(self.tree_widget.cget("height")))
+
+        self.filter_frame = self.create_filter_frame()
+        self.filter_frame.grid(row=0, column=0, columnspan=3, sticky=tk.W + tk.E)
+
         # Create the Button Frame
         self.button_frame = tk.Frame(self)
-        self.button_frame.grid(row=1, column=0, columnspan=2, sticky=tk.W + tk.E)
+        self.button_frame.grid(row=2, column=0, columnspan=2, sticky=tk.W + tk.E)
 
         # Add buttons to the button frame
         self.create_and_place_buttons()
 
         # Place the tree widget in the grid layout
-        self.tree_widget.grid(row=0, column=0, columnspan=2, sticky=tk.NSEW)
+        self.tree_widget.grid(row=1, column=0, columnspan=2, sticky=tk.NSEW)
+        self.scrollbar.grid(row=1, column=2, sticky=tk.NS)
 
         # Configure the grid to expand correctly
-        self.grid_rowconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
@@ -75,9 +89,13 @@ class TreeWidgetFrame(tk.Frame):
     def selection(self):
         return self.tree_widget.selection()
 
-    def yview_moveto(self, *args, **kwargs):
+    def yview_moveto(self, fraction, *args, **kwargs):
         # Scrolls to the specified index in the treewidget
-        self.tree_widget.yview_moveto(*args, **kwargs)
+        if self.virtual_mode:
+            self.virtual_window.moveto(float(fraction))
+            self.render_virtual_window()
+        else:
+            self.tree_widget.yview_moveto(fraction, *args, **kwargs)
 
     # Other Functions
     def create_and_place_buttons(self):
@@ -92,13 +110,48 @@ class TreeWidgetFrame(tk.Frame):
         )
 
         # Pack the buttons into the frame
-        self.edit_button.grid(row=1, column=0, sticky=tk.W + tk.E)  # Left
-        self.delete_button.grid(row=1, column=1, sticky=tk.W + tk.E)  # Right
+        self.edit_button.grid(row=2, column=0, sticky=tk.W + tk.E)  # Left
+        self.delete_button.grid(row=2, column=1, sticky=tk.W + tk.E)  # Right
 
         # Fill available space in the cell
         self.button_frame.columnconfigure(0, weight=1)
         self.button_frame.columnconfigure(1, weight=1)
 
+    def create_filter_frame(self) -> tk.Frame:
+        frame = tk.Frame(self)
+        self.filter_label = LocalizedLabel(frame, self.controller.localizer, "filter")
+        self.filter_label.grid(row=0, column=0, padx=5, pady=5)
+
+        # The list narrows with every keystroke; see SearchIndex for how terms match
+        self.filter_text = tk.StringVar()
+        self.filter_text.trace_add("write", lambda *args: self.on_filter_changed())
+        self.filter_entry = tk.Entry(frame, textvariable=self.filter_text)
+        self.filter_entry.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W + tk.E)
+        self.filter_entry.bind("<Escape>", lambda event: self.filter_text.set(""))
+        frame.columnconfigure(1, weight=1)
+        return frame
+
+    def on_filter_changed(self) -> None:
+        self.virtual_window.moveto(0)
+        self.update_connection_list()
+        total = len(self.controller.connection_manager.connections)
+        if self.filter_text.get().strip():
+            self.parent.display_status(
+                self.controller.localizer.get("filter_results").format(
+                    shown=len(self.visible_connections), total=total
+                )
+            )
+
+    def filter_connections(self) -> list["Connection"]:
+        """
+        Returns the connections matching the filter box, in list order.
+        """
+        connections = self.controller.connection_manager.connections
+        query = self.filter_text.get()
+        if not query.strip():
+            return connections
+        return self.controller.search_index.filter_connections(query, connections)
+
     def create_tree_widget(self) -> LocalizedTreeview:
         columns = ("#1", "#2")
         columns_keys = ["source", "destination"]
@@ -110,12 +163,62 @@ class TreeWidgetFrame(tk.Frame):
         # Callback function to bind selecting an item to the selected connections
         tree.bind("<<TreeviewSelect>>", self.update_selected_connections)
 
+        # In virtual mode the treeview only holds the visible rows, so scrolling has to move the
+        # window over the connection list instead of scrolling the widget
+        tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        tree.bind("<Button-4>", self.on_mouse_wheel)
+        tree.bind("<Button-5>", self.on_mouse_wheel)
+        tree.bind("<Up>", self.on_arrow_key)
+        tree.bind("<Down>", self.on_arrow_key)
+
         # Add a scrollbar
-        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=tree.yview)
-        tree["yscrollcommand"] = scrollbar.set  # Link the scrollbar to the treeview
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scrollbar)
+        tree["yscrollcommand"] = self.scrollbar.set  # Link the scrollbar to the treeview
 
         return tree
 
+    def on_scrollbar(self, *args) -> None:
+        if not self.virtual_mode:
+            self.tree_widget.yview(*args)
+            return
+        if args[0] == "moveto":
+            self.virtual_window.moveto(float(args[1]))
+        elif args[0] == "scroll":
+            if args[2] == "pages":
+                self.virtual_window.scroll_pages(int(args[1]))
+            else:
+                self.virtual_window.scroll(int(args[1]))
+        self.render_virtual_window()
+
+    def on_mouse_wheel(self, event) -> str | None:
+        if not self.virtual_mode:
+            return None
+        # X11 reports the wheel as buttons 4 and 5, Windows and macOS use delta
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.virtual_window.scroll(-3)
+        else:
+            self.virtual_window.scroll(3)
+        self.render_virtual_window()
+        return "break"
+
+    def on_arrow_key(self, event) -> str | None:
+        if not self.virtual_mode:
+            return None
+        focus = self.tree_widget.focus()
+        position = self.tree_widget.index(focus) if focus else 0
+        rows = -1 if event.keysym == "Up" else 1
+        at_edge = (rows < 0 and position == 0) or (
+            rows > 0 and position >= self.virtual_window.visible_rows - 1
+        )
+        if not at_edge:
+            return None  # Let the treeview move the focus within the window
+        self.virtual_window.scroll(rows)
+        self.render_virtual_window()
+        # Keep the focus on the same row slot, which now shows the next connection
+        self.tree_widget.focus(focus)
+        self.tree_widget.selection_set(focus)
+        return "break"
+
     # Move this function to the controller, on_delete_button_clicked should call the delete_
     # _connection method from the Controller
     def on_delete_button_clicked(self):
@@ -126,22 +229,12 @@ class TreeWidgetFrame(tk.Frame):
         if not selected_items:
             return
         item = selected_items[0]  # we can only edit one connection at a time
-        item_tuple = self.tree_item_to_connection.get(item)
-        if not item_tuple:
-            return
-        _, old_connection = item_tuple
+        old_connection = self.item_index.connection_for(item)
 
         if old_connection:
-            # Populate the entry fields for editing
-            self.entry_frame.populate_entries(old_connection)
-
-            # Delete the old connection
-            delete_command = DeleteConnectionCommand(
-                parent=self,
-                connection_manager=self.controller.connection_manager,
-                view=self.parent,
-            )
-            delete_command.execute()
+            # The entries hold the connection until the edit is saved, which replaces it in
+            # place
+            self.entry_frame.start_edit(old_connection)
 
     def on_connection_added(self, connection):
         # Extract the source and destination tuple to add to the treewidget
@@ -149,13 +242,6 @@ class TreeWidgetFrame(tk.Frame):
             connection
         )
 
-        # Add to tree widget and get unique identifier
-        self.item = self.tree_widget.insert("", "end", values=(source, destination))
-
-        # Add to the mapping dictionary
-        connection_id = connection.connection_id
-        self.tree_item_to_connection[self.item] = (connection_id, connection)
-
         # Print a message to the UI
         self.parent.display_status(
             self.controller.localizer.get("added_connection").format(
@@ -163,111 +249,195 @@ class TreeWidgetFrame(tk.Frame):
             )
         )
 
-        logger.info(
-            f"Post-addition state of tree_item_to_connection: {self.tree_item_to_connection}"
-        )
-
-        # Update the tree widget
-        self.controller.load_connections()
+        # The connection manager already holds the new connection, so there is no need to go
+        # back to the file; just bring the tree widget up to date
         self.update_connection_list()
 
-    def on_connection_removed(self, connection: "Connection"):
-        logger.info("on_connection_removed: Starting on_connection_removed")
-        logger.info(f"on_connection_removed: Connection: {connection}")
-        # Retrieve the UUID of the connection to be removed
-        connection_uuid = connection.connection_id
-
-        # Find the tree item with the matching UUID
-        tree_item = None
-        for item, (conn_id, _) in self.tree_item_to_connection.items():
-            if conn_id == connection_uuid:
-                tree_item = item
-                break
-
-        # If the tree item is found, remove it from the tree widget
-        if tree_item and tree_item in self.tree_widget.get_children():
-            self.tree_widget.delete(tree_item)
-            del self.tree_item_to_connection[tree_item]
-            logger.info(
-                f"on_connection_removed: Connection with UUID {connection_uuid} successfully removed from tree widget"
-            )
-        else:
-            logger.warning(
-                f"on_connection_removed: Connection with UUID {connection_uuid} not found in tree widget"
-            )
-
-        logger.info(
-            f"Post-deletion state of tree_item_to_connection: {self.tree_item_to_connection}"
-        )
-
-        self.update_connection_list()
+    def selected_connections_in_view(self) -> list["Connection"]:
+        """
+        Returns the selected connections that pass the filter. In virtual mode that includes
+        the selected rows scrolled out of the window, which only selected_ids remembers.
+        """
+        if self.virtual_mode:
+            return [
+                connection
+                for connection in self.visible_connections
+                if connection.connection_id in self.selected_ids
+            ]
+        return self.selected_rows()
+
+    def selected_rows(self) -> list["Connection"]:
+        """
+        Returns the connections behind the selected rows of the treeview.
+        """
+        return self.item_index.connections_for(self.tree_widget.selection())
 
-    def update_connection_list(self) -> None:
+    def update_connection_list(
+        self,
+        added: list["Connection"] | None = None,
+        removed: list["Connection"] | None = None,
+    ) -> None:
         """
-        Update the connection list in the tree widget.
+        Update the connection list in the tree widget. Only the rows that differ from the
+        connection manager are inserted, moved, updated or deleted, so refreshing after a single
+        change costs a constant number of Tk calls regardless of the number of rows.
+
+        Args:
+            added, removed: What changed, as reported by a ConnectionManager transaction. When
+                connections were only removed, their rows are deleted by id without the diff.
         """
+        if added or removed:
+            logger.debug(
+                f"update_connection_list: {len(added or [])} added, {len(removed or [])} removed"
+            )
         # Ensure the parent is not in the process of being destroyed
-        if not self.parent.is_destroying:
-            # Backup the current tree_item_to_connection dictionary
-            old_tree_item_to_connection = self.tree_item_to_connection.copy()
+        if self.parent.is_destroying:
+            return
 
-            # Clear the current tree widget
-            for i in self.parent.tree_widget.get_children():
-                self.parent.tree_widget.delete(i)
+        connection_manager = self.controller.connection_manager
+        connections = self.visible_connections = self.filter_connections()
+        use_virtual_mode = len(connections) > self.virtual_list_threshold
+        if use_virtual_mode != self.virtual_mode:
+            self.switch_list_mode(use_virtual_mode)
+        if self.virtual_mode:
+            self.render_virtual_window()
+            return
+        if removed and not added:
+            self.remove_rows(removed)
+            return
+        # Edits keep the connection's id and position, so only their rows' values change. A
+        # filter might now hide or reveal an edited row, which needs the diff below.
+        if added and removed and not self.filter_text.get().strip():
+            if self.update_rows(added, removed):
+                return
+
+        current_ids = {connection.connection_id for connection in connections}
+
+        # Delete the rows of connections that are gone, all in one Tk call
+        removed_items = [
+            self.item_index.unmap(connection_id)
+            for connection_id in list(self.item_index.connection_ids())
+            if connection_id not in current_ids
+        ]
+        removed_items = [item for item in removed_items if self.tree_widget.exists(item)]
+        if removed_items:
+            self.tree_widget.delete(*removed_items)
+
+        # Walk the manager's order alongside the order currently displayed, and only touch the
+        # rows that are new, out of place, or now show a different connection object
+        displayed_ids = [
+            connection_id for connection_id in self.displayed_ids if connection_id in current_ids
+        ]
+        for position, connection in enumerate(connections):
+            connection_id = connection.connection_id
+            item = self.item_index.item_for(connection_id)
+            if item is None:
+                source, destination = connection_manager.get_connection_tuple(connection)
+                item = self.tree_widget.insert(
+                    "", position, values=(source, destination)
+                )
+                self.item_index.map(item, connection)
+                displayed_ids.insert(position, connection_id)
+                continue
 
-            # Retrieve the updated list of connections
-            connections = self.controller.connection_manager.get_connections()
+            if position >= len(displayed_ids) or displayed_ids[position] != connection_id:
+                self.tree_widget.move(item, "", position)
+                displayed_ids.remove(connection_id)
+                displayed_ids.insert(position, connection_id)
 
-            # Reset the tree_item_to_connection dictionary since we're repopulating
-            self.tree_item_to_connection = {}
+            if self.item_index.connection_for(item) is not connection:
+                source, destination = connection_manager.get_connection_tuple(connection)
+                self.tree_widget.item(item, values=(source, destination))
+                self.item_index.map(item, connection)
 
-            # Populate the tree widget and update the dictionaries
+        self.displayed_ids = displayed_ids
 
-            for connection in connections:
-                (
-                    source,
-                    destination,
-                ) = self.controller.connection_manager.get_connection_tuple(connection)
-                item_id = self.tree_widget.insert(
-                    "", "end", values=(source, destination)
-                )
+    def update_rows(self, added: list["Connection"], removed: list["Connection"]) -> bool:
+        """
+        Redraws the rows of connections edited in place.
 
-                # Check if this connection had a previous tree item ID in the old dictionary
-                old_tree_item = next(
-                    (
-                        key
-                        for key, conn_obj in old_tree_item_to_connection.items()
-                        if conn_obj == connection
-                    ),
-                    None,
-                )
+        Returns:
+            bool: False, without touching any row, unless every change was an in-place edit of a
+            displayed row.
+        """
+        added_ids = {connection.connection_id for connection in added}
+        if added_ids != {connection.connection_id for connection in removed}:
+            return False
+        items = [self.item_index.item_for(connection.connection_id) for connection in added]
+        if None in items:
+            return False
+        connection_manager = self.controller.connection_manager
+        for item, connection in zip(items, added):
+            source, destination = connection_manager.get_connection_tuple(connection)
+            self.tree_widget.item(item, values=(source, destination))
+            self.item_index.map(item, connection)
+        return True
+
+    def remove_rows(self, removed: list["Connection"]) -> None:
+        """
+        Deletes the rows of removed connections. The remaining rows keep their order, so nothing
+        else needs to move.
+        """
+        removed_ids = {connection.connection_id for connection in removed}
+        removed_items = [self.item_index.unmap(connection_id) for connection_id in removed_ids]
+        removed_items = [item for item in removed_items if item is not None]
+        if removed_items:
+            self.tree_widget.delete(*removed_items)
+        self.displayed_ids = [
+            connection_id
+            for connection_id in self.displayed_ids
+            if connection_id not in removed_ids
+        ]
+        self.selected_ids -= removed_ids
+
+    def switch_list_mode(self, virtual_mode: bool) -> None:
+        """
+        Switches between materializing every row and only the rows in view.
+        """
+        logger.info(f"Switching connection list to virtual mode: {virtual_mode}")
+        self.tree_widget.delete(*self.tree_widget.get_children())
+        self.item_index.clear()
+        self.displayed_ids = []
+        self.virtual_mode = virtual_mode
+        if virtual_mode:
+            # The scrollbar now tracks the window, not the treeview
+            self.tree_widget["yscrollcommand"] = ""
+        else:
+            self.tree_widget["yscrollcommand"] = self.scrollbar.set
 
-                # Use the old tree item ID if available, otherwise use the new ID
-                if old_tree_item:
-                    self.tree_item_to_connection[old_tree_item] = (
-                        connection.connection_id,
-                        connection,
-                    )
-                else:
-                    self.tree_item_to_connection[item_id] = (
-                        connection.connection_id,
-                        connection,
-                    )
-
-                # Update the connections_dict
-                self.connections_dict[str(connection)] = connection
+    def render_virtual_window(self) -> None:
+        """
+        Fills the treeview with the connections in the current window, reusing the same row
+        items so that the cost depends on the window size and not on the project size.
+        """
+        connections = self.visible_connections
+        self.virtual_window.set_total(len(connections))
+        start, stop = self.virtual_window.bounds()
+        window = connections[start:stop]
+
+        slots = self.tree_widget.get_children()
+        for slot in range(len(slots), len(window)):
+            self.tree_widget.insert("", "end", iid=f"row{slot}")
+        if len(slots) > len(window):
+            self.tree_widget.delete(*slots[len(window) :])
+
+        self.item_index.clear()
+        selected_items = []
+        for slot, connection in enumerate(window):
+            item = f"row{slot}"
+            self.tree_widget.item(item, values=connection.to_tuple())
+            self.item_index.map(item, connection)
+            if connection.connection_id in self.selected_ids:
+                selected_items.append(item)
+        self.tree_widget.selection_set(selected_items)
+        self.scrollbar.set(*self.virtual_window.fractions())
 
     def update_selected_connections(self, event) -> None:
-        # Get currently selected items
-        selected_items = self.tree_widget.selection()
-
-        # Clear the selected connections list
-        self.selected_connections = []
+        self.selected_connections = self.selected_rows()
 
-        # Add all currently selected connections to the list
-        for item in selected_items:
-            connection = self.tree_item_to_connection.get(item)
-            if connection:
-                self.selected_connections.append(connection)
+        # Rows outside the virtual window keep their selection until they are scrolled back in
+        self.selected_ids = (self.selected_ids - self.item_index.connection_ids()) | {
+            connection.connection_id for connection in self.selected_connections
+        }
 
         logger.info(f"self.parent.selected_connections = {self.selected_connections}")
@@ -52,10 +52,23 @@ class UtilityButtonsFrame(tk.Frame):
         )
         self.export_cables_button.grid(row=0, column=3, padx=5, pady=10)
 
+        self.import_button = LocalizedButton(
+            self, self.localizer, "import_labels", command=self.on_import_button_click
+        )
+        self.import_button.grid(row=0, column=4, padx=5, pady=10)
+
+        self.check_terminals_button = LocalizedButton(
+            self,
+            self.localizer,
+            "check_terminals",
+            command=self.on_check_terminals_button_click,
+        )
+        self.check_terminals_button.grid(row=0, column=5, padx=5, pady=10)
+
         self.quit_button = LocalizedButton(
             self, self.localizer, "quit", command=self.on_quit_button_click
         )
-        self.quit_button.grid(row=0, column=4, padx=5, pady=10)
+        self.quit_button.grid(row=0, column=6, padx=5, pady=10)
 
     def on_quit_button_click(self) -> None:
         self.controller.quit_program()
@@ -66,5 +79,11 @@ class UtilityButtonsFrame(tk.Frame):
     def on_export_cables_button_click(self) -> None:
         self.controller.export_to_csv(ExportFormat.CABLE)
 
+    def on_import_button_click(self) -> None:
+        self.controller.import_labels()
+
+    def on_check_terminals_button_click(self) -> None:
+        self.controller.report_terminal_conflicts()
+
     def on_save_button_click(self) -> None:
         self.controller.save_to_json_file()
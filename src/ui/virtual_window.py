@@ -0,0 +1,66 @@
+"""
+Bookkeeping for a virtualized (windowed) list. Only the rows between `first` and `first + size`
+are materialized as widgets; this class tracks where that window sits in the full list and
+translates scrollbar commands into window moves. It has no Tk dependencies so it can be tested on
+its own.
+"""
+
+
+class VirtualWindow:
+    def __init__(self, visible_rows: int, overscan: int = 2) -> None:
+        """
+        Args:
+            visible_rows (int): Number of rows the widget shows at once.
+            overscan (int): Extra rows materialized below the visible ones.
+        """
+        self.visible_rows = visible_rows
+        self.overscan = overscan
+        self.total = 0
+        self.first = 0
+
+    @property
+    def size(self) -> int:
+        return self.visible_rows + self.overscan
+
+    def set_total(self, total: int) -> None:
+        self.total = total
+        self.first = self._clamp(self.first)
+
+    def bounds(self) -> tuple[int, int]:
+        """
+        Returns the (start, stop) slice of the full list that should be materialized.
+        """
+        return self.first, min(self.first + self.size, self.total)
+
+    def scroll(self, rows: int) -> None:
+        self.first = self._clamp(self.first + rows)
+
+    def scroll_pages(self, pages: int) -> None:
+        self.scroll(pages * self.visible_rows)
+
+    def moveto(self, fraction: float) -> None:
+        self.first = self._clamp(int(fraction * self.total))
+
+    def scroll_to_end(self) -> None:
+        self.first = self._clamp(self.total)
+
+    def scroll_to(self, index: int) -> None:
+        """
+        Moves the window the least amount needed to show the row at index.
+        """
+        if index < self.first:
+            self.first = self._clamp(index)
+        elif index >= self.first + self.visible_rows:
+            self.first = self._clamp(index - self.visible_rows + 1)
+
+    def fractions(self) -> tuple[float, float]:
+        """
+        Returns the (first, last) fractions to pass to a scrollbar's set method.
+        """
+        if self.total == 0:
+            return 0.0, 1.0
+        last = min(self.first + self.visible_rows, self.total)
+        return self.first / self.total, last / self.total
+
+    def _clamp(self, first: int) -> int:
+        return max(0, min(first, self.total - self.visible_rows))
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Callable
+
+from src.journal_file_handler import repair_torn_tail
+
+"""
+Sidecar journal of the undo history, so a session that ends in a crash can be recovered. It lives
+next to the project as "<project file>.undo" and holds one line per event:
+
+    {"op": "do", "command": {...}}
+    {"op": "undo"}
+    {"op": "redo"}
+    {"op": "saved", "through": 2}
+
+"command" is the command's record (see Command.to_record). A "saved" event is written whenever the
+project file is written with every change in it, and says how many of the history events before
+it the file holds. Recovery only re-applies the history events after that. The count is taken
+before the write copies the connections, so it can only fall short: an event it misses is
+re-applied, and commands re-apply idempotently.
+
+Lines are written and flushed by a background thread, so recording an event never waits on the
+disk. The file is removed when the session closes cleanly; finding one when a project is opened
+means the last session didn't.
+"""
+
+logger = logging.getLogger(__name__)
+
+EXTENSION = ".undo"
+
+_STOP = None
+
+
+def journal_path(project_path: str | Path) -> Path:
+    return Path(f"{project_path}{EXTENSION}")
+
+
+def has_journal(project_path: str | Path) -> bool:
+    return journal_path(project_path).is_file()
+
+
+def read_events(project_path: str | Path) -> list[dict]:
+    """
+    Reads the events of a previous session, skipping the partial line a crash can leave behind.
+    """
+    events = []
+    try:
+        with open(journal_path(project_path), "r") as file:
+            lines = file.readlines()
+    except (FileNotFoundError, PermissionError) as e:
+        logger.info(f"Could not read undo journal for {project_path}: {e}")
+        return events
+    for line_number, line in enumerate(lines):
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            logger.warning(f"Ignoring unreadable undo journal line {line_number + 1}")
+    return events
+
+
+def remove_journal(project_path: str | Path) -> None:
+    try:
+        os.remove(journal_path(project_path))
+    except FileNotFoundError:
+        pass
+    except PermissionError as e:
+        logger.info(f"Could not remove undo journal for {project_path}: {e}")
+
+
+def history_events(events: list[dict]) -> list[dict]:
+    """
+    Returns the do, undo and redo events, leaving out the "saved" events.
+    """
+    return [event for event in events if event.get("op") != "saved"]
+
+
+def saved_through(events: list[dict]) -> int:
+    """
+    Returns how many history events the project file held at its last recorded write.
+    """
+    return max(
+        (event.get("through", 0) for event in events if event.get("op") == "saved"), default=0
+    )
+
+
+class UndoJournal:
+    def __init__(self, project_path: str | Path, recorded: int = 0) -> None:
+        """
+        Args:
+            project_path: The project file the history belongs to.
+            recorded (int): History events already in the file, when a recovered session
+                carries on with it.
+        """
+        self.file_path = journal_path(project_path)
+        self.recorded = recorded
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = threading.Thread(
+            target=self._write_events, daemon=True
+        )
+        self._thread.start()
+
+    def record(self, op: str, command=None) -> None:
+        """
+        Queues one history event. The command's record is taken right away, on the calling
+        thread, so later changes to the command can't leak into it.
+        """
+        event: dict = {"op": op}
+        if command is not None:
+            event["command"] = command.to_record()
+        self._queue.put(event)
+        # Only counted once the change it records has been made
+        self.recorded += 1
+
+    def before_save(self) -> Callable[[], None]:
+        """
+        Save listener for ConnectionManager. Counts the events the write is about to include,
+        and records a "saved" event for them once it has succeeded.
+        """
+        through = self.recorded
+        return lambda: self._queue.put({"op": "saved", "through": through})
+
+    def flush(self) -> None:
+        """
+        Waits until every queued event is on disk.
+        """
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self, remove: bool = False) -> None:
+        """
+        Writes what is queued and stops the writer. With remove, the journal is deleted as well,
+        which marks the session as closed cleanly.
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if remove:
+            try:
+                os.remove(self.file_path)
+            except FileNotFoundError:
+                pass
+            except PermissionError as e:
+                logger.info(f"Could not remove {self.file_path}: {e}")
+
+    def _open(self):
+        # A recovered journal can end in the partial line of the crash
+        repair_torn_tail(self.file_path)
+        try:
+            return open(self.file_path, "a")
+        except (PermissionError, FileNotFoundError) as e:
+            logger.error(f"Could not open undo journal {self.file_path}: {e}")
+            return None
+
+    def _write_events(self) -> None:
+        file = None
+        while True:
+            events = [self._queue.get()]
+            # Everything that piled up during the last write goes out in one write and flush
+            while True:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in events
+            lines = "".join(
+                json.dumps(event, separators=(",", ":")) + "\n"
+                for event in events
+                if event is not _STOP
+            )
+            # The file is only created once there is something to put in it
+            if lines and file is None:
+                file = self._open()
+            if lines and file is not None:
+                try:
+                    file.write(lines)
+                    file.flush()
+                except (OSError, ValueError) as e:
+                    logger.error(f"Could not append to undo journal {self.file_path}: {e}")
+            for _ in events:
+                self._queue.task_done()
+            if stop:
+                break
+        if file is not None:
+            file.close()
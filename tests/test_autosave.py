@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.autosave import DebouncedWriter, SaveState
+
+
+class TestDebouncedWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.write_callback = MagicMock(return_value=True)
+        # Long interval so the timer never fires on its own during a test
+        self.writer = DebouncedWriter(self.write_callback, interval=60)
+
+    def tearDown(self) -> None:
+        self.writer.flush()
+
+    def test_flush_coalesces_changes(self):
+        for _ in range(500):
+            self.writer.mark_dirty()
+        self.assertEqual(self.writer.state, SaveState.DIRTY)
+        self.assertTrue(self.writer.flush())
+        self.write_callback.assert_called_once()
+        self.assertEqual(self.writer.state, SaveState.SAVED)
+
+    def test_flush_when_clean_does_not_write(self):
+        self.assertTrue(self.writer.flush())
+        self.write_callback.assert_not_called()
+
+    def test_failed_write_stays_dirty(self):
+        self.write_callback.return_value = False
+        self.writer.mark_dirty()
+        self.assertFalse(self.writer.flush())
+        self.assertEqual(self.writer.state, SaveState.ERROR)
+        self.assertTrue(self.writer.is_dirty)
+
+    def test_timer_writes_in_background(self):
+        writer = DebouncedWriter(self.write_callback, interval=0.01)
+        writer.mark_dirty()
+        writer._timer.join()
+        self.write_callback.assert_called_once()
+        self.assertFalse(writer.is_dirty)
+
+
+if __name__ == "__main__":
+    unittest.main()
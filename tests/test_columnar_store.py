@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.columnar_store import ColumnarStore, StringTable
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+from src.csv_exporting_strategy import (
+    ExportCableToCSVStrategy,
+    ExportWireToCSVStrategy,
+)
+
+
+class TestStringTable(unittest.TestCase):
+    def test_codes_are_stable(self):
+        table = StringTable()
+        self.assertEqual(table.encode("TB"), 0)
+        self.assertEqual(table.encode("A"), 1)
+        self.assertEqual(table.encode("TB"), 0)
+        self.assertEqual(table.decode(1), "A")
+        self.assertIsNone(table.code_of("missing"))
+        self.assertEqual(len(table), 2)
+
+
+class TestColumnarStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.store = ColumnarStore()
+        self.conn_manager.register_index(self.store)
+        self.conn_manager.add_connections(
+            Connection(f"PLC{n % 3}", "TB1", str(n), "M", "X", str(n)).to_dict()
+            for n in range(30)
+        )
+
+    def assert_in_step(self):
+        self.assertEqual(list(self.store.iter_connections()), self.conn_manager.connections)
+        for view, stored in zip(self.store.iter_connections(), self.conn_manager.connections):
+            self.assertEqual(view.connection_id, stored.connection_id)
+
+    def test_follows_manager_mutations(self):
+        connections = self.conn_manager.get_connections()
+        self.conn_manager.delete_connection(connections[3])
+        self.conn_manager.edit_connection(
+            connections[5], Connection("NEW", "TB9", "1", "M", "X", "99")
+        )
+        self.conn_manager.delete_connections(connections[10:20])
+        self.conn_manager.add_connection("Z", "1", "1", "Y", "1", "1")
+        self.assert_in_step()
+
+    def test_follows_positional_restore(self):
+        popped = self.conn_manager.pop_connections(self.conn_manager.get_connections()[4:9])
+        self.conn_manager.insert_connections(popped)
+        self.assert_in_step()
+
+    def test_rollback_rebuilds(self):
+        with self.assertRaises(RuntimeError):
+            with self.conn_manager.transaction():
+                self.conn_manager.delete_connections(self.conn_manager.get_connections()[:5])
+                raise RuntimeError
+        self.assertEqual(len(self.store), 30)
+        self.assert_in_step()
+
+    def test_filter_rows(self):
+        rows = self.store.filter_rows(source_component="PLC1")
+        self.assertEqual(rows, list(range(1, 30, 3)))
+        self.assertEqual(self.store.filter_rows(source_component="PLC1", source_terminal="4"), [4])
+        self.assertEqual(self.store.filter_rows(source_component="nope"), [])
+
+    def test_count_by(self):
+        counts = self.store.count_by("source_component")
+        self.assertEqual(counts, {"PLC0": 10, "PLC1": 10, "PLC2": 10})
+
+    def test_formatted_rows_match_strategies(self):
+        self.conn_manager.delete_connection(self.conn_manager.connections[0])
+        for strategy in (ExportWireToCSVStrategy(), ExportCableToCSVStrategy()):
+            self.assertEqual(
+                list(strategy.iter_rows(self.store)),
+                list(strategy.iter_rows(self.conn_manager.connections)),
+            )
+
+    def test_copy_is_independent(self):
+        snapshot = self.store.copy()
+        self.conn_manager.delete_connections(self.conn_manager.get_connections())
+        self.assertEqual(len(snapshot), 30)
+        self.assertEqual(len(self.store), 0)
+
+    def test_manager_queries_agree_without_store(self):
+        plain_manager = ConnectionManager("/fake/path")
+        plain_manager.populate_connections(
+            connection.to_dict() for connection in self.conn_manager.connections
+        )
+        self.conn_manager.columnar_store = self.store
+        self.assertEqual(
+            self.conn_manager.filter_connections(source_component="PLC2"),
+            plain_manager.filter_connections(source_component="PLC2"),
+        )
+        self.assertEqual(
+            self.conn_manager.count_by("source_component"),
+            plain_manager.count_by("source_component"),
+        )
+        with self.assertRaises(ValueError):
+            self.conn_manager.count_by("colour")
+
+
+if __name__ == "__main__":
+    unittest.main()
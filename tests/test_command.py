@@ -1,6 +1,19 @@
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock
-from src.command import Command, EditConnectionCommand, AddConnectionCommand, DeleteConnectionCommand
+from src.command import (
+    Command,
+    ConnectionNotFoundError,
+    EditConnectionCommand,
+    AddConnectionCommand,
+    DeleteConnectionCommand,
+    ImportLabelsCommand,
+)
+from src.command_manager import CommandManager
+from src.connection import Connection
+from src.connection_manager import ConnectionManager, DuplicateConnectionError
 
 
 # The Command class needs to be untangled a little from the gui and the wiremanager. 
@@ -10,3 +23,142 @@ class TestAddConnectionCommand(unittest.TestCase):
 
     def test_execute(self):
         pass
+
+
+class TestEditConnectionCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.command_manager = CommandManager()
+        self.first = self.conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "1")
+        self.second = self.conn_manager.add_connection("A", "TB1", "2", "B", "TB2", "2")
+        self.new_values = Connection("A", "TB1", "1", "C", "TB3", "1").to_dict()
+
+    def test_execute_undo_redo_swap_in_place(self):
+        command = EditConnectionCommand(
+            MagicMock(), self.conn_manager, self.first, self.new_values
+        )
+        self.command_manager.execute(command)
+        self.assertEqual(self.conn_manager.connections[0].to_dict(), self.new_values)
+        self.assertEqual(self.conn_manager.connections[0].connection_id, self.first.connection_id)
+
+        self.command_manager.undo()
+        self.assertEqual(self.conn_manager.connections, [self.first, self.second])
+        self.assertEqual(self.conn_manager.connections[0].connection_id, self.first.connection_id)
+
+        self.command_manager.redo()
+        edited = self.conn_manager.connections[0]
+        self.assertEqual(edited.to_dict(), self.new_values)
+        self.assertEqual(edited.connection_id, self.first.connection_id)
+        self.assertEqual(list(self.command_manager.undo_stack), [command])
+
+    def test_executed_edit_keeps_only_the_changed_fields(self):
+        command = EditConnectionCommand(
+            MagicMock(), self.conn_manager, self.first, self.new_values
+        )
+        self.command_manager.execute(command)
+        self.assertIsNone(command.old_connection)
+        self.assertEqual(
+            command.old_values,
+            {"destination_component": "B", "destination_terminal_block": "TB2"},
+        )
+
+    def test_duplicate_edit_is_not_kept(self):
+        command = EditConnectionCommand(
+            MagicMock(), self.conn_manager, self.first, self.second.to_dict()
+        )
+        with self.assertRaises(DuplicateConnectionError):
+            self.command_manager.execute(command)
+        self.assertEqual(len(self.command_manager.undo_stack), 0)
+        self.assertIs(self.conn_manager.connections[0], self.first)
+
+    def test_edit_of_a_deleted_connection_is_not_found(self):
+        self.conn_manager.delete_connection(self.first)
+        command = EditConnectionCommand(
+            MagicMock(), self.conn_manager, self.first, self.new_values
+        )
+        with self.assertRaises(ConnectionNotFoundError):
+            self.command_manager.execute(command)
+        self.assertEqual(len(self.command_manager.undo_stack), 0)
+        self.assertEqual(self.conn_manager.connections, [self.second])
+
+
+class TestDeleteConnectionCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.conn_manager.populate_connections(
+            [Connection("A", "TB1", str(n), "B", "TB2", str(n)).to_dict() for n in range(100)]
+        )
+        self.original = self.conn_manager.get_connections()
+        self.view = MagicMock()
+        self.view.tree_widget.selected_connections_in_view.return_value = self.original[::10]
+        self.command = DeleteConnectionCommand(MagicMock(), self.conn_manager, self.view)
+
+    def test_undo_and_redo_from_packed_batch(self):
+        self.command.execute()
+        self.assertEqual(len(self.command.deleted_connections), 10)
+        self.assertEqual(len(self.conn_manager.connections), 90)
+
+        self.command.undo()
+        self.assertEqual(self.conn_manager.connections, self.original)
+        self.assertEqual(
+            [c.connection_id for c in self.conn_manager.connections],
+            [c.connection_id for c in self.original],
+        )
+
+        self.command.redo()
+        self.assertEqual(len(self.conn_manager.connections), 90)
+        self.assertFalse(self.conn_manager.has_connection(self.original[0]))
+
+    def test_redo_keeps_the_batch_when_connections_are_already_gone(self):
+        self.command.execute()
+        # Someone else put one back and deleted it again, or a recovery replays the redo
+        self.command.redo()
+        self.assertEqual(len(self.command.deleted_connections), 10)
+        self.command.undo()
+        self.assertEqual(self.conn_manager.connections, self.original)
+
+
+class TestImportLabelsCommand(unittest.TestCase):
+    def test_import_is_one_undo_entry(self):
+        conn_manager = ConnectionManager("/fake/path")
+        conn_manager.write_json_file = MagicMock(return_value=True)
+        conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "1")
+        rows = [Connection("C", "1", str(n), "D", "1", str(n)).to_dict() for n in range(50)]
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "labels.wir")
+            with open(file_path, "w") as file:
+                json.dump(rows, file)
+            command_manager = CommandManager()
+            command = ImportLabelsCommand(conn_manager, [file_path])
+            command_manager.execute(command)
+
+        self.assertEqual(command.stats.added, 50)
+        self.assertEqual(len(conn_manager.connections), 51)
+        conn_manager.write_json_file.reset_mock()
+        command_manager.undo()
+        self.assertEqual(len(conn_manager.connections), 1)
+        conn_manager.write_json_file.assert_called_once()
+        command_manager.redo()
+        self.assertEqual([c.to_dict() for c in conn_manager.connections[1:]], rows)
+
+
+class TestDuplicateAddConnectionCommand(unittest.TestCase):
+    def test_duplicate_add_is_not_kept(self):
+        conn_manager = ConnectionManager("/fake/path")
+        conn_manager.write_json_file = MagicMock(return_value=True)
+        conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "1")
+        command_manager = CommandManager()
+        command = AddConnectionCommand(
+            MagicMock(),
+            conn_manager,
+            {"component": "B", "terminal_block": "TB2", "terminal": "1"},
+            {"component": "A", "terminal_block": "TB1", "terminal": "1"},
+        )
+        with self.assertRaises(DuplicateConnectionError):
+            command_manager.execute(command)
+        self.assertEqual(len(command_manager.undo_stack), 0)
+        # Undo with nothing kept is a no-op rather than an error
+        command_manager.undo()
+        self.assertEqual(len(conn_manager.connections), 1)
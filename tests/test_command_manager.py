@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.command import COMMAND_BYTES, Command, EditConnectionCommand
+from src.command_manager import CommandManager
+from src.connection import Connection
+from src.connection_manager import ConnectionManager, DuplicateConnectionError
+
+
+class SizedCommand(Command):
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.undone = False
+
+    def undo(self):
+        self.undone = True
+
+    def nbytes(self) -> int:
+        return self.size
+
+
+class TestCommandManager(unittest.TestCase):
+    def test_oldest_entries_are_evicted_over_budget(self):
+        command_manager = CommandManager(memory_budget=1000)
+        commands = [SizedCommand(300) for _ in range(5)]
+        for command in commands:
+            command_manager.execute(command)
+        self.assertEqual(list(command_manager.undo_stack), commands[2:])
+        self.assertEqual(command_manager.history_bytes, 900)
+
+    def test_latest_entry_is_kept_whatever_its_size(self):
+        command_manager = CommandManager(memory_budget=1000)
+        command_manager.execute(SizedCommand(300))
+        command_manager.execute(SizedCommand(5000))
+        self.assertEqual(len(command_manager.undo_stack), 1)
+
+    def test_undo_redo_move_entries_between_stacks(self):
+        command_manager = CommandManager()
+        first, second = SizedCommand(10), SizedCommand(20)
+        command_manager.execute(first)
+        command_manager.execute(second)
+        command_manager.undo()
+        self.assertTrue(second.undone)
+        self.assertEqual(command_manager.redo_stack, [second])
+        command_manager.redo()
+        self.assertEqual(list(command_manager.undo_stack), [first, second])
+        self.assertEqual(command_manager.history_bytes, 30)
+
+        command_manager.undo()
+        command_manager.execute(SizedCommand(5))
+        self.assertEqual(command_manager.redo_stack, [])
+        self.assertEqual(command_manager.history_bytes, 15)
+
+
+class TestMacroCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.observer = MagicMock()
+        self.conn_manager.add_observer(self.observer)
+        self.connections = [
+            self.conn_manager.add_connection("A", "TB1", str(n), "B", "TB2", str(n))
+            for n in range(3)
+        ]
+        self.command_manager = CommandManager()
+        self.conn_manager.write_json_file.reset_mock()
+        self.observer.reset_mock()
+
+    def edit(self, connection: Connection, terminal: str) -> EditConnectionCommand:
+        values = {**connection.to_dict(), "destination_terminal": terminal}
+        return EditConnectionCommand(MagicMock(), self.conn_manager, connection, values)
+
+    def test_macro_is_one_entry_and_one_transaction(self):
+        with self.command_manager.macro(self.conn_manager):
+            for connection in self.connections:
+                self.command_manager.execute(self.edit(connection, "edited"))
+        self.assertEqual(len(self.command_manager.undo_stack), 1)
+        self.conn_manager.write_json_file.assert_called_once()
+        self.observer.update_connection_list.assert_called_once()
+        macro = self.command_manager.undo_stack[0]
+        self.assertEqual(macro.nbytes(), COMMAND_BYTES * 4)
+
+        self.conn_manager.write_json_file.reset_mock()
+        self.command_manager.undo()
+        self.assertEqual(self.conn_manager.connections, self.connections)
+        self.conn_manager.write_json_file.assert_called_once()
+
+        self.command_manager.redo()
+        self.assertEqual(
+            [c.destination_terminal for c in self.conn_manager.connections], ["edited"] * 3
+        )
+
+    def test_failed_macro_is_rolled_back_and_not_kept(self):
+        with self.assertRaises(DuplicateConnectionError):
+            with self.command_manager.macro(self.conn_manager):
+                self.command_manager.execute(self.edit(self.connections[0], "edited"))
+                # Would duplicate the third connection
+                self.command_manager.execute(
+                    EditConnectionCommand(
+                        MagicMock(),
+                        self.conn_manager,
+                        self.connections[1],
+                        self.connections[2].to_dict(),
+                    )
+                )
+        self.assertEqual(len(self.command_manager.undo_stack), 0)
+        self.assertEqual(self.conn_manager.connections, self.connections)
+        self.conn_manager.write_json_file.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from src.connection import Connection
+
+
+class TestConnection(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connection = Connection("A", "TB1", "1", "B", "TB2", "2")
+        self.reverse = Connection("B", "TB2", "2", "A", "TB1", "1")
+
+    def test_reverse_is_equal(self):
+        self.assertEqual(self.connection, self.reverse)
+
+    def test_canonical_key_is_orientation_independent(self):
+        self.assertEqual(self.connection.canonical_key(), self.reverse.canonical_key())
+
+    def test_hash_matches_reverse(self):
+        self.assertEqual(hash(self.connection), hash(self.reverse))
+        self.assertEqual(len({self.connection, self.reverse}), 1)
+
+    def test_different_connections_have_different_keys(self):
+        other = Connection("A", "TB1", "1", "B", "TB2", "3")
+        self.assertNotEqual(self.connection.canonical_key(), other.canonical_key())
+        self.assertNotEqual(self.connection, other)
+
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.connection, "__dict__"))
+
+    def test_repeated_values_share_one_string(self):
+        # Build the strings at runtime so the compiler can't share the constants
+        first = Connection("".join(["T", "B"]), "1", "1", "M", "1", "1")
+        second = Connection("".join(["T", "B"]), "1", "2", "M", "1", "2")
+        self.assertIs(first.source_component, second.source_component)
+
+    def test_ids_are_unique(self):
+        self.assertNotEqual(self.connection.connection_id, self.reverse.connection_id)
+
+    def test_output_is_unchanged(self):
+        self.assertEqual(str(self.connection), "A-TB1-1,B-TB2-2")
+        self.assertEqual(self.connection.to_tuple(), ("A-TB1-1", "B-TB2-2"))
+        self.assertEqual(self.connection.to_dict()["source_terminal_block"], "TB1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from src.connection import Connection
+from src.connection_batch import ConnectionBatch
+
+
+class TestConnectionBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.positioned = [
+            (n * 3, Connection("PLC", "TB1", str(n), "M1", "X", str(n % 4))) for n in range(200)
+        ]
+
+    def test_round_trip_keeps_positions_fields_and_ids(self):
+        batch = ConnectionBatch(self.positioned)
+        self.assertEqual(len(batch), 200)
+        for (position, connection), (unpacked_position, unpacked) in zip(self.positioned, batch):
+            self.assertEqual(unpacked_position, position)
+            self.assertEqual(unpacked.to_dict(), connection.to_dict())
+            self.assertEqual(unpacked.connection_id, connection.connection_id)
+            self.assertIsNot(unpacked, connection)
+
+    def test_appended(self):
+        connections = [connection for _, connection in self.positioned[:3]]
+        batch = ConnectionBatch.appended(connections, 10)
+        self.assertEqual([position for position, _ in batch], [10, 11, 12])
+        self.assertEqual(batch.connections(), connections)
+
+    def test_nbytes_is_a_few_words_per_connection(self):
+        self.assertEqual(ConnectionBatch().nbytes(), 0)
+        self.assertEqual(ConnectionBatch(self.positioned).nbytes(), 200 * (8 + 8 + 6 * 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+
+
+class TestConnectionGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.graph = self.conn_manager.graph
+        self.conn_manager.add_connections(
+            [
+                Connection("PLC", "TB1", "1", "M1", "X", "1").to_dict(),
+                Connection("M1", "X", "1", "M2", "X", "1").to_dict(),
+                Connection("M2", "X", "1", "M3", "Y", "5").to_dict(),
+                Connection("PLC", "TB1", "2", "M1", "X", "2").to_dict(),
+                Connection("M1", "X", "3", "PLC", "TB1", "3").to_dict(),
+            ]
+        )
+
+    def terminals(self, connections: list[Connection]) -> list[str]:
+        return [connection.source_terminal for connection in connections]
+
+    def test_connections_of_component(self):
+        self.assertEqual(self.terminals(self.graph.connections_of("PLC")), ["1", "2", "3"])
+        self.assertEqual(self.graph.neighbours_of("M1"), {"PLC", "M2"})
+        self.assertEqual(self.graph.connections_of("nothing"), [])
+
+    def test_connections_between_blocks_in_either_direction(self):
+        between = self.graph.connections_between(("M1", "X"), ("PLC", "TB1"))
+        self.assertEqual(self.terminals(between), ["1", "2", "3"])
+        self.assertEqual(self.graph.connections_between(("PLC", "TB1"), ("M3", "Y")), [])
+
+    def test_net_follows_connections_transitively(self):
+        terminals, connections = self.graph.net(("M3", "Y", "5"))
+        self.assertEqual(
+            terminals,
+            [("M3", "Y", "5"), ("M2", "X", "1"), ("M1", "X", "1"), ("PLC", "TB1", "1")],
+        )
+        self.assertEqual(len(connections), 3)
+        self.assertEqual(self.graph.net(("M9", "X", "1")), ([], []))
+
+    def test_nets_cover_every_terminal_once(self):
+        nets = list(self.graph.nets())
+        self.assertEqual(len(nets), 3)
+        self.assertEqual(sum(len(terminals) for terminals, _ in nets), len(self.graph))
+        self.assertEqual(sum(len(connections) for _, connections in nets), 5)
+
+    def test_follows_manager_mutations(self):
+        self.conn_manager.delete_connection(Connection("M1", "X", "1", "M2", "X", "1"))
+        terminals, _ = self.graph.net(("M3", "Y", "5"))
+        self.assertEqual(terminals, [("M3", "Y", "5"), ("M2", "X", "1")])
+
+        self.conn_manager.edit_connection(
+            Connection("M2", "X", "1", "M3", "Y", "5"),
+            Connection("M2", "X", "1", "M4", "Y", "5"),
+        )
+        self.assertEqual(self.graph.connections_of("M3"), [])
+        self.assertNotIn(("M3", "Y", "5"), self.graph)
+        self.assertEqual(self.graph.neighbours_of("M4"), {"M2"})
+
+        self.conn_manager.connections = []
+        self.assertEqual(len(self.graph), 0)
+        self.assertEqual(self.graph.by_block_pair, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,8 @@ from unittest.mock import MagicMock, mock_open, patch
 from src.connection import Connection
 from pathlib import Path
 
-from src.connection_manager import ConnectionManager
+from src.autosave import DebouncedWriter, SaveState
+from src.connection_manager import ConnectionManager, DuplicateConnectionError
 
 # Pyright errors can be misleading!
 
@@ -170,9 +171,12 @@ class TestConnectionManager(unittest.TestCase):
         connection1 = MagicMock()
         connection2 = MagicMock()
         connection3 = MagicMock()
-        self.conn_manager.connections.append(connection1)
-        self.conn_manager.connections.append(connection2)
-        self.conn_manager.connections.append(connection3)
+        # Assign through the property so the duplicate-detection index is rebuilt
+        self.conn_manager.connections = self.conn_manager.connections + [
+            connection1,
+            connection2,
+            connection3,
+        ]
 
         number_of_connections = len(self.conn_manager.connections)
 
@@ -193,9 +197,12 @@ class TestConnectionManager(unittest.TestCase):
         connection2 = MagicMock()
         connection3 = MagicMock()
         connection4 = MagicMock()
-        self.conn_manager.connections.append(connection1)
-        self.conn_manager.connections.append(connection2)
-        self.conn_manager.connections.append(connection3)
+        # Assign through the property so the duplicate-detection index is rebuilt
+        self.conn_manager.connections = self.conn_manager.connections + [
+            connection1,
+            connection2,
+            connection3,
+        ]
 
         number_of_connections = len(self.conn_manager.connections)
 
@@ -294,3 +301,188 @@ class TestCableManager(unittest.TestCase):
 
         result2 = self.cable_manager.add_connection("f2", "f2", "f3", "f4", "f5", "f6")
         self.assertFalse(result2)
+
+
+class TestConnectionIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.save_json_to_file = MagicMock(return_value=True)
+
+    def test_add_rejects_reverse_duplicate(self):
+        self.conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "2")
+        with self.assertRaises(DuplicateConnectionError):
+            self.conn_manager.add_connection("B", "TB2", "2", "A", "TB1", "1")
+        self.assertEqual(len(self.conn_manager.connections), 1)
+
+    def test_delete_removes_from_index(self):
+        connection = self.conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "2")
+        self.assertTrue(self.conn_manager.delete_connection(connection))
+        self.assertFalse(self.conn_manager.has_connection(connection))
+        # The same connection can be added again once it has been deleted
+        self.conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "2")
+
+    def test_edit_updates_index(self):
+        old = self.conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "2")
+        new = Connection("A", "TB1", "1", "B", "TB2", "3")
+        self.assertTrue(self.conn_manager.edit_connection(old, new))
+        self.assertFalse(self.conn_manager.has_connection(old))
+        self.assertIs(self.conn_manager.find_connection(new), new)
+
+    def test_populate_rebuilds_index(self):
+        self.conn_manager.populate_connections(
+            [Connection("A", "TB1", "1", "B", "TB2", "2").to_dict()]
+        )
+        self.assertTrue(
+            self.conn_manager.has_connection(Connection("B", "TB2", "2", "A", "TB1", "1"))
+        )
+
+
+class TestTransaction(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.observer = MagicMock()
+        self.conn_manager.add_observer(self.observer)
+        self.conn_manager.populate_connections(
+            [
+                Connection("A", "TB1", str(n), "B", "TB2", str(n)).to_dict()
+                for n in range(1000)
+            ]
+        )
+
+    def test_delete_connections_saves_and_notifies_once(self):
+        to_delete = self.conn_manager.get_connections()
+        deleted = self.conn_manager.delete_connections(to_delete)
+
+        self.assertEqual(len(deleted), 1000)
+        self.assertEqual(self.conn_manager.connections, [])
+        self.conn_manager.write_json_file.assert_called_once()
+        self.observer.update_connection_list.assert_called_once_with(
+            added=[], removed=deleted
+        )
+
+    def test_delete_connection_notifies_observers(self):
+        connection = self.conn_manager.connections[500]
+
+        self.assertTrue(self.conn_manager.delete_connection(connection))
+
+        self.observer.update_connection_list.assert_called_once_with(removed=[connection])
+
+    def test_delete_connections_skips_unknown_and_repeats(self):
+        first = self.conn_manager.connections[0]
+        deleted = self.conn_manager.delete_connections(
+            [first, first, Connection("X", "", "", "Y", "", "")]
+        )
+        self.assertEqual(deleted, [first])
+        self.assertEqual(len(self.conn_manager.connections), 999)
+
+    def test_insert_connections_restores_original_positions(self):
+        original = self.conn_manager.get_connections()
+        popped = self.conn_manager.pop_connections(original[::7] + original[-3:])
+        self.assertEqual(popped[0], (0, original[0]))
+        self.assertEqual(popped[-1], (999, original[999]))
+        self.conn_manager.write_json_file.reset_mock()
+        self.observer.update_connection_list.reset_mock()
+
+        restored = self.conn_manager.insert_connections(reversed(popped))
+
+        self.assertEqual(self.conn_manager.connections, original)
+        self.assertEqual(len(restored), len(popped))
+        self.assertTrue(self.conn_manager.has_connection(original[7]))
+        self.conn_manager.write_json_file.assert_called_once()
+        self.observer.update_connection_list.assert_called_once_with(
+            added=restored, removed=[]
+        )
+
+    def test_insert_connections_skips_stored_and_appends_past_the_end(self):
+        first = self.conn_manager.connections[0]
+        extra = Connection("X", "1", "1", "Y", "1", "1")
+        restored = self.conn_manager.insert_connections([(0, first), (5000, extra)])
+        self.assertEqual(restored, [extra])
+        self.assertIs(self.conn_manager.connections[-1], extra)
+
+    def test_save_now_goes_through_the_autosaver(self):
+        self.conn_manager.autosaver = DebouncedWriter(self.conn_manager.write_json_file, 3600)
+
+        self.assertTrue(self.conn_manager.save_now())
+
+        self.conn_manager.write_json_file.assert_called_once()
+        self.assertEqual(self.conn_manager.save_state(), SaveState.SAVED)
+
+    def test_edit_connection_in_place(self):
+        connections = self.conn_manager.connections
+        # Drop the position index so the edit has to find the connection after a delete
+        self.conn_manager.delete_connection(connections[0])
+        old = connections[500]
+        new = Connection("A", "TB1", "500", "B", "TB2", "edited")
+        self.conn_manager.write_json_file.reset_mock()
+
+        self.assertTrue(self.conn_manager.edit_connection(old, new))
+
+        self.assertIs(connections[500], new)
+        self.assertEqual(new.connection_id, old.connection_id)
+        self.assertEqual(len(connections), 999)
+        self.conn_manager.write_json_file.assert_called_once()
+        self.observer.update_connection_list.assert_called_with(added=[new], removed=[old])
+
+        # Undo is the same edit the other way round
+        self.assertTrue(self.conn_manager.edit_connection(new, old))
+        self.assertIs(connections[500], old)
+        self.assertTrue(self.conn_manager.has_connection(old))
+        self.assertFalse(self.conn_manager.has_connection(new))
+
+    def test_edit_connection_rejects_duplicates(self):
+        first, second = self.conn_manager.connections[:2]
+        self.assertFalse(
+            self.conn_manager.edit_connection(first, Connection(*second.to_dict().values()))
+        )
+        self.assertIs(self.conn_manager.connections[0], first)
+        # Turning a connection around is not a duplicate of itself
+        reversed_first = Connection("B", "TB2", "0", "A", "TB1", "0")
+        self.assertTrue(self.conn_manager.edit_connection(first, reversed_first))
+        self.assertIs(self.conn_manager.connections[0], reversed_first)
+
+    def test_edit_connection_after_appends(self):
+        connections = self.conn_manager.connections
+        self.conn_manager.edit_connection(connections[1], Connection("A", "", "", "B", "", ""))
+        added = self.conn_manager.add_connection("C", "1", "1", "D", "1", "1")
+        new = Connection("C", "1", "1", "D", "1", "2")
+        self.assertTrue(self.conn_manager.edit_connection(added, new))
+        self.assertIs(connections[-1], new)
+
+    def test_transaction_defers_until_commit(self):
+        with self.conn_manager.transaction():
+            added = self.conn_manager.add_connection("C", "1", "1", "D", "1", "1")
+            self.conn_manager.delete_connection(self.conn_manager.connections[0])
+            self.conn_manager.write_json_file.assert_not_called()
+            self.observer.update_connection_list.assert_not_called()
+
+        self.conn_manager.write_json_file.assert_called_once()
+        self.observer.update_connection_list.assert_called_once()
+        kwargs = self.observer.update_connection_list.call_args.kwargs
+        self.assertEqual(kwargs["added"], [added])
+        self.assertEqual(len(kwargs["removed"]), 1)
+
+    def test_transaction_rolls_back_on_error(self):
+        before = self.conn_manager.get_connections()
+        with self.assertRaises(DuplicateConnectionError):
+            with self.conn_manager.transaction():
+                self.conn_manager.delete_connection(before[0])
+                self.conn_manager.add_connection("C", "1", "1", "D", "1", "1")
+                self.conn_manager.add_connection("D", "1", "1", "C", "1", "1")
+
+        self.assertEqual(self.conn_manager.connections, before)
+        self.assertTrue(self.conn_manager.has_connection(before[0]))
+        self.assertFalse(
+            self.conn_manager.has_connection(Connection("C", "1", "1", "D", "1", "1"))
+        )
+        self.conn_manager.write_json_file.assert_not_called()
+        # A full refresh, in case the rolled back changes were already shown
+        self.observer.update_connection_list.assert_called_once_with()
+
+    def test_nested_transactions_commit_once(self):
+        with self.conn_manager.transaction():
+            with self.conn_manager.transaction():
+                self.conn_manager.add_connection("C", "1", "1", "D", "1", "1")
+            self.conn_manager.write_json_file.assert_not_called()
+        self.conn_manager.write_json_file.assert_called_once()
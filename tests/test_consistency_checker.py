@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+from src.consistency_checker import ConsistencyChecker
+
+
+class TestConsistencyChecker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "project.wir")
+        self.conn_manager = ConnectionManager()
+        self.conn_manager.set_save_file_name(self.file_path)
+        # Save immediately so the file is never expected to lag behind
+        self.conn_manager.autosaver = None
+        self.checker = ConsistencyChecker(self.conn_manager, interval=60)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_matching_file_passes(self):
+        self.conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "1")
+        self.assertTrue(self.checker.check())
+
+    def test_divergent_file_fails(self):
+        self.conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "1")
+        self.conn_manager.connections.append(Connection("C", "TB1", "1", "D", "TB2", "1"))
+        self.assertFalse(self.checker.check())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.connection import Connection
+from src.csv_exporting_strategy import (
+    EXPORT_CHUNK_SIZE,
+    ExportCableToCSVStrategy,
+    ExportWireToCSVStrategy,
+)
+
+
+class TestExportStrategies(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.directory.name) / "labels.csv"
+        self.connections = [
+            Connection("A", "TB1", str(number), "B", "TB2", str(number))
+            for number in range(EXPORT_CHUNK_SIZE * 2 + 5)
+        ]
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_wire_row_format(self):
+        row = ExportWireToCSVStrategy().format_row(Connection("A", "TB1", "1", "B", "", "2"))
+        self.assertEqual(row, ("A-TB1-1", "B--2"))
+
+    def test_cable_row_format(self):
+        row = ExportCableToCSVStrategy().format_row(Connection("A", "TB1", "1-8", "B", "TB2", "9"))
+        self.assertEqual(row, ("A-TB1 [1-8]", "B-TB2 [9]"))
+
+    def test_export_streams_every_row_and_reports_progress(self):
+        progress = []
+        strategy = ExportWireToCSVStrategy()
+        self.assertTrue(
+            strategy.export_to_csv(
+                self.file_path, self.connections, progress_callback=progress.append
+            )
+        )
+        with open(self.file_path) as file:
+            lines = file.read().splitlines()
+        self.assertEqual(lines[0], "A-TB1-0|B-TB2-0")
+        self.assertEqual(len(lines), len(self.connections))
+        self.assertEqual(progress[-1], len(self.connections))
+        self.assertEqual(len(progress), 3)
+
+    def test_export_matches_preview_string(self):
+        strategy = ExportCableToCSVStrategy()
+        strategy.export_to_csv(self.file_path, self.connections)
+        with open(self.file_path) as file:
+            self.assertEqual(
+                file.read().splitlines(),
+                strategy.generate_csv_string(self.connections).splitlines(),
+            )
+
+    def test_cancelled_export_removes_partial_file(self):
+        cancel_event = threading.Event()
+        result = ExportWireToCSVStrategy().export_to_csv(
+            self.file_path,
+            self.connections,
+            progress_callback=lambda rows_written: cancel_event.set(),
+            cancel_event=cancel_event,
+        )
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(self.file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
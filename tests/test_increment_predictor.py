@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.connection import Connection
+from src.increment_predictor import (
+    LEARNED_BIGRAMS_FILE,
+    IncrementLearner,
+    IncrementPredictor,
+)
+
+
+class TestIncrementPredictor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.predictor = IncrementPredictor(
+            program_bigrams={
+                "1-8->9-16": 175,
+                "25-32->1-8": 83,
+                "25-32->33-40": 12,
+                "3A4A->5C7C": 4,
+                "3A4A->5B6B": 4,
+            },
+            custom_bigrams=["9-16->25-32", "9-16->17-24"],
+            wire_patterns={"source": {"TSN1-5B6B": 7, "TSN1-5C7C": 1}, "destination": {}},
+        )
+
+    def test_most_frequent_successor_wins(self):
+        self.assertEqual(self.predictor.predict("25-32"), "1-8")
+        self.assertEqual(self.predictor.candidates("25-32"), ("1-8", "33-40"))
+
+    def test_custom_bigrams_come_first(self):
+        self.assertEqual(self.predictor.candidates("9-16"), ("25-32", "17-24"))
+
+    def test_wire_patterns_break_ties(self):
+        self.assertEqual(self.predictor.predict("3A4A"), "5B6B")
+
+    def test_range_rule(self):
+        self.assertEqual(self.predictor.predict("41-48"), "49-56")
+
+    def test_number_rule(self):
+        self.assertEqual(self.predictor.predict("A12B"), "A13B")
+
+    def test_no_rule_returns_value(self):
+        self.assertEqual(self.predictor.predict("GND"), "GND")
+        self.assertEqual(self.predictor.predict(""), "")
+
+    def test_from_data_directory_tolerates_missing_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "program_bigrams.json"), "w") as file:
+                json.dump({"1-4->5-8": 3}, file)
+            predictor = IncrementPredictor.from_data_directory(directory)
+        self.assertEqual(predictor.predict("1-4"), "5-8")
+        self.assertEqual(predictor.predict("7"), "8")
+
+
+class TestIncrementLearning(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, LEARNED_BIGRAMS_FILE)
+        self.predictor = IncrementPredictor(program_bigrams={"1-8->9-16": 2})
+        self.learner = IncrementLearner(self.predictor, self.file_path, interval=60)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def add(self, source_terminal: str, destination_terminal: str) -> None:
+        self.learner.on_connection_added(
+            Connection("A", "TB", source_terminal, "B", "TB", destination_terminal)
+        )
+
+    def test_learned_successor_overtakes_program_bigram(self):
+        for _ in range(3):
+            self.add("1-8", "1-8")
+            self.add("17-24", "17-24")
+        self.assertEqual(self.predictor.predict("1-8"), "17-24")
+        self.assertEqual(self.predictor.candidates("1-8"), ("17-24", "9-16"))
+
+    def test_learning_overrides_rules(self):
+        self.add("X1", "Y")
+        self.add("X5", "Y")
+        self.assertEqual(self.predictor.predict("X1"), "X5")
+
+    def test_learned_counts_survive_a_restart(self):
+        self.add("3A4A", "1")
+        self.add("5B6B", "2")
+        self.assertTrue(self.learner.writer.is_dirty)
+        self.assertTrue(self.learner.flush())
+
+        with open(self.file_path) as file:
+            self.assertEqual(json.load(file), {"3A4A": {"5B6B": 1}, "1": {"2": 1}})
+        reloaded = IncrementPredictor.from_data_directory(self.directory.name)
+        self.assertEqual(reloaded.predict("3A4A"), "5B6B")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+from src.journal_file_handler import JournalFileHandler
+
+
+class TestJournalFileHandler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "project.wirj")
+        self.handler = JournalFileHandler(self.file_path, compaction_threshold=10_000)
+        self.wire_1 = Connection("A", "TB1", "1", "B", "TB2", "1").to_dict()
+        self.wire_2 = Connection("A", "TB1", "2", "B", "TB2", "2").to_dict()
+        self.wire_3 = Connection("A", "TB1", "3", "B", "TB2", "3").to_dict()
+
+    def tearDown(self) -> None:
+        self.handler.close()
+        self.directory.cleanup()
+
+    def test_replay_applies_records_in_order(self):
+        self.handler.save([self.wire_1])
+        self.handler.append("add", connection=self.wire_2)
+        self.handler.append("edit", old=self.wire_1, new=self.wire_3)
+        self.handler.append("delete", connection=self.wire_2)
+        self.handler.close()
+
+        self.assertEqual(self.handler.load(), [self.wire_3])
+
+    def test_torn_last_record_is_ignored(self):
+        self.handler.append("add", connection=self.wire_1)
+        self.handler.close()
+        with open(self.file_path, "a") as file:
+            file.write('{"op":"add","connection":{"source_comp')
+
+        self.assertEqual(self.handler.load(), [self.wire_1])
+
+    def test_append_after_torn_last_record_starts_a_new_line(self):
+        self.handler.append("add", connection=self.wire_1)
+        self.handler.close()
+        with open(self.file_path, "a") as file:
+            file.write('{"op":"add","connection":{"source_comp')
+
+        self.handler.load()
+        self.handler.append("add", connection=self.wire_2)
+        self.handler.close()
+
+        self.assertEqual(self.handler.load(), [self.wire_1, self.wire_2])
+
+    def test_load_leaves_a_torn_last_record_on_disk(self):
+        self.handler.append("add", connection=self.wire_1)
+        with open(self.file_path, "a") as file:
+            # An append another handler is still in the middle of
+            file.write('{"op":"add","connection":{"source_comp')
+        with open(self.file_path) as file:
+            contents = file.read()
+
+        self.assertEqual(JournalFileHandler(self.file_path).load(), [self.wire_1])
+
+        with open(self.file_path) as file:
+            self.assertEqual(file.read(), contents)
+
+    def test_save_compacts_log(self):
+        self.handler.compaction_threshold = 100
+        for _ in range(5):
+            self.handler.append("add", connection=self.wire_1)
+        self.assertTrue(self.handler.needs_compaction())
+
+        self.handler.save([self.wire_1])
+        self.assertFalse(self.handler.needs_compaction())
+        with open(self.file_path) as file:
+            self.assertEqual(len(file.readlines()), 1)
+        self.assertEqual(self.handler.load(), [self.wire_1])
+
+
+class TestJournaledConnectionManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "project.wirj")
+        self.conn_manager = ConnectionManager()
+        self.conn_manager.set_save_file_name(self.file_path)
+
+    def tearDown(self) -> None:
+        self.conn_manager.file_handler.close()
+        self.directory.cleanup()
+
+    def test_mutations_append_instead_of_rewriting(self):
+        with patch.object(self.conn_manager.file_handler, "save") as mock_save:
+            first = self.conn_manager.add_connection("A", "TB1", "1", "B", "TB2", "1")
+            self.conn_manager.add_connection("A", "TB1", "2", "B", "TB2", "2")
+            self.conn_manager.delete_connection(first)
+            mock_save.assert_not_called()
+
+        reloaded = ConnectionManager()
+        reloaded.populate_connections(self.conn_manager.file_handler.load())
+        self.assertEqual(reloaded.connections, self.conn_manager.connections)
+
+    def test_batch_add_is_journaled(self):
+        with patch.object(self.conn_manager.file_handler, "save") as mock_save:
+            self.conn_manager.add_connections(
+                Connection("A", "TB1", str(n), "B", "TB2", str(n)).to_dict()
+                for n in range(10)
+            )
+            mock_save.assert_not_called()
+
+        reloaded = ConnectionManager()
+        reloaded.populate_connections(self.conn_manager.file_handler.load())
+        self.assertEqual(len(reloaded.connections), 10)
+
+    def test_restored_batches_replay_in_their_original_positions(self):
+        connections = [
+            self.conn_manager.add_connection("A", "TB1", str(n), "B", "TB2", str(n))
+            for n in range(10)
+        ]
+        first_batch = self.conn_manager.pop_connections(connections[2:5])
+        second_batch = self.conn_manager.pop_connections([connections[0], connections[9]])
+        self.conn_manager.insert_connections(second_batch)
+        self.conn_manager.insert_connections(first_batch)
+        self.assertEqual(self.conn_manager.connections, connections)
+
+        reloaded = ConnectionManager()
+        reloaded.populate_connections(self.conn_manager.file_handler.load())
+        self.assertEqual(reloaded.connections, connections)
+
+
+if __name__ == "__main__":
+    unittest.main()
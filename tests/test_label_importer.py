@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+from src.csv_exporting_strategy import (
+    ExportCableToCSVStrategy,
+    ExportWireToCSVStrategy,
+)
+from src.label_importer import (
+    LabelImporter,
+    iter_connection_dicts,
+    iter_label_files,
+    parse_label,
+)
+
+
+class TestParseLabel(unittest.TestCase):
+    def test_round_trips_export_strategies(self):
+        connection = Connection("PLC", "TB1", "12", "MTR", "X2", "4")
+        for strategy in (ExportWireToCSVStrategy(), ExportCableToCSVStrategy()):
+            source, destination = strategy.format_row(connection)
+            self.assertEqual(parse_label(source), ("PLC", "TB1", "12"))
+            self.assertEqual(parse_label(destination), ("MTR", "X2", "4"))
+
+    def test_wire_terminal_keeps_extra_hyphens(self):
+        self.assertEqual(parse_label("A-TB-1-2"), ("A", "TB", "1-2"))
+
+    def test_cable_terminal_range(self):
+        self.assertEqual(parse_label("M-TB [1-6]"), ("M", "TB", "1-6"))
+
+    def test_short_label(self):
+        self.assertEqual(parse_label("GND"), ("GND", "", ""))
+
+
+class TestIterConnectionDicts(unittest.TestCase):
+    def test_json(self):
+        conn_dict = Connection("A", "1", "2", "B", "3", "4").to_dict()
+        self.assertEqual(list(iter_connection_dicts(json.dumps([conn_dict]))), [conn_dict])
+
+    def test_pipe_csv(self):
+        rows = list(iter_connection_dicts("HH-TB1-12|II-TB1-8\nM-TB [1-6]|N-TB [1-6]\n"))
+        self.assertEqual(
+            rows[0], Connection("HH", "TB1", "12", "II", "TB1", "8").to_dict()
+        )
+        self.assertEqual(rows[1], Connection("M", "TB", "1-6", "N", "TB", "1-6").to_dict())
+
+    def test_csv_with_header(self):
+        manager = ConnectionManager()
+        manager.populate_connections([Connection("A", "1", "2", "B", "3", "4").to_dict()])
+        rows = list(iter_connection_dicts(manager.generate_csv_string()))
+        self.assertEqual(rows, [Connection("A", "1", "2", "B", "3", "4").to_dict()])
+
+    def test_empty(self):
+        self.assertEqual(list(iter_connection_dicts("  \n")), [])
+
+
+class TestLabelImporter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.connection_manager = ConnectionManager()
+        self.importer = LabelImporter(self.connection_manager)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_import_directory_dedups_across_files(self):
+        self.write("a.wir", json.dumps([Connection("A", "1", "2", "B", "3", "4").to_dict()]))
+        # Same wire, written in the other orientation
+        self.write("b.csv", "B-3-4|A-1-2\nC-1-1|D-1-1\n")
+        self.write("empty.cab", "")
+        self.write("notes.txt", "not a label file")
+
+        stats = self.importer.import_paths([self.directory.name])
+
+        self.assertEqual(stats.files, 3)
+        self.assertEqual(stats.rows, 3)
+        self.assertEqual(stats.added, 2)
+        self.assertEqual(stats.duplicates, 1)
+        self.assertEqual(len(self.connection_manager.connections), 2)
+
+    def test_import_zip(self):
+        zip_path = os.path.join(self.directory.name, "labels.zip")
+        with zipfile.ZipFile(zip_path, "w") as archive:
+            archive.writestr("labels/one.wir", "A-1-2|B-3-4\n")
+            archive.writestr("labels/NO EXTENSION", "C-1-2|D-3-4\n")
+            archive.writestr("labels/", "")
+
+        self.assertEqual(len(list(iter_label_files(zip_path))), 2)
+        stats = self.importer.import_paths([zip_path])
+        self.assertEqual(stats.added, 2)
+
+    def test_unreadable_file_is_skipped(self):
+        self.write("broken.wir", "[{")
+        self.write("good.wir", "A-1-2|B-3-4\n")
+
+        stats = self.importer.import_paths([self.directory.name])
+
+        self.assertEqual(stats.unreadable_files, 1)
+        self.assertEqual(stats.added, 1)
+
+    def test_batch_notifies_observers_once(self):
+        class Observer:
+            calls = 0
+
+            def update_connection_list(self, **kwargs):
+                Observer.calls += 1
+
+        self.connection_manager.add_observer(Observer())
+        self.write("many.wir", "".join(f"A-1-{n}|B-1-{n}\n" for n in range(50)))
+
+        self.importer.import_paths([self.directory.name])
+
+        self.assertEqual(Observer.calls, 1)
+        self.assertEqual(len(self.connection_manager.connections), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
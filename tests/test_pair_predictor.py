@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.connection import Connection
+from src.increment_predictor import IncrementPredictor
+from src.pair_predictor import PairPredictor
+
+
+class TestPairPredictor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.predictor = PairPredictor(
+            {
+                "('TB-1-8', 'X-1') -> ('TB-9-16', 'X-2')": 35,
+                "('TB-1-8', 'X-1') -> ('TB-17-24', 'X-3')": 4,
+                "('TB-1-8', 'X-1') -> ('TB-25-32', 'X-4')": 4,
+                "not a bigram": 1,
+                "('TB-1-8',) -> ('TB-9-16',)": 1,
+            },
+            IncrementPredictor(program_bigrams={"5A->5B": 1}),
+        )
+
+    def test_alternatives_are_ranked(self):
+        predictions = self.predictor.predict(Connection("A", "TB", "1-8", "B", "X", "1"))
+        self.assertEqual(
+            [(p["source_terminal"], p["destination_terminal"]) for p in predictions],
+            [("9-16", "2"), ("17-24", "3"), ("25-32", "4")],
+        )
+        self.assertEqual(predictions[0]["source_component"], "A")
+        self.assertEqual(predictions[0]["destination_component"], "B")
+        self.assertEqual(predictions[0]["source_terminal_block"], "TB")
+
+    def test_destination_first_connections_match(self):
+        predictions = self.predictor.predict(Connection("B", "X", "1", "A", "TB", "1-8"))
+        self.assertEqual(predictions[0]["source_terminal_block"], "X")
+        self.assertEqual(predictions[0]["source_terminal"], "2")
+        self.assertEqual(predictions[0]["destination_terminal"], "9-16")
+
+    def test_falls_back_to_incrementing_terminals(self):
+        predictions = self.predictor.predict(Connection("A", "Q", "5A", "B", "R", "7"))
+        self.assertEqual(len(predictions), 1)
+        self.assertEqual(predictions[0]["source_terminal"], "5B")
+        self.assertEqual(predictions[0]["destination_terminal"], "8")
+
+    def test_no_prediction_without_rules(self):
+        self.assertEqual(PairPredictor().predict(Connection("A", "Q", "GND", "B", "R", "")), [])
+
+    def test_from_data_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "bigram_frequency.json"), "w") as file:
+                json.dump({"('TB-1', 'TB-1') -> ('TB-2', 'TB-2')": 3}, file)
+            predictor = PairPredictor.from_data_directory(directory)
+            missing = PairPredictor.from_data_directory(os.path.join(directory, "missing"))
+        self.assertEqual(missing.transitions, {})
+        self.assertEqual(predictor.transitions, {("TB-1", "TB-1"): (("TB-2", "TB-2"),)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+
+from src.connection import Connection
+from src.increment_predictor import IncrementPredictor
+from src.pattern_miner import PatternCounts, mine
+
+
+class TestPatternCounts(unittest.TestCase):
+    def test_formats_match_the_shipped_tables(self):
+        counts = PatternCounts()
+        counts.count_rows(
+            [
+                Connection("A", "TB", "1-8", "B", "TB", "1-8").to_dict(),
+                Connection("A", "TB", "9-16", "B", "TB", "9-16").to_dict(),
+            ]
+        )
+        self.assertEqual(counts.source_patterns, {"TB-1-8": 1, "TB-9-16": 1})
+        self.assertEqual(counts.terminal_bigrams, {"1-8->9-16": 2})
+        self.assertEqual(
+            counts.pair_bigrams,
+            {"('TB-1-8', 'TB-1-8') -> ('TB-9-16', 'TB-9-16')": 1},
+        )
+
+
+class TestMine(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.archive_path = os.path.join(self.directory.name, "projects.zip")
+        project = json.dumps(
+            [
+                Connection("A", "TB", f"{start}-{start + 7}", "B", "X", str(n)).to_dict()
+                for n, start in enumerate(range(1, 33, 8))
+            ]
+        )
+        with zipfile.ZipFile(self.archive_path, "w") as archive:
+            archive.writestr("projects/one.wir", project)
+            archive.writestr("projects/one copy.csv", project)
+            archive.writestr("projects/two.cab", "M-TB [1-6]|N-TB [1-6]\nM-TB [7-12]|N-TB [7-12]\n")
+            archive.writestr("projects/broken.wir", "[{")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_pool_and_inline_agree(self):
+        inline = mine([self.archive_path], workers=1)
+        pooled = mine([self.archive_path], workers=2)
+        self.assertEqual(inline, pooled)
+        self.assertEqual(inline.files, 4)
+        self.assertEqual(inline.duplicate_files, 1)
+        self.assertEqual(inline.unreadable_files, 1)
+        self.assertEqual(inline.rows, 6)
+        self.assertEqual(inline.terminal_bigrams["1-8->9-16"], 1)
+        self.assertEqual(inline.terminal_bigrams["1-6->7-12"], 2)
+
+    def test_keep_duplicates(self):
+        counts = mine([self.archive_path], workers=1, keep_duplicates=True)
+        self.assertEqual(counts.duplicate_files, 0)
+        self.assertEqual(counts.terminal_bigrams["1-8->9-16"], 2)
+
+    def test_written_tables_load_into_the_predictor(self):
+        output_directory = os.path.join(self.directory.name, "mined")
+        mine([self.archive_path], workers=1).write(output_directory)
+        predictor = IncrementPredictor.from_data_directory(output_directory)
+        self.assertEqual(predictor.predict("9-16"), "17-24")
+        with open(os.path.join(output_directory, "wire_patterns.json")) as file:
+            self.assertEqual(json.load(file)["destination"]["TB-1-6"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+from src.prefix_index import FieldCompletions, PrefixIndex
+
+
+class TestFieldCompletions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.completions = FieldCompletions({"TB9": 40, "TB2": 5}, limit=3)
+        self.completions.rebuild(["TB1", "TB1", "TB3", "M1", ""])
+
+    def test_project_counts_rank_before_seed_counts(self):
+        self.assertEqual(self.completions.complete("TB"), ["TB1", "TB3", "TB9"])
+        self.assertEqual(self.completions.complete("M"), ["M1"])
+        self.assertEqual(self.completions.complete("X"), [])
+
+    def test_adds_re_rank_cached_prefixes(self):
+        self.assertEqual(self.completions.complete("TB"), ["TB1", "TB3", "TB9"])
+        self.completions.add("TB2")
+        self.completions.add("TB2")
+        self.completions.add("TB2")
+        self.assertEqual(self.completions.complete("TB"), ["TB2", "TB1", "TB3"])
+
+    def test_removed_values_drop_out(self):
+        self.assertEqual(self.completions.complete("TB"), ["TB1", "TB3", "TB9"])
+        self.completions.discard("TB3")
+        self.assertEqual(self.completions.complete("TB"), ["TB1", "TB9", "TB2"])
+        self.completions.discard("M1")
+        self.assertEqual(self.completions.complete("M"), [])
+        self.assertNotIn("M1", self.completions.values)
+
+    def test_long_slices_are_ranked_ahead_of_time(self):
+        completions = FieldCompletions(limit=3)
+        completions.rebuild([str(n) for n in range(5000)] + ["17"] * 5)
+        self.assertIn("", completions._cache)
+        self.assertIn("1", completions._cache)
+        self.assertNotIn("17", completions._cache)
+        self.assertEqual(completions.complete("1")[0], "17")
+        self.assertEqual(completions.complete("17"), ["17", "170", "1700"])
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.index = PrefixIndex({"source": {"TB-1-8": 43, "X-5A": 2}, "destination": {}})
+        self.conn_manager.register_index(self.index)
+
+    def test_wire_patterns_seed_their_side(self):
+        self.assertEqual(self.index.complete("source_terminal_block", "T"), ["TB"])
+        self.assertEqual(self.index.complete("source_terminal", "5"), ["5A"])
+        self.assertEqual(self.index.complete("destination_terminal", "5"), [])
+
+    def test_follows_manager_mutations(self):
+        self.conn_manager.add_connection("PLC1", "TB", "1", "M1", "X", "1")
+        connection = Connection("PLC2", "TB", "2", "M1", "X", "2")
+        self.conn_manager.add_connections([connection.to_dict()])
+        self.assertEqual(self.index.complete("source_component", "PLC"), ["PLC1", "PLC2"])
+        self.assertEqual(self.index.complete("destination_component", "M"), ["M1"])
+
+        self.conn_manager.delete_connection(connection)
+        self.assertEqual(self.index.complete("source_component", "PLC"), ["PLC1"])
+
+        self.conn_manager.connections = []
+        self.assertEqual(self.index.complete("source_component", "PLC"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+from src.search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.index = SearchIndex()
+        self.conn_manager.register_index(self.index)
+        self.conn_manager.add_connections(
+            [
+                Connection("PLC1", "TB1", "1-8", "Motor", "X", "1").to_dict(),
+                Connection("PLC1", "TB1", "9-16", "Motor", "X", "2").to_dict(),
+                Connection("PLC12", "TB2", "10", "Pump", "X", "3").to_dict(),
+            ]
+        )
+
+    def search(self, query: str) -> list[str]:
+        return [
+            connection.source_terminal
+            for connection in self.index.filter_connections(
+                query, self.conn_manager.connections
+            )
+        ]
+
+    def test_substring_terms_ignore_case(self):
+        self.assertEqual(self.search("plc"), ["1-8", "9-16", "10"])
+        self.assertEqual(self.search("OTO"), ["1-8", "9-16"])
+        self.assertEqual(self.search("-16"), ["9-16"])
+
+    def test_short_terms_match_word_starts(self):
+        self.assertEqual(self.search("1"), ["1-8", "9-16", "10"])
+        self.assertEqual(self.search("10"), ["10"])
+        self.assertEqual(self.search("tb"), ["1-8", "9-16", "10"])
+        self.assertEqual(self.search("6"), [])
+
+    def test_typing_narrows_the_list(self):
+        self.assertEqual(self.search("p"), ["1-8", "9-16", "10"])
+        self.assertEqual(self.search("pu"), ["10"])
+        self.assertEqual(self.search("pum"), ["10"])
+        self.assertEqual(self.search("pl"), ["1-8", "9-16", "10"])
+        self.assertEqual(self.search("plc"), ["1-8", "9-16", "10"])
+
+        self.conn_manager.add_connection("M12", "A", "17", "Valve", "B", "4")
+        self.assertEqual(self.search("m"), ["1-8", "9-16", "17"])
+        self.assertEqual(self.search("m1"), ["17"])
+        self.assertEqual(self.search("m12"), ["17"])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search("plc12 pump"), ["10"])
+        self.assertEqual(self.search("motor 3"), [])
+
+    def test_empty_query_matches_everything(self):
+        self.assertIsNone(self.index.matching_ids("  "))
+        self.assertEqual(self.search(""), ["1-8", "9-16", "10"])
+
+    def test_follows_manager_mutations(self):
+        self.conn_manager.delete_connection(Connection("PLC12", "TB2", "10", "Pump", "X", "3"))
+        self.assertEqual(self.search("pump"), [])
+        self.assertNotIn("pump", self.index.postings)
+        self.assertNotIn("pum", self.index.grams)
+        self.assertNotIn("pu", self.index.prefixes)
+
+        self.conn_manager.add_connection("Valve", "TB3", "1", "PLC1", "Y", "4")
+        self.assertEqual(self.search("alv"), ["1"])
+
+        self.conn_manager.connections = []
+        self.assertEqual(self.search("plc"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+from src.terminal_index import find_conflicts, write_conflict_report
+
+
+class TestTerminalIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn_manager = ConnectionManager("/fake/path")
+        self.conn_manager.write_json_file = MagicMock(return_value=True)
+        self.index = self.conn_manager.terminal_index
+        self.conn_manager.add_connection("PLC", "TB1", "1", "M1", "X", "1")
+        self.conn_manager.add_connection("PLC", "TB1", "2", "M2", "X", "1")
+
+    def test_no_conflicts_between_distinct_terminals(self):
+        self.assertEqual(self.index.report(), {})
+        self.assertEqual(len(self.index.occupants_of(("PLC", "TB1", "1"))), 1)
+
+    def test_conflicts_are_flagged_on_add(self):
+        connection = self.conn_manager.add_connection("PLC", "TB1", "1", "M3", "X", "1")
+        conflicts = self.index.conflicts_with(connection)
+        self.assertEqual(list(conflicts), [("PLC", "TB1", "1")])
+        self.assertEqual(conflicts[("PLC", "TB1", "1")][0].destination_component, "M1")
+        self.assertEqual(self.index.report()[("PLC", "TB1", "1")][1], connection)
+
+    def test_reversed_connections_land_on_the_same_terminals(self):
+        connection = Connection("M9", "X", "1", "PLC", "TB1", "2")
+        self.assertEqual(list(self.index.conflicts_with(connection)), [("PLC", "TB1", "2")])
+
+    def test_conflicts_clear_on_delete_and_edit(self):
+        connection = self.conn_manager.add_connection("PLC", "TB1", "1", "M3", "X", "1")
+        self.conn_manager.edit_connection(
+            connection, Connection("PLC", "TB1", "3", "M3", "X", "1")
+        )
+        self.assertEqual(self.index.report(), {})
+
+        connection = self.conn_manager.add_connection("M1", "X", "1", "M4", "X", "1")
+        self.assertIn(("M1", "X", "1"), self.index.conflicts)
+        self.conn_manager.delete_connection(connection)
+        self.assertEqual(self.index.conflicts, set())
+        self.assertNotIn(("M4", "X", "1"), self.index.occupants)
+
+    def test_endpoints_without_a_terminal_are_ignored(self):
+        self.conn_manager.add_connection("PLC", "", "", "M5", "X", "1")
+        self.conn_manager.add_connection("PLC", "", "", "M6", "X", "1")
+        self.assertEqual(self.index.report(), {})
+
+    def test_rebuild_matches_incremental_updates(self):
+        self.conn_manager.add_connection("PLC", "TB1", "1", "M3", "X", "1")
+        occupants, conflicts = find_conflicts(self.conn_manager.connections)
+        self.assertEqual(conflicts, self.index.conflicts)
+        self.assertEqual(occupants, self.index.occupants)
+
+    def test_write_conflict_report(self):
+        self.conn_manager.add_connection("PLC", "TB1", "1", "M3", "X", "1")
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "conflicts.csv")
+            self.assertTrue(write_conflict_report(self.index.report(), file_path))
+            with open(file_path, newline="") as file:
+                rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ["terminal", "connections", "source", "destination"])
+        self.assertEqual(rows[1], ["PLC-TB1-1", "2", "PLC-TB1-1", "M1-X-1"])
+        self.assertEqual(rows[2], ["PLC-TB1-1", "2", "PLC-TB1-1", "M3-X-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
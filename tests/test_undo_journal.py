@@ -0,0 +1,229 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.autosave import DebouncedWriter
+from src.command import AddConnectionCommand, DeleteConnectionCommand, EditConnectionCommand
+from src.command_manager import CommandManager
+from src.connection import Connection
+from src.connection_manager import ConnectionManager
+from src.event_system import EventSystem
+from src.undo_journal import UndoJournal, has_journal, journal_path, read_events
+
+
+class TestUndoJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.project_path = os.path.join(self.directory.name, "project.wir")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def new_session(self) -> tuple[ConnectionManager, CommandManager, MagicMock]:
+        connection_manager = ConnectionManager("/fake/path")
+        # A real write_json_file, so save listeners hear about the writes
+        connection_manager.file_handler.save = MagicMock(return_value=True)
+        connection_manager.populate_connections(
+            [Connection("A", "TB1", str(n), "B", "TB2", str(n)).to_dict() for n in range(20)]
+        )
+        parent = MagicMock()
+        parent.connection_manager = connection_manager
+        parent.event_system = MagicMock()
+        return connection_manager, CommandManager(), parent
+
+    def start_journal(self, connection_manager, command_manager, events=()) -> UndoJournal:
+        journal = UndoJournal(self.project_path, recorded=len(events))
+        connection_manager.add_save_listener(journal.before_save)
+        command_manager.journal = journal
+        return journal
+
+    def test_events_are_appended_and_removed_on_clean_close(self):
+        journal = UndoJournal(self.project_path)
+        command = MagicMock()
+        command.to_record.return_value = {"type": "edit"}
+        journal.record("do", command)
+        saved = journal.before_save()
+        journal.record("undo")
+        saved()
+        journal.flush()
+
+        self.assertTrue(has_journal(self.project_path))
+        self.assertEqual(
+            read_events(self.project_path),
+            [
+                {"op": "do", "command": {"type": "edit"}},
+                {"op": "undo"},
+                {"op": "saved", "through": 1},
+            ],
+        )
+        journal.close(remove=True)
+        self.assertFalse(has_journal(self.project_path))
+
+    def test_partial_last_line_is_skipped(self):
+        with open(journal_path(self.project_path), "w") as file:
+            file.write('{"op": "undo"}\n{"op": "do", "comm')
+        self.assertEqual(read_events(self.project_path), [{"op": "undo"}])
+
+    def test_recording_after_partial_last_line_starts_a_new_line(self):
+        with open(journal_path(self.project_path), "w") as file:
+            file.write('{"op": "undo"}\n{"op": "do", "comm')
+        journal = UndoJournal(self.project_path, recorded=1)
+        journal.record("redo")
+        journal.close()
+        self.assertEqual(read_events(self.project_path), [{"op": "undo"}, {"op": "redo"}])
+
+    def test_recover_crashed_session(self):
+        connection_manager, command_manager, parent = self.new_session()
+        connection_manager.file_handler.save.return_value = False
+        journal = self.start_journal(connection_manager, command_manager)
+        connections = connection_manager.get_connections()
+
+        # Saved before the crash: only needs to be back in the history
+        connection_manager.file_handler.save.return_value = True
+        new_values = {**connections[0].to_dict(), "source_terminal": "x"}
+        edit = EditConnectionCommand(parent, connection_manager, connections[0], new_values)
+        command_manager.execute(edit)
+        connection_manager.write_json_file()
+        saved_state = [c.to_dict() for c in connection_manager.connections]
+
+        # Never saved: has to be re-applied
+        connection_manager.file_handler.save.return_value = False
+        parent.view.tree_widget.selected_connections_in_view.return_value = connections[5:8]
+        command_manager.execute(
+            DeleteConnectionCommand(parent, connection_manager, parent.view)
+        )
+        source = {"component": "C", "terminal_block": "1", "terminal": "1"}
+        destination = {"component": "D", "terminal_block": "1", "terminal": "1"}
+        command_manager.execute(
+            AddConnectionCommand(parent.event_system, connection_manager, source, destination)
+        )
+        command_manager.undo()
+        journal.flush()  # and then the process dies
+        final_state = [c.to_dict() for c in connection_manager.connections]
+
+        # The next session starts from what was saved
+        connection_manager, command_manager, parent = self.new_session()
+        connection_manager.populate_connections(saved_state)
+        applied = command_manager.recover(read_events(self.project_path), parent)
+
+        self.assertEqual(applied, 3)
+        self.assertEqual([c.to_dict() for c in connection_manager.connections], final_state)
+        connection_manager.file_handler.save.assert_called_once()
+        self.assertEqual(len(command_manager.undo_stack), 2)
+        self.assertEqual(len(command_manager.redo_stack), 1)
+
+        # The recovered commands undo and redo like the originals
+        command_manager.redo()
+        self.assertTrue(
+            connection_manager.has_connection(Connection("C", "1", "1", "D", "1", "1"))
+        )
+        command_manager.undo()
+        command_manager.undo()
+        command_manager.undo()
+        self.assertEqual(
+            [c.to_dict() for c in connection_manager.connections],
+            [c.to_dict() for c in connections],
+        )
+        journal.close()
+
+    def test_recover_after_autosave(self):
+        connection_manager, command_manager, parent = self.new_session()
+        connection_manager.populate_connections([])
+        # Never fires on its own, the flush below stands in for the timer
+        connection_manager.autosaver = DebouncedWriter(connection_manager.write_json_file, 3600)
+        journal = self.start_journal(connection_manager, command_manager)
+
+        for name in "ABC":
+            source = {"component": name, "terminal_block": "1", "terminal": "1"}
+            destination = {"component": name, "terminal_block": "2", "terminal": "1"}
+            command_manager.execute(
+                AddConnectionCommand(parent.event_system, connection_manager, source, destination)
+            )
+        b = connection_manager.connections[1]
+        parent.view.tree_widget.selected_connections_in_view.return_value = [b]
+        command_manager.execute(DeleteConnectionCommand(parent, connection_manager, parent.view))
+        self.assertTrue(connection_manager.autosaver.flush())
+        saved_state = connection_manager.file_handler.save.call_args.args[0]
+        command_manager.undo()
+        journal.flush()  # and then the process dies, before the next autosave
+        final_state = [c.to_dict() for c in connection_manager.connections]
+
+        connection_manager, command_manager, parent = self.new_session()
+        connection_manager.populate_connections(saved_state)
+        applied = command_manager.recover(read_events(self.project_path), parent)
+
+        # Only the undo came after the autosave
+        self.assertEqual(applied, 1)
+        self.assertEqual([c.to_dict() for c in connection_manager.connections], final_state)
+        self.assertEqual(connection_manager.connections[1].to_dict(), b.to_dict())
+        self.assertEqual(len(command_manager.redo_stack), 1)
+        self.assertEqual(len(command_manager.redo_stack[0].deleted_connections), 1)
+        journal.close()
+
+    def test_replayed_redo_of_a_stored_add_changes_nothing(self):
+        connection_manager, command_manager, parent = self.new_session()
+        source = {"component": "C", "terminal_block": "1", "terminal": "1"}
+        destination = {"component": "D", "terminal_block": "1", "terminal": "1"}
+        command = AddConnectionCommand(
+            parent.event_system, connection_manager, source, destination
+        )
+        command_manager.execute(command)
+        state = [c.to_dict() for c in connection_manager.connections]
+
+        command.redo()
+
+        self.assertEqual([c.to_dict() for c in connection_manager.connections], state)
+
+    def test_redo_puts_an_add_back_where_it_was(self):
+        connection_manager, command_manager, parent = self.new_session()
+        source = {"component": "C", "terminal_block": "1", "terminal": "1"}
+        destination = {"component": "D", "terminal_block": "1", "terminal": "1"}
+        command_manager.execute(
+            AddConnectionCommand(parent.event_system, connection_manager, source, destination)
+        )
+        command_manager.undo()
+        # Appended after the add was undone, so the redo's connection is no longer last
+        connection_manager.add_connection("E", "1", "1", "F", "1", "1")
+
+        command_manager.redo()
+
+        self.assertEqual(connection_manager.connections[20].source_component, "C")
+
+    def test_large_recovery_applies_in_one_refresh(self):
+        connection_manager, command_manager, parent = self.new_session()
+        connection_manager.populate_connections(
+            [Connection("A", "1", str(n), "B", "1", str(n)).to_dict() for n in range(10_000)]
+        )
+        parent.event_system = EventSystem()
+        added_events = MagicMock()
+        parent.event_system.subscribe("connection_added", added_events)
+        observer = MagicMock()
+        connection_manager.add_observer(observer)
+        events = [
+            {
+                "op": "do",
+                "command": {
+                    "type": "add",
+                    "connection": Connection("C", "1", str(n), "D", "1", str(n)).to_dict(),
+                    "position": 10_000 + n,
+                },
+            }
+            for n in range(10_000)
+        ]
+
+        start = time.perf_counter()
+        applied = command_manager.recover(events, parent)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(applied, 10_000)
+        self.assertEqual(len(connection_manager.connections), 20_000)
+        self.assertEqual(connection_manager.connections[15_000].source_terminal, "5000")
+        self.assertLess(elapsed, 1.0)
+        added_events.assert_not_called()
+        observer.update_connection_list.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
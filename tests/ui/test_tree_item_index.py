@@ -0,0 +1,43 @@
+import unittest
+
+from src.connection import Connection
+from src.ui.tree_item_index import TreeItemIndex
+
+
+class TestTreeItemIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = TreeItemIndex()
+        self.first = Connection("A", "TB", "1", "B", "X", "1")
+        self.second = Connection("A", "TB", "2", "B", "X", "2")
+        self.index.map("I001", self.first)
+        self.index.map("I002", self.second)
+
+    def test_lookups_in_both_directions(self):
+        self.assertEqual(self.index.item_for(self.second.connection_id), "I002")
+        self.assertIs(self.index.connection_for("I001"), self.first)
+        self.assertEqual(
+            self.index.connections_for(["I002", "missing", "I001"]), [self.second, self.first]
+        )
+
+    def test_unmap(self):
+        self.assertEqual(self.index.unmap(self.first.connection_id), "I001")
+        self.assertIsNone(self.index.connection_for("I001"))
+        self.assertIsNone(self.index.unmap(self.first.connection_id))
+        self.assertEqual(len(self.index), 1)
+
+    def test_remapping_an_item_forgets_its_old_connection(self):
+        # The virtual list reuses the same items for whatever connections are in view
+        third = Connection("A", "TB", "3", "B", "X", "3")
+        self.index.map("I001", third)
+        self.assertIsNone(self.index.item_for(self.first.connection_id))
+        self.assertEqual(
+            set(self.index.connection_ids()), {self.second.connection_id, third.connection_id}
+        )
+
+        self.index.map("I003", third)
+        self.assertIsNone(self.index.connection_for("I001"))
+        self.assertEqual(len(self.index), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
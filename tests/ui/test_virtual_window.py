@@ -0,0 +1,48 @@
+import unittest
+
+from src.ui.virtual_window import VirtualWindow
+
+
+class TestVirtualWindow(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = VirtualWindow(visible_rows=10, overscan=2)
+        self.window.set_total(100_000)
+
+    def test_bounds_cover_visible_rows_and_overscan(self):
+        self.assertEqual(self.window.bounds(), (0, 12))
+
+    def test_scroll_is_clamped(self):
+        self.window.scroll(-5)
+        self.assertEqual(self.window.first, 0)
+        self.window.scroll(200_000)
+        self.assertEqual(self.window.first, 100_000 - 10)
+
+    def test_moveto_and_scroll_to_end(self):
+        self.window.moveto(0.5)
+        self.assertEqual(self.window.first, 50_000)
+        self.window.scroll_to_end()
+        self.assertEqual(self.window.bounds(), (99_990, 100_000))
+
+    def test_fractions(self):
+        self.window.moveto(0.5)
+        self.assertEqual(self.window.fractions(), (0.5, 50_010 / 100_000))
+
+    def test_shrinking_total_pulls_window_back(self):
+        self.window.scroll_to_end()
+        self.window.set_total(15)
+        self.assertEqual(self.window.bounds(), (5, 15))
+
+    def test_scroll_to_index(self):
+        self.window.scroll_to(25)
+        self.assertEqual(self.window.first, 16)
+        self.window.scroll_to(3)
+        self.assertEqual(self.window.first, 3)
+
+    def test_small_lists(self):
+        self.window.set_total(4)
+        self.assertEqual(self.window.bounds(), (0, 4))
+        self.assertEqual(self.window.fractions(), (0.0, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()